@@ -6,4 +6,31 @@ class CoreConfig(AppConfig):
     name = "apps.core"
 
     def ready(self):
-        import apps.core.signals  # noqa
\ No newline at end of file
+        import apps.core.signals  # noqa
+
+        # Ilovalardagi webhook_handlers va event_sinks modullarini registrylarga yuklash
+        from protobuf_handlers import autodiscover
+        from apps.core.events.sinks import autodiscover as autodiscover_sinks
+        autodiscover()
+        autodiscover_sinks()
+
+        # Testlarda WEBHOOK_* / EVENT_* sozlamalari o'zgarganda obyektlar qayta yaratiladi
+        from django.test.signals import setting_changed
+        from apps.core.cache import reset_entity_caches
+        from apps.core.events.broker import reset_event_broker
+        from apps.core.events.fanout import reset_event_fanout
+        from apps.core.events.outbox import reset_outbox_relay
+        from protobuf_admission import reset_admission_controller
+        from protobuf_dedup import reset_deduplicator
+        from protobuf_logging import reset_event_logger
+        from protobuf_metrics import reset_metrics
+        from protobuf_offload import reset_offloader
+        setting_changed.connect(reset_entity_caches)
+        setting_changed.connect(reset_event_broker)
+        setting_changed.connect(reset_event_fanout)
+        setting_changed.connect(reset_outbox_relay)
+        setting_changed.connect(reset_admission_controller)
+        setting_changed.connect(reset_deduplicator)
+        setting_changed.connect(reset_event_logger)
+        setting_changed.connect(reset_metrics)
+        setting_changed.connect(reset_offloader)
\ No newline at end of file
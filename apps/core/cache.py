@@ -0,0 +1,53 @@
+"""
+Student va Vacancy message lari uchun read-through keshlar.
+
+Sozlamalar - settings.ENTITY_CACHE; yozuvlar post_save / post_delete da
+tranzaksiya commit bo'lgach o'chiriladi (apps/core/signals.py).
+"""
+import threading
+from typing import Dict, Optional
+
+from apps.core.mappers import student_mapper, vacancy_mapper
+from protobuf_cache import DEFAULT_LOCAL_MAX_SIZE, DEFAULT_LOCAL_TTL, DEFAULT_TIMEOUT, MessageCache
+from protobuf_metrics import get_metrics
+
+CACHED_MAPPERS = {mapper.model: mapper for mapper in (student_mapper, vacancy_mapper)}
+
+_caches: Dict[type, MessageCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_entity_cache(model) -> Optional[MessageCache]:
+    """
+    Model uchun jarayon bo'yicha yagona kesh
+
+    Returns:
+        MessageCache yoki None (kesh o'chirilgan yoki model keshlanmaydi)
+    """
+    cache = _caches.get(model)
+    if cache is not None:
+        return cache
+
+    from django.conf import settings
+
+    config = getattr(settings, "ENTITY_CACHE", {})
+    if not config.get("ENABLED", True) or model not in CACHED_MAPPERS:
+        return None
+
+    with _caches_lock:
+        if model not in _caches:
+            _caches[model] = MessageCache(
+                CACHED_MAPPERS[model],
+                cache_alias=config.get("CACHE_ALIAS", "default"),
+                timeout=config.get("TIMEOUT", DEFAULT_TIMEOUT),
+                local_max_size=config.get("LOCAL_MAX_SIZE", DEFAULT_LOCAL_MAX_SIZE),
+                local_ttl=config.get("LOCAL_TTL", DEFAULT_LOCAL_TTL),
+                metrics=get_metrics,
+            )
+    return _caches[model]
+
+
+def reset_entity_caches(**kwargs) -> None:
+    """Sozlamalar o'zgarganda keshlar qayta yaratilishi uchun"""
+    if kwargs.get("setting", "ENTITY_CACHE") in ("ENTITY_CACHE", "CACHES"):
+        _caches.clear()
@@ -25,15 +25,15 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1fplatform/v1/data_exchange.proto\x12\x0bplatform.v1\x1a\x1fgoogle/protobuf/timestamp.proto\"\x7f\n\x04User\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\x12\x0b\n\x03\x61ge\x18\x04 \x01(\x05\x12\x11\n\tis_active\x18\x05 \x01(\x08\x12.\n\ncreated_at\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x9b\x01\n\x07Product\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\r\n\x05price\x18\x04 \x01(\x01\x12\x10\n\x08\x63\x61tegory\x18\x05 \x01(\t\x12\x10\n\x08quantity\x18\x06 \x01(\x05\x12.\n\ncreated_at\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\xbb\x01\n\x05Order\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0f\n\x07user_id\x18\x02 \x01(\x03\x12%\n\x05items\x18\x03 \x03(\x0b\x32\x16.platform.v1.OrderItem\x12\x14\n\x0ctotal_amount\x18\x04 \x01(\x01\x12(\n\x06status\x18\x05 \x01(\x0e\x32\x18.platform.v1.OrderStatus\x12.\n\ncreated_at\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"p\n\tOrderItem\x12\x12\n\nproduct_id\x18\x01 \x01(\x03\x12\x14\n\x0cproduct_name\x18\x02 \x01(\t\x12\x10\n\x08quantity\x18\x03 \x01(\x05\x12\x12\n\nunit_price\x18\x04 \x01(\x01\x12\x13\n\x0btotal_price\x18\x05 \x01(\x01\"\xea\x01\n\x0bWebhookData\x12\x12\n\nevent_type\x18\x01 \x01(\t\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\t\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12&\n\tuser_data\x18\x04 \x01(\x0b\x32\x11.platform.v1.UserH\x00\x12,\n\x0cproduct_data\x18\x05 \x01(\x0b\x32\x14.platform.v1.ProductH\x00\x12(\n\norder_data\x18\x06 \x01(\x0b\x32\x12.platform.v1.OrderH\x00\x42\x06\n\x04\x64\x61ta\"e\n\x0fWebhookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x30\n\x0cprocessed_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp*\x95\x01\n\x0bOrderStatus\x12\x18\n\x14ORDER_STATUS_PENDING\x10\x00\x12\x1a\n\x16ORDER_STATUS_CONFIRMED\x10\x01\x12\x18\n\x14ORDER_STATUS_SHIPPED\x10\x02\x12\x1a\n\x16ORDER_STATUS_DELIVERED\x10\x03\x12\x1a\n\x16ORDER_STATUS_CANCELLED\x10\x04\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1fplatform/v1/data_exchange.proto\x12\x0bplatform.v1\x1a\x1fgoogle/protobuf/timestamp.proto\"\x7f\n\x04User\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\x12\x0b\n\x03\x61ge\x18\x04 \x01(\x05\x12\x11\n\tis_active\x18\x05 \x01(\x08\x12.\n\ncreated_at\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x9b\x01\n\x07Product\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\r\n\x05price\x18\x04 \x01(\x01\x12\x10\n\x08\x63\x61tegory\x18\x05 \x01(\t\x12\x10\n\x08quantity\x18\x06 \x01(\x05\x12.\n\ncreated_at\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\xbb\x01\n\x05Order\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0f\n\x07user_id\x18\x02 \x01(\x03\x12%\n\x05items\x18\x03 \x03(\x0b\x32\x16.platform.v1.OrderItem\x12\x14\n\x0ctotal_amount\x18\x04 \x01(\x01\x12(\n\x06status\x18\x05 \x01(\x0e\x32\x18.platform.v1.OrderStatus\x12.\n\ncreated_at\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"p\n\tOrderItem\x12\x12\n\nproduct_id\x18\x01 \x01(\x03\x12\x14\n\x0cproduct_name\x18\x02 \x01(\t\x12\x10\n\x08quantity\x18\x03 \x01(\x05\x12\x12\n\nunit_price\x18\x04 \x01(\x01\x12\x13\n\x0btotal_price\x18\x05 \x01(\x01\"\xea\x01\n\x0bWebhookData\x12\x12\n\nevent_type\x18\x01 \x01(\t\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\t\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12&\n\tuser_data\x18\x04 \x01(\x0b\x32\x11.platform.v1.UserH\x00\x12,\n\x0cproduct_data\x18\x05 \x01(\x0b\x32\x14.platform.v1.ProductH\x00\x12(\n\norder_data\x18\x06 \x01(\x0b\x32\x12.platform.v1.OrderH\x00\x42\x06\n\x04\x64\x61ta\"7\n\x0cWebhookBatch\x12\'\n\x05items\x18\x01 \x03(\x0b\x32\x18.platform.v1.WebhookData\"V\n\x11WebhookItemResult\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\t\x12\x0f\n\x07success\x18\x03 \x01(\x08\x12\x0f\n\x07message\x18\x04 \x01(\t\"\x96\x01\n\x0fWebhookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x30\n\x0cprocessed_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12/\n\x07results\x18\x04 \x03(\x0b\x32\x1e.platform.v1.WebhookItemResult*\x95\x01\n\x0bOrderStatus\x12\x18\n\x14ORDER_STATUS_PENDING\x10\x00\x12\x1a\n\x16ORDER_STATUS_CONFIRMED\x10\x01\x12\x18\n\x14ORDER_STATUS_SHIPPED\x10\x02\x12\x1a\n\x16ORDER_STATUS_DELIVERED\x10\x03\x12\x1a\n\x16ORDER_STATUS_CANCELLED\x10\x04\x32\xa1\x01\n\x0c\x44\x61taExchange\x12\x45\n\x0bSendWebhook\x12\x18.platform.v1.WebhookData\x1a\x1c.platform.v1.WebhookResponse\x12J\n\x0eStreamWebhooks\x12\x18.platform.v1.WebhookData\x1a\x1c.platform.v1.WebhookResponse(\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'platform.v1.data_exchange_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_ORDERSTATUS']._serialized_start=1013
-  _globals['_ORDERSTATUS']._serialized_end=1162
+  _globals['_ORDERSTATUS']._serialized_start=1208
+  _globals['_ORDERSTATUS']._serialized_end=1357
   _globals['_USER']._serialized_start=81
   _globals['_USER']._serialized_end=208
   _globals['_PRODUCT']._serialized_start=211
@@ -44,6 +44,12 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_ORDERITEM']._serialized_end=670
   _globals['_WEBHOOKDATA']._serialized_start=673
   _globals['_WEBHOOKDATA']._serialized_end=907
-  _globals['_WEBHOOKRESPONSE']._serialized_start=909
-  _globals['_WEBHOOKRESPONSE']._serialized_end=1010
+  _globals['_WEBHOOKBATCH']._serialized_start=909
+  _globals['_WEBHOOKBATCH']._serialized_end=964
+  _globals['_WEBHOOKITEMRESULT']._serialized_start=966
+  _globals['_WEBHOOKITEMRESULT']._serialized_end=1052
+  _globals['_WEBHOOKRESPONSE']._serialized_start=1055
+  _globals['_WEBHOOKRESPONSE']._serialized_end=1205
+  _globals['_DATAEXCHANGE']._serialized_start=1360
+  _globals['_DATAEXCHANGE']._serialized_end=1521
 # @@protoc_insertion_point(module_scope)
@@ -3,6 +3,7 @@
 import grpc
 import warnings
 
+from apps.core.dtos.platform.v1 import data_exchange_pb2 as platform_dot_v1_dot_data__exchange__pb2
 
 GRPC_GENERATED_VERSION = '1.76.0'
 GRPC_VERSION = grpc.__version__
@@ -22,3 +23,124 @@ if _version_not_supported:
         + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
         + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
     )
+
+
+class DataExchangeStub(object):
+    """Webhooklarni HTTP POST o'rniga gRPC orqali qabul qilish
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.SendWebhook = channel.unary_unary(
+                '/platform.v1.DataExchange/SendWebhook',
+                request_serializer=platform_dot_v1_dot_data__exchange__pb2.WebhookData.SerializeToString,
+                response_deserializer=platform_dot_v1_dot_data__exchange__pb2.WebhookResponse.FromString,
+                _registered_method=True)
+        self.StreamWebhooks = channel.stream_unary(
+                '/platform.v1.DataExchange/StreamWebhooks',
+                request_serializer=platform_dot_v1_dot_data__exchange__pb2.WebhookData.SerializeToString,
+                response_deserializer=platform_dot_v1_dot_data__exchange__pb2.WebhookResponse.FromString,
+                _registered_method=True)
+
+
+class DataExchangeServicer(object):
+    """Webhooklarni HTTP POST o'rniga gRPC orqali qabul qilish
+    """
+
+    def SendWebhook(self, request, context):
+        """Bitta event
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamWebhooks(self, request_iterator, context):
+        """Ko'p eventlar bitta uzoq yashovchi HTTP/2 stream orqali;
+        javobda umumiy natija va faqat xato bo'lgan elementlar
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_DataExchangeServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'SendWebhook': grpc.unary_unary_rpc_method_handler(
+                    servicer.SendWebhook,
+                    request_deserializer=platform_dot_v1_dot_data__exchange__pb2.WebhookData.FromString,
+                    response_serializer=platform_dot_v1_dot_data__exchange__pb2.WebhookResponse.SerializeToString,
+            ),
+            'StreamWebhooks': grpc.stream_unary_rpc_method_handler(
+                    servicer.StreamWebhooks,
+                    request_deserializer=platform_dot_v1_dot_data__exchange__pb2.WebhookData.FromString,
+                    response_serializer=platform_dot_v1_dot_data__exchange__pb2.WebhookResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'platform.v1.DataExchange', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('platform.v1.DataExchange', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class DataExchange(object):
+    """Webhooklarni HTTP POST o'rniga gRPC orqali qabul qilish
+    """
+
+    @staticmethod
+    def SendWebhook(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/platform.v1.DataExchange/SendWebhook',
+            platform_dot_v1_dot_data__exchange__pb2.WebhookData.SerializeToString,
+            platform_dot_v1_dot_data__exchange__pb2.WebhookResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamWebhooks(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/platform.v1.DataExchange/StreamWebhooks',
+            platform_dot_v1_dot_data__exchange__pb2.WebhookData.SerializeToString,
+            platform_dot_v1_dot_data__exchange__pb2.WebhookResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
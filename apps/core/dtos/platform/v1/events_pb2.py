@@ -23,22 +23,34 @@ _sym_db = _symbol_database.Default()
 
 
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
-from platform.v1 import entities_pb2 as platform_dot_v1_dot_entities__pb2
+from apps.core.dtos.platform.v1 import entities_pb2 as platform_dot_v1_dot_entities__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18platform/v1/events.proto\x12\x10\x63ore.platform.v1\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1aplatform/v1/entities.proto\"y\n\tBaseEvent\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12)\n\x04type\x18\x02 \x01(\x0e\x32\x1b.core.platform.v1.EventType\x12/\n\x0boccurred_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x84\x01\n\x17\x41pplicationCreatedEvent\x12)\n\x04\x62\x61se\x18\x01 \x01(\x0b\x32\x1b.core.platform.v1.BaseEvent\x12\x16\n\x0e\x61pplication_id\x18\x02 \x01(\x03\x12\x12\n\nstudent_id\x18\x03 \x01(\x03\x12\x12\n\nvacancy_id\x18\x04 \x01(\x03\"\xd4\x01\n\x1d\x41pplicationStatusChangedEvent\x12)\n\x04\x62\x61se\x18\x01 \x01(\x0b\x32\x1b.core.platform.v1.BaseEvent\x12\x16\n\x0e\x61pplication_id\x18\x02 \x01(\x03\x12\x37\n\nold_status\x18\x03 \x01(\x0e\x32#.core.platform.v1.ApplicationStatus\x12\x37\n\nnew_status\x18\x04 \x01(\x0e\x32#.core.platform.v1.ApplicationStatus*\x8c\x01\n\tEventType\x12\x1a\n\x16\x45VENT_TYPE_UNSPECIFIED\x10\x00\x12\x16\n\x12STUDENT_REGISTERED\x10\x01\x12\x12\n\x0eVACANCY_POSTED\x10\x02\x12\x17\n\x13\x41PPLICATION_CREATED\x10\x03\x12\x1e\n\x1a\x41PPLICATION_STATUS_CHANGED\x10\x04\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18platform/v1/events.proto\x12\x10\x63ore.platform.v1\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1aplatform/v1/entities.proto\"y\n\tBaseEvent\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12)\n\x04type\x18\x02 \x01(\x0e\x32\x1b.core.platform.v1.EventType\x12/\n\x0boccurred_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x84\x01\n\x17\x41pplicationCreatedEvent\x12)\n\x04\x62\x61se\x18\x01 \x01(\x0b\x32\x1b.core.platform.v1.BaseEvent\x12\x16\n\x0e\x61pplication_id\x18\x02 \x01(\x03\x12\x12\n\nstudent_id\x18\x03 \x01(\x03\x12\x12\n\nvacancy_id\x18\x04 \x01(\x03\"\xd4\x01\n\x1d\x41pplicationStatusChangedEvent\x12)\n\x04\x62\x61se\x18\x01 \x01(\x0b\x32\x1b.core.platform.v1.BaseEvent\x12\x16\n\x0e\x61pplication_id\x18\x02 \x01(\x03\x12\x37\n\nold_status\x18\x03 \x01(\x0e\x32#.core.platform.v1.ApplicationStatus\x12\x37\n\nnew_status\x18\x04 \x01(\x0e\x32#.core.platform.v1.ApplicationStatus\"\xc9\x01\n\rEventEnvelope\x12\x0e\n\x06offset\x18\x01 \x01(\x04\x12H\n\x13\x61pplication_created\x18\x02 \x01(\x0b\x32).core.platform.v1.ApplicationCreatedEventH\x00\x12U\n\x1a\x61pplication_status_changed\x18\x03 \x01(\x0b\x32/.core.platform.v1.ApplicationStatusChangedEventH\x00\x42\x07\n\x05\x65vent\"=\n\nEventBatch\x12/\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x1f.core.platform.v1.EventEnvelope\"e\n\x0eSubscribeStart\x12\x15\n\rsubscriber_id\x18\x01 \x01(\t\x12\x13\n\x0b\x66rom_offset\x18\x02 \x01(\x04\x12\x0f\n\x07\x63redits\x18\x03 \x01(\r\x12\x16\n\x0emax_batch_size\x18\x04 \x01(\r\"/\n\x0cSubscribeAck\x12\x0e\n\x06offset\x18\x01 \x01(\x04\x12\x0f\n\x07\x63redits\x18\x02 \x01(\r\"\x7f\n\x10SubscribeRequest\x12\x31\n\x05start\x18\x01 \x01(\x0b\x32 .core.platform.v1.SubscribeStartH\x00\x12-\n\x03\x61\x63k\x18\x02 \x01(\x0b\x32\x1e.core.platform.v1.SubscribeAckH\x00\x42\t\n\x07request*\x8c\x01\n\tEventType\x12\x1a\n\x16\x45VENT_TYPE_UNSPECIFIED\x10\x00\x12\x16\n\x12STUDENT_REGISTERED\x10\x01\x12\x12\n\x0eVACANCY_POSTED\x10\x02\x12\x17\n\x13\x41PPLICATION_CREATED\x10\x03\x12\x1e\n\x1a\x41PPLICATION_STATUS_CHANGED\x10\x04\x32^\n\tEventFeed\x12Q\n\tSubscribe\x12\".core.platform.v1.SubscribeRequest\x1a\x1c.core.platform.v1.EventBatch(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'platform.v1.events_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_EVENTTYPE']._serialized_start=581
-  _globals['_EVENTTYPE']._serialized_end=721
+  _globals['_EVENTTYPE']._serialized_start=1129
+  _globals['_EVENTTYPE']._serialized_end=1269
   _globals['_BASEEVENT']._serialized_start=107
   _globals['_BASEEVENT']._serialized_end=228
   _globals['_APPLICATIONCREATEDEVENT']._serialized_start=231
   _globals['_APPLICATIONCREATEDEVENT']._serialized_end=363
   _globals['_APPLICATIONSTATUSCHANGEDEVENT']._serialized_start=366
   _globals['_APPLICATIONSTATUSCHANGEDEVENT']._serialized_end=578
+  _globals['_EVENTENVELOPE']._serialized_start=581
+  _globals['_EVENTENVELOPE']._serialized_end=782
+  _globals['_EVENTBATCH']._serialized_start=784
+  _globals['_EVENTBATCH']._serialized_end=845
+  _globals['_SUBSCRIBESTART']._serialized_start=847
+  _globals['_SUBSCRIBESTART']._serialized_end=948
+  _globals['_SUBSCRIBEACK']._serialized_start=950
+  _globals['_SUBSCRIBEACK']._serialized_end=997
+  _globals['_SUBSCRIBEREQUEST']._serialized_start=999
+  _globals['_SUBSCRIBEREQUEST']._serialized_end=1126
+  _globals['_EVENTFEED']._serialized_start=1271
+  _globals['_EVENTFEED']._serialized_end=1365
 # @@protoc_insertion_point(module_scope)
@@ -3,6 +3,7 @@
 import grpc
 import warnings
 
+from apps.core.dtos.platform.v1 import events_pb2 as platform_dot_v1_dot_events__pb2
 
 GRPC_GENERATED_VERSION = '1.76.0'
 GRPC_VERSION = grpc.__version__
@@ -22,3 +23,77 @@ if _version_not_supported:
         + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
         + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
     )
+
+
+class EventFeedStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Subscribe = channel.stream_stream(
+                '/core.platform.v1.EventFeed/Subscribe',
+                request_serializer=platform_dot_v1_dot_events__pb2.SubscribeRequest.SerializeToString,
+                response_deserializer=platform_dot_v1_dot_events__pb2.EventBatch.FromString,
+                _registered_method=True)
+
+
+class EventFeedServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def Subscribe(self, request_iterator, context):
+        """Consumer ack/kredit yuboradi, server batchlarni kredit va
+        in-flight oynasi doirasida yuboradi
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_EventFeedServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Subscribe': grpc.stream_stream_rpc_method_handler(
+                    servicer.Subscribe,
+                    request_deserializer=platform_dot_v1_dot_events__pb2.SubscribeRequest.FromString,
+                    response_serializer=platform_dot_v1_dot_events__pb2.EventBatch.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'core.platform.v1.EventFeed', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('core.platform.v1.EventFeed', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class EventFeed(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Subscribe(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/core.platform.v1.EventFeed/Subscribe',
+            platform_dot_v1_dot_events__pb2.SubscribeRequest.SerializeToString,
+            platform_dot_v1_dot_events__pb2.EventBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,231 @@
+"""
+Domain eventlari uchun jarayon ichidagi broker.
+
+Har bir event ``EventEnvelope`` ga o'ralib, tartib raqami (offset) bilan
+bir marta serializatsiya qilinadi va shu baytlar barcha subscriberlarga
+qayta ishlatiladi. Xotiradagi log hajmi ``RETENTION`` bilan cheklangan;
+``EVENT_LOG`` yoqilgan bo'lsa eventlar diskka ham yoziladi va undan eski
+offsetlar disk dan o'qiladi (qarang log.py). Disk log ga bitta jarayon
+yozadi, shuning uchun log yoqilgan bo'lsa broker faqat relay ishlaydigan
+jarayonda yaratiladi (ikkinchisida ``EventLogLocked``). Subscriberlar
+tasdiqlagan (commit qilingan) offsetlar broker da saqlanadi; disk log
+bo'lsa ular log yonida ham saqlanadi (ko'pi bilan
+``OFFSETS_FLUSH_INTERVAL`` da bir marta va ``close()`` da), shuning uchun
+restartdan keyin subscriber log ni boshidan emas, oxirgi saqlangan
+offsetdan o'qiydi (oxirgi oraliqdagi eventlar qayta kelishi mumkin)::
+
+    EVENT_FEED = {
+        "RETENTION": 100_000,     # xotirada saqlanadigan eventlar
+        "MAX_IN_FLIGHT": 1000,    # subscriber uchun tasdiqlanmagan eventlar
+        "MAX_BATCH_SIZE": 100,
+        "OFFSETS_FLUSH_INTERVAL": 1.0,  # sekund
+    }
+"""
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from google.protobuf.message import Message
+
+from apps.core.dtos.platform.v1.events_pb2 import EventEnvelope
+from apps.core.events.log import EventLog, create_event_log
+from protobuf_scanner import encode_varint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION = 100_000
+DEFAULT_OFFSETS_FLUSH_INTERVAL = 1.0
+
+# Event message turi -> EventEnvelope.event oneof maydoni
+ENVELOPE_FIELDS = {
+    field.message_type.full_name: field.name
+    for field in EventEnvelope.DESCRIPTOR.oneofs_by_name["event"].fields
+}
+# Oneof maydoni -> wire tag (length-delimited)
+ENVELOPE_TAGS = {
+    field.name: encode_varint(field.number << 3 | 2)
+    for field in EventEnvelope.DESCRIPTOR.oneofs_by_name["event"].fields
+}
+_TAG_OFFSET = b"\x08"  # EventEnvelope.offset = 1 (varint)
+
+
+def encode_envelope(offset: int, event_type: str, payload: bytes) -> bytes:
+    """EventEnvelope baytlari (SerializeToString bilan bir xil)"""
+    return _TAG_OFFSET + encode_varint(offset) + ENVELOPE_TAGS[event_type] + encode_varint(len(payload)) + payload
+
+
+class EventBroker:
+    """Offsetli, hajmi cheklangan event log va subscriber offsetlari"""
+
+    def __init__(
+        self,
+        retention: int = DEFAULT_RETENTION,
+        log: Optional[EventLog] = None,
+        offsets_flush_interval: float = DEFAULT_OFFSETS_FLUSH_INTERVAL,
+    ):
+        self.retention = retention
+        self.log = log
+        self.offsets_flush_interval = offsets_flush_interval
+        # Yangi event yoki ack kelganda kutayotgan subscriberlar uyg'otiladi
+        self.condition = threading.Condition(threading.RLock())
+        self._events: List[bytes] = []
+        # Disk log bo'lsa offsetlar (eventlar va subscriberlarniki) undan davom etadi
+        self._first_offset = log.next_offset if log is not None else 1
+        self._committed: Dict[str, int] = log.load_offsets() if log is not None else {}
+        self._offsets_dirty = False
+        self._offsets_saved_at = time.monotonic()
+
+    @property
+    def first_offset(self) -> int:
+        """Log dagi eng eski event offseti"""
+        return self._first_offset
+
+    @property
+    def last_offset(self) -> int:
+        """Oxirgi event offseti (0 - log bo'sh)"""
+        return self._first_offset + len(self._events) - 1
+
+    def publish(self, event: Message) -> int:
+        """
+        Eventni log ga qo'shadi
+
+        Args:
+            event: ApplicationCreatedEvent, ApplicationStatusChangedEvent, ...
+
+        Returns:
+            Event offseti
+        """
+        field = ENVELOPE_FIELDS.get(event.DESCRIPTOR.full_name)
+        if field is None:
+            raise ValueError(f"EventEnvelope da qo'llab-quvvatlanmaydigan event: {event.DESCRIPTOR.full_name}")
+        return self.publish_batch([(field, event.SerializeToString())])[0]
+
+    def publish_batch(self, events: Iterable[Tuple[str, bytes]]) -> List[int]:
+        """
+        Serializatsiya qilingan eventlarni bitta lock ostida log ga qo'shadi
+
+        Envelope baytlari qo'lda yig'iladi (EventEnvelope.SerializeToString
+        bilan bir xil), shuning uchun eventlar qayta parse qilinmaydi.
+
+        Args:
+            events: [(EventEnvelope oneof maydoni, event baytlari)]
+
+        Returns:
+            Eventlar offsetlari
+        """
+        encoded = []
+        for field, payload in events:
+            tag = ENVELOPE_TAGS.get(field)
+            if tag is None:
+                raise ValueError(f"EventEnvelope da bunday maydon yo'q: {field}")
+            encoded.append(tag + encode_varint(len(payload)) + payload)
+        if not encoded:
+            return []
+
+        with self.condition:
+            first = self.last_offset + 1
+            envelopes = [_TAG_OFFSET + encode_varint(first + i) + body for i, body in enumerate(encoded)]
+            if self.log is not None:
+                self.log.append_batch(zip(range(first, first + len(envelopes)), envelopes))
+            self._events.extend(envelopes)
+            # Eski eventlar bo'laklab o'chiriladi (har publish da emas)
+            overflow = len(self._events) - self.retention
+            if overflow > max(1, self.retention // 4):
+                del self._events[:overflow]
+                self._first_offset += overflow
+            self.condition.notify_all()
+        return list(range(first, first + len(encoded)))
+
+    def read(self, from_offset: int, limit: int) -> List[Tuple[int, bytes]]:
+        """
+        from_offset dan boshlab ko'pi bilan limit ta event
+
+        Returns:
+            [(offset, EventEnvelope baytlari)]; agar from_offset retention dan
+            chiqib ketgan bo'lsa, eng eski mavjud eventdan boshlanadi
+        """
+        with self.condition:
+            memory_first = self._first_offset
+            if self.log is None or from_offset >= memory_first:
+                return self._read_memory(from_offset, limit)
+        # Xotiradan chiqqan offsetlar - disk log dan (lock siz, publish ni to'xtatmaydi)
+        return self.log.read(from_offset, min(limit, memory_first - from_offset))
+
+    def _read_memory(self, from_offset: int, limit: int) -> List[Tuple[int, bytes]]:
+        with self.condition:
+            start = max(from_offset, self._first_offset)
+            if start > from_offset:
+                logger.warning("⚠️ %d..%d eventlar retention dan chiqib ketgan", from_offset, start - 1)
+            index = start - self._first_offset
+            return [(start + i, data) for i, data in enumerate(self._events[index:index + limit])]
+
+    def commit(self, subscriber_id: str, offset: int) -> None:
+        """Subscriber shu offset gacha eventlarni ishlaganini saqlaydi"""
+        with self.condition:
+            if offset > self._committed.get(subscriber_id, 0):
+                self._committed[subscriber_id] = offset
+                self._offsets_dirty = True
+                if time.monotonic() - self._offsets_saved_at >= self.offsets_flush_interval:
+                    self.flush_offsets()
+
+    def committed(self, subscriber_id: str) -> int:
+        """Subscriber ning saqlangan offseti (0 - hali yo'q)"""
+        with self.condition:
+            return self._committed.get(subscriber_id, 0)
+
+    def flush_offsets(self) -> None:
+        """O'zgargan subscriber offsetlarini disk log yoniga yozadi"""
+        with self.condition:
+            if self.log is None or not self._offsets_dirty:
+                return
+            try:
+                self.log.save_offsets(self._committed)
+            except OSError as e:
+                logger.error(f"❌ Subscriber offsetlarini saqlab bo'lmadi: {e}")
+                return
+            self._offsets_dirty = False
+            self._offsets_saved_at = time.monotonic()
+
+    def close(self) -> None:
+        """Offsetlarni saqlab, disk log ni yopadi"""
+        if self.log is not None:
+            self.flush_offsets()
+            self.log.close()
+
+
+_broker: Optional[EventBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_event_broker() -> EventBroker:
+    """
+    settings.EVENT_FEED asosida jarayon bo'yicha yagona broker
+
+    Raises:
+        EventLogLocked: agar EVENT_LOG ga boshqa jarayon yozayotgan bo'lsa
+    """
+    global _broker
+    if _broker is not None:
+        return _broker
+
+    from django.conf import settings
+
+    config = getattr(settings, "EVENT_FEED", {})
+    with _broker_lock:
+        if _broker is None:
+            _broker = EventBroker(
+                retention=config.get("RETENTION", DEFAULT_RETENTION),
+                log=create_event_log(),
+                offsets_flush_interval=config.get("OFFSETS_FLUSH_INTERVAL", DEFAULT_OFFSETS_FLUSH_INTERVAL),
+            )
+    return _broker
+
+
+def reset_event_broker(**kwargs) -> None:
+    """Sozlamalar o'zgarganda broker qayta yaratilishi uchun"""
+    global _broker
+    if kwargs.get("setting", "EVENT_FEED") in ("EVENT_FEED", "EVENT_LOG"):
+        broker, _broker = _broker, None
+        if broker is not None:
+            broker.close()
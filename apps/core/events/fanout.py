@@ -0,0 +1,105 @@
+"""
+Outbox eventlarini Celery task lariga tarqatish.
+
+Relay har bir drain qilingan batchni ``MAX_BATCH_SIZE`` tagacha eventli
+EventBatch larga bo'lib ``core.deliver_events`` task iga beradi. Envelope
+offseti - OutboxEvent.id (sinklar uchun monoton tartib raqami). Task
+broker ga yuborilgandan keyingina outbox qatorlari o'chiriladi, shuning
+uchun eventlar yo'qolmaydi; yarmida xato bo'lsa, yuborilgan task lar
+qatorlari ``fanned_out`` deb belgilanadi va qayta yuborilmaydi.
+"""
+import logging
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from apps.core.events.broker import encode_envelope
+from protobuf_scanner import encode_varint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_MAX_DELAY_MS = 50
+
+_TAG_EVENTS = b"\x0a"  # EventBatch.events = 1
+
+
+class CeleryFanout:
+    """Eventlarni chegaralangan batchlarda deliver_events task iga yuboradi"""
+
+    def __init__(self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_delay_ms: int = DEFAULT_MAX_DELAY_MS):
+        self.max_batch_size = max_batch_size
+        self.max_delay_ms = max_delay_ms
+
+    def publish_batch(
+        self,
+        events: Iterable[Tuple[int, str, bytes]],
+        on_sent: Optional[Callable[[List[int]], None]] = None,
+    ) -> int:
+        """
+        Args:
+            events: [(offset, EventEnvelope oneof maydoni, event baytlari)]
+            on_sent: Har bir task yuborilgach uning offsetlari bilan
+                chaqiriladi (yarmida xato bo'lsa, yuborilganlari ma'lum bo'ladi)
+
+        Returns:
+            Yuborilgan task lar soni
+        """
+        from apps.core.tasks import deliver_events
+
+        tasks = 0
+        chunk = []
+        offsets = []
+        for offset, event_type, payload in events:
+            envelope = encode_envelope(offset, event_type, payload)
+            chunk.append(_TAG_EVENTS + encode_varint(len(envelope)) + envelope)
+            offsets.append(offset)
+            if len(chunk) >= self.max_batch_size:
+                deliver_events.delay(b"".join(chunk))
+                tasks += 1
+                if on_sent is not None:
+                    on_sent(offsets)
+                chunk = []
+                offsets = []
+        if chunk:
+            deliver_events.delay(b"".join(chunk))
+            tasks += 1
+            if on_sent is not None:
+                on_sent(offsets)
+        logger.debug("📨 Celery ga %d ta task yuborildi", tasks)
+        return tasks
+
+_fanout: Optional[CeleryFanout] = None
+_fanout_lock = threading.Lock()
+
+
+def get_event_fanout() -> Optional[CeleryFanout]:
+    """
+    settings.EVENT_FANOUT asosida jarayon bo'yicha yagona fan-out
+
+    Returns:
+        CeleryFanout yoki None (o'chirilgan bo'lsa)
+    """
+    global _fanout
+    if _fanout is not None:
+        return _fanout
+
+    from django.conf import settings
+
+    config = getattr(settings, "EVENT_FANOUT", {})
+    if not config.get("ENABLED", False):
+        return None
+
+    with _fanout_lock:
+        if _fanout is None:
+            _fanout = CeleryFanout(
+                max_batch_size=config.get("MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE),
+                max_delay_ms=config.get("MAX_DELAY_MS", DEFAULT_MAX_DELAY_MS),
+            )
+    return _fanout
+
+
+def reset_event_fanout(**kwargs) -> None:
+    """Sozlamalar o'zgarganda fan-out qayta yaratilishi uchun"""
+    global _fanout
+    if kwargs.get("setting", "EVENT_FANOUT") == "EVENT_FANOUT":
+        _fanout = None
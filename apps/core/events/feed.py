@@ -0,0 +1,179 @@
+"""
+EventFeed.Subscribe - bidirectional streaming event feed.
+
+Consumer stream ni ``SubscribeStart`` bilan ochadi, keyin
+``SubscribeAck`` larda ishlangan offset va qo'shimcha kredit yuboradi.
+Server har bir subscriber uchun:
+
+* kredit bo'lmasa event yubormaydi (consumer tomonida flow control);
+* tasdiqlanmagan eventlar sonini ``MAX_IN_FLIGHT`` bilan cheklaydi
+  (server tomonida buferlar cheksiz o'smaydi);
+* ack qilingan offsetni broker da saqlaydi - qayta ulanganda shu joydan
+  davom etadi (at-least-once).
+
+Batchlar broker dagi tayyor EventEnvelope baytlaridan yig'iladi, shuning
+uchun eventlar har bir subscriber uchun qayta serializatsiya qilinmaydi.
+"""
+import logging
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+import grpc
+
+from apps.core.dtos.platform.v1.events_pb2 import SubscribeRequest
+from apps.core.dtos.platform.v1.events_pb2_grpc import EventFeedServicer
+from apps.core.events.broker import EventBroker, get_event_broker
+from protobuf_scanner import encode_varint
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "core.platform.v1.EventFeed"
+DEFAULT_MAX_IN_FLIGHT = 1000
+DEFAULT_MAX_BATCH_SIZE = 100
+# Yangi event/ack bo'lmasa ham stream holati shu oraliqda tekshiriladi
+POLL_INTERVAL = 1.0
+
+_TAG_EVENTS = b"\x0a"  # EventBatch.events = 1 (length-delimited)
+
+
+def encode_event_batch(events: List[Tuple[int, bytes]]) -> bytes:
+    """Tayyor EventEnvelope baytlaridan EventBatch yig'adi"""
+    return b"".join(_TAG_EVENTS + encode_varint(len(data)) + data for _, data in events)
+
+
+class Subscription:
+    """Bitta ochiq Subscribe stream holati"""
+
+    __slots__ = ("subscriber_id", "next_offset", "acked", "credits", "max_batch_size", "closed")
+
+    def __init__(self, subscriber_id: str, next_offset: int, credits: int, max_batch_size: int):
+        self.subscriber_id = subscriber_id
+        # Keyingi yuboriladigan event offseti
+        self.next_offset = next_offset
+        # Shu offset gacha consumer ishlagan
+        self.acked = next_offset - 1
+        self.credits = credits
+        self.max_batch_size = max_batch_size
+        self.closed = False
+
+    @property
+    def in_flight(self) -> int:
+        return self.next_offset - 1 - self.acked
+
+
+class EventFeedService(EventFeedServicer):
+    """Broker dagi eventlarni subscriberlarga kredit va oyna doirasida uzatadi"""
+
+    def __init__(
+        self,
+        broker: EventBroker = None,
+        max_in_flight: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+    ):
+        from django.conf import settings
+
+        config = getattr(settings, "EVENT_FEED", {})
+        self._broker = broker
+        self.max_in_flight = max_in_flight or config.get("MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)
+        self.max_batch_size = max_batch_size or config.get("MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE)
+
+    @property
+    def broker(self) -> EventBroker:
+        return self._broker if self._broker is not None else get_event_broker()
+
+    def Subscribe(self, request_iterator: Iterator[SubscribeRequest], context: grpc.ServicerContext) -> Iterator[bytes]:
+        first = next(request_iterator, None)
+        if first is None or first.WhichOneof("request") != "start" or not first.start.subscriber_id:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Birinchi xabar subscriber_id li SubscribeStart bo'lishi kerak")
+
+        broker = self.broker
+        start = first.start
+        subscription = Subscription(
+            start.subscriber_id,
+            start.from_offset or broker.committed(start.subscriber_id) + 1,
+            start.credits,
+            min(start.max_batch_size or self.max_batch_size, self.max_batch_size),
+        )
+        logger.info("📡 Subscriber ulandi: %s (offset %d)", subscription.subscriber_id, subscription.next_offset)
+
+        reader = threading.Thread(
+            target=self._read_acks, args=(request_iterator, subscription, broker), daemon=True
+        )
+        reader.start()
+        try:
+            while True:
+                events = self._next_batch(subscription, broker, context)
+                if events is None:
+                    return
+                yield encode_event_batch(events)
+        finally:
+            subscription.closed = True
+            # Qayta ulanganda oxirgi tasdiqlangan offsetdan davom etishi uchun
+            broker.flush_offsets()
+            logger.info(
+                "📴 Subscriber uzildi: %s (tasdiqlangan offset %d)", subscription.subscriber_id, subscription.acked
+            )
+
+    def _next_batch(self, subscription: Subscription, broker: EventBroker, context) -> List[Tuple[int, bytes]]:
+        """Kredit, oyna va yangi eventlar bo'lguncha kutadi; stream yopilsa None"""
+        while True:
+            with broker.condition:
+                while True:
+                    if subscription.closed or not context.is_active():
+                        return None
+                    limit = min(
+                        subscription.credits,
+                        subscription.max_batch_size,
+                        self.max_in_flight - subscription.in_flight,
+                    )
+                    if limit > 0 and broker.last_offset >= subscription.next_offset:
+                        break
+                    broker.condition.wait(POLL_INTERVAL)
+
+            # Disk log dan o'qish lock siz bo'ladi; next_offset ni faqat shu thread o'zgartiradi
+            events = broker.read(subscription.next_offset, limit)
+            with broker.condition:
+                if not events:
+                    # Bu offsetlar na xotirada, na diskda - mavjud eventlardan davom etiladi
+                    subscription.next_offset = broker.first_offset
+                    subscription.acked = max(subscription.acked, broker.first_offset - 1)
+                    continue
+                subscription.credits -= len(events)
+                subscription.next_offset = events[-1][0] + 1
+            return events
+
+    @staticmethod
+    def _read_acks(request_iterator: Iterator[SubscribeRequest], subscription: Subscription, broker: EventBroker) -> None:
+        """Consumer dan kelayotgan ack/kreditlarni qabul qiladi (alohida thread)"""
+        try:
+            for request in request_iterator:
+                if request.WhichOneof("request") != "ack":
+                    continue
+                ack = request.ack
+                with broker.condition:
+                    # Hali yuborilmagan offsetni tasdiqlab bo'lmaydi
+                    offset = min(ack.offset, subscription.next_offset - 1)
+                    if offset > subscription.acked:
+                        subscription.acked = offset
+                        broker.commit(subscription.subscriber_id, offset)
+                    subscription.credits += ack.credits
+                    broker.condition.notify_all()
+        except grpc.RpcError:
+            pass
+        finally:
+            with broker.condition:
+                subscription.closed = True
+                broker.condition.notify_all()
+
+
+def add_event_feed_service(service: EventFeedService, server: grpc.Server) -> None:
+    """
+    Servisni serverga qo'shadi; javob serializer siz - batchlar tayyor
+    baytlardan yig'iladi
+    """
+    handlers = {
+        "Subscribe": grpc.stream_stream_rpc_method_handler(
+            service.Subscribe, request_deserializer=SubscribeRequest.FromString
+        ),
+    }
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE_NAME, handlers),))
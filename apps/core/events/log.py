@@ -0,0 +1,543 @@
+"""
+Domain eventlari uchun append-only, segmentlangan disk log.
+
+Broker ga tushgan har bir EventEnvelope shu offset bilan diskka ham
+yoziladi, shuning uchun downstream tizimlar uzilishdan keyin eventlarni
+bazani scan qilmasdan, ketma-ket o'qish bilan qayta olishi mumkin::
+
+    EVENT_LOG = {
+        "DIRECTORY": BASE_DIR / "event_log",   # None - o'chirilgan
+        "SEGMENT_BYTES": 64 * 1024 * 1024,
+        "INDEX_INTERVAL_BYTES": 4096,
+        "RETENTION_SEGMENTS": 32,
+        "RETENTION_SECONDS": 7 * 24 * 3600,    # 0 - vaqt bo'yicha o'chirilmaydi
+        "FSYNC": False,
+    }
+
+Har bir segment (nomi - birinchi offset) uchta fayldan iborat:
+
+* ``.log`` - length-delimited EventEnvelope lar;
+* ``.timeindex`` - har ``INDEX_INTERVAL_BYTES`` da bitta yozuv:
+  (shu joygacha bo'lgan eng katta occurred_at, offset, fayl pozitsiyasi);
+* ``.idindex`` - har bir event uchun event_id ning 64 bitli hash i
+  (offset = segment boshi + yozuv tartibi).
+
+Subscriberlar tasdiqlagan offsetlar katalogdagi ``offsets.json`` da
+saqlanadi (vaqtinchalik faylga yozilib, atomik almashtiriladi).
+
+O'qish mmap orqali bo'ladi; faol segment oxiridagi chala yozuv (jarayon
+yiqilgan bo'lsa) ochishda kesib tashlanadi.
+
+Log ga faqat bitta jarayon yozadi: yozish uchun ochishda katalogdagi
+``.lock`` fayliga eksklyuziv lock olinadi, band bo'lsa ``EventLogLocked``
+ko'tariladi (ikkinchi yozuvchi offsetlarni ajratib yubormasligi va
+tiklashda boshqa jarayonning yozuvlarini kesmasligi uchun). O'qish uchun
+(``read_only=True``) lock kerak emas.
+"""
+import bisect
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from apps.core.dtos.platform.v1.events_pb2 import EventEnvelope
+from protobuf_scanner import decode_varint, encode_varint
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE_NAME = ".lock"
+OFFSETS_FILE_NAME = "offsets.json"
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_INDEX_INTERVAL_BYTES = 4096
+DEFAULT_RETENTION_SEGMENTS = 32
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 3600
+
+_TIME_ENTRY = struct.Struct("<qQQ")  # max occurred_at (ns), offset, pozitsiya
+_ID_ENTRY = struct.Struct("<Q")
+_MIN_TIMESTAMP = -(1 << 63)
+
+Record = Tuple[int, bytes]
+
+
+class EventLogLocked(RuntimeError):
+    """Event log katalogiga boshqa jarayon yozayotganda ko'tariladi"""
+
+
+def lock_directory(directory: Path):
+    """
+    Katalogga eksklyuziv (kutmaydigan) yozish lock ini oladi; lock fayl
+    yopilganda yoki jarayon tugaganda bo'shaydi
+
+    Returns:
+        Ochiq lock fayli
+
+    Raises:
+        EventLogLocked: agar lock boshqa jarayonda bo'lsa
+    """
+    file = open(directory / LOCK_FILE_NAME, "a+b")
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        file.seek(0)
+        holder = file.read().decode("ascii", "replace").strip() or "?"
+        file.close()
+        raise EventLogLocked(f"Event log ({directory}) ga boshqa jarayon yozmoqda (pid {holder})")
+    file.seek(0)
+    file.truncate()
+    file.write(str(os.getpid()).encode("ascii"))
+    file.flush()
+    return file
+
+
+def envelope_header(envelope: bytes) -> Tuple[str, int]:
+    """
+    EventEnvelope ichidagi event ning (event_id, occurred_at ns)
+
+    Domain eventlari kichik, shuning uchun upb parse wire-scan dan tezroq.
+    """
+    parsed = EventEnvelope.FromString(envelope)
+    case = parsed.WhichOneof("event")
+    if case is None:
+        return "", 0
+    base = getattr(parsed, case).base
+    return base.event_id, base.occurred_at.seconds * 1_000_000_000 + base.occurred_at.nanos
+
+
+def event_id_hash(event_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(event_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class Segment:
+    """Bitta segment: log fayli, siyrak vaqt indeksi va event_id hash indeksi"""
+
+    def __init__(self, directory: Path, base_offset: int):
+        self.base_offset = base_offset
+        name = f"{base_offset:020d}"
+        self.path = directory / f"{name}.log"
+        self.time_index_path = directory / f"{name}.timeindex"
+        self.id_index_path = directory / f"{name}.idindex"
+        self.size = 0
+        # Diskka yozilgan (flush qilingan) qism - o'quvchilar faqat shuni ko'radi
+        self.readable_size = 0
+        self.next_offset = base_offset
+        self.max_timestamp = _MIN_TIMESTAMP
+        # (shu pozitsiyagacha eng katta occurred_at, offset, pozitsiya)
+        self.time_index: List[Tuple[int, int, int]] = []
+        self._ids: Optional[Dict[int, Union[int, Tuple[int, ...]]]] = None
+        self._files = None
+        self._map = None
+        self._mapped_size = 0
+
+    # --- yozish ---
+
+    def open_for_append(self) -> None:
+        self._files = tuple(open(path, "ab") for path in (self.path, self.time_index_path, self.id_index_path))
+
+    def append(self, offset: int, envelope: bytes, event_id: str, occurred_at: int, index_interval: int) -> int:
+        """Yozuvni qo'shadi va uning o'lchamini qaytaradi"""
+        log_file, time_file, id_file = self._files
+        if not self.time_index or self.size - self.time_index[-1][2] >= index_interval:
+            entry = (self.max_timestamp, offset, self.size)
+            self.time_index.append(entry)
+            time_file.write(_TIME_ENTRY.pack(*entry))
+
+        record = encode_varint(len(envelope)) + envelope
+        log_file.write(record)
+        id_file.write(_ID_ENTRY.pack(event_id_hash(event_id)))
+        if self._ids is not None:
+            self._add_id(event_id_hash(event_id), offset)
+
+        self.size += len(record)
+        self.next_offset = offset + 1
+        if occurred_at > self.max_timestamp:
+            self.max_timestamp = occurred_at
+        return len(record)
+
+    def flush(self, fsync: bool = False) -> None:
+        if self._files is None:
+            return
+        for file in self._files:
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+        self.readable_size = self.size
+
+    def close(self) -> None:
+        if self._files is not None:
+            self.flush()
+            for file in self._files:
+                file.close()
+            self._files = None
+
+    def delete(self) -> None:
+        self.close()
+        for path in (self.path, self.time_index_path, self.id_index_path):
+            path.unlink(missing_ok=True)
+
+    # --- ochish va tiklash ---
+
+    def load(self, repair: bool = True, repair_indexes: bool = False) -> None:
+        """
+        Indekslarni o'qiydi va oxirgi indeks yozuvidan keyingi qismni scan
+        qilib next_offset / max_timestamp ni tiklaydi
+
+        Args:
+            repair: Oxiridagi chala yozuvni kesish (False - faqat e'tiborsiz qoldiriladi)
+            repair_indexes: Indekslarni log bilan moslashtirish (faol segment)
+        """
+        self.size = self.readable_size = self.path.stat().st_size
+        data = self.time_index_path.read_bytes() if self.time_index_path.exists() else b""
+        usable = len(data) - len(data) % _TIME_ENTRY.size
+        self.time_index = [
+            entry for entry in _TIME_ENTRY.iter_unpack(data[:usable]) if entry[2] < self.size
+        ]
+
+        if self.time_index:
+            self.max_timestamp, offset, position = self.time_index[-1]
+        else:
+            offset, position = self.base_offset, 0
+
+        buffer = self.buffer()
+        end = position
+        for offset, start, end in self._scan(buffer, offset, position, self.size):
+            _, occurred_at = envelope_header(buffer[start:end])
+            if occurred_at > self.max_timestamp:
+                self.max_timestamp = occurred_at
+            offset += 1
+        self.next_offset = offset
+        if end < self.size:
+            if repair:
+                logger.warning("⚠️ %s: chala yozuv kesildi (%d bayt)", self.path.name, self.size - end)
+                with open(self.path, "r+b") as file:
+                    file.truncate(end)
+            self.size = self.readable_size = end
+            self._map, self._mapped_size = None, 0
+            self.time_index = [entry for entry in self.time_index if entry[2] < end]
+
+        if repair and repair_indexes:
+            self._repair_indexes(len(data) != len(self.time_index) * _TIME_ENTRY.size)
+
+    def _repair_indexes(self, rewrite_time_index: bool) -> None:
+        if rewrite_time_index:
+            self.time_index_path.write_bytes(b"".join(_TIME_ENTRY.pack(*entry) for entry in self.time_index))
+
+        count = self.next_offset - self.base_offset
+        existing = self.id_index_path.stat().st_size // _ID_ENTRY.size if self.id_index_path.exists() else 0
+        if existing > count:
+            with open(self.id_index_path, "r+b") as file:
+                file.truncate(count * _ID_ENTRY.size)
+        elif existing < count:
+            buffer = self.buffer()
+            with open(self.id_index_path, "r+b" if self.id_index_path.exists() else "wb") as file:
+                file.truncate(existing * _ID_ENTRY.size)
+                file.seek(0, os.SEEK_END)
+                for _, start, end in self.records(buffer, self.base_offset + existing):
+                    event_id, _ = envelope_header(buffer[start:end])
+                    file.write(_ID_ENTRY.pack(event_id_hash(event_id)))
+
+    # --- o'qish ---
+
+    def buffer(self):
+        """Segment ning flush qilingan qismigacha mmap (faol segmentda o'sib boradi)"""
+        size = self.readable_size
+        if size == 0:
+            return b""
+        if self._mapped_size < size:
+            with open(self.path, "rb") as file:
+                # Eski map o'qiyotganlarda qolishi mumkin - GC yopadi
+                self._map = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+        return self._map
+
+    @staticmethod
+    def _scan(buffer, offset: int, position: int, end: int) -> Iterator[Tuple[int, int, int]]:
+        """(offset, envelope boshi, envelope oxiri) - to'liq yozuvlar"""
+        while position < end:
+            decoded = decode_varint(buffer, position)
+            if decoded is None:
+                return
+            length, start = decoded
+            if start + length > end:
+                return
+            yield offset, start, start + length
+            offset += 1
+            position = start + length
+
+    def records(self, buffer, from_offset: int) -> Iterator[Tuple[int, int, int]]:
+        """from_offset dan boshlab segment yozuvlari (siyrak indeks orqali)"""
+        i = bisect.bisect_right(self.time_index, from_offset, key=lambda entry: entry[1]) - 1
+        offset, position = (self.time_index[i][1], self.time_index[i][2]) if i >= 0 else (self.base_offset, 0)
+        for record in self._scan(buffer, offset, position, len(buffer)):
+            if record[0] >= from_offset:
+                yield record
+
+    def records_since(self, buffer, timestamp: int) -> Iterator[Tuple[int, int, int]]:
+        """occurred_at >= timestamp bo'lgan birinchi eventdan boshlab yozuvlar"""
+        # Oxirgi indeks yozuvi, undan oldingi barcha eventlar timestamp dan oldin
+        i = bisect.bisect_left(self.time_index, timestamp, key=lambda entry: entry[0]) - 1
+        offset, position = (self.time_index[i][1], self.time_index[i][2]) if i >= 0 else (self.base_offset, 0)
+        found = False
+        for record in self._scan(buffer, offset, position, len(buffer)):
+            if not found:
+                found = envelope_header(buffer[record[1]:record[2]])[1] >= timestamp
+            if found:
+                yield record
+
+    def lookup(self, event_id: str) -> Tuple[int, ...]:
+        """event_id hash i mos keladigan offsetlar (hash to'qnashuvi bo'lishi mumkin)"""
+        if self._ids is None:
+            ids = self._ids = {}
+            data = self.id_index_path.read_bytes() if self.id_index_path.exists() else b""
+            count = min(len(data) // _ID_ENTRY.size, self.next_offset - self.base_offset)
+            for i, (value,) in enumerate(_ID_ENTRY.iter_unpack(data[:count * _ID_ENTRY.size])):
+                self._add_id(value, self.base_offset + i)
+        found = self._ids.get(event_id_hash(event_id), ())
+        return (found,) if isinstance(found, int) else found
+
+    def _add_id(self, value: int, offset: int) -> None:
+        existing = self._ids.get(value)
+        if existing is None:
+            self._ids[value] = offset
+        else:
+            self._ids[value] = (existing, offset) if isinstance(existing, int) else existing + (offset,)
+
+
+class EventLog:
+    """Segmentlangan event log: yozish, offset/vaqt bo'yicha replay, event_id bo'yicha qidirish"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        index_interval_bytes: int = DEFAULT_INDEX_INTERVAL_BYTES,
+        retention_segments: int = DEFAULT_RETENTION_SEGMENTS,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+        fsync: bool = False,
+        read_only: bool = False,
+    ):
+        self.directory = Path(directory)
+        # Boshqa jarayon yozayotgan log ni o'qish uchun: tiklash, retention va yozish yo'q
+        self.read_only = read_only
+        self.segment_bytes = segment_bytes
+        self.index_interval_bytes = index_interval_bytes
+        self.retention_segments = retention_segments
+        self.retention_seconds = retention_seconds
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._segments: List[Segment] = []
+        self._lock_file = None
+        self._open()
+
+    def _open(self) -> None:
+        if not self.read_only:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Tiklash (chala yozuvni kesish) ham faqat lock egasida bajariladi
+            self._lock_file = lock_directory(self.directory)
+        bases = sorted(int(path.stem) for path in self.directory.glob("*.log"))
+        for i, base in enumerate(bases):
+            segment = Segment(self.directory, base)
+            segment.load(repair=not self.read_only, repair_indexes=i == len(bases) - 1)
+            self._segments.append(segment)
+        if not self._segments:
+            self._segments.append(Segment(self.directory, 1))
+        if not self.read_only:
+            self._segments[-1].open_for_append()
+            self._enforce_retention()
+        if bases:
+            logger.info(
+                "📚 Event log ochildi: %d segment, offsetlar %d..%d",
+                len(self._segments), self.first_offset, self.next_offset - 1,
+            )
+
+    @property
+    def first_offset(self) -> int:
+        """Diskdagi eng eski event offseti"""
+        return self._segments[0].base_offset
+
+    @property
+    def next_offset(self) -> int:
+        """Keyingi yoziladigan event offseti"""
+        return self._segments[-1].next_offset
+
+    def append_batch(self, records: Iterable[Record]) -> None:
+        """
+        EventEnvelope larni log oxiriga yozadi
+
+        Args:
+            records: [(offset, EventEnvelope baytlari)] - offsetlar
+                next_offset dan boshlab uzluksiz bo'lishi kerak
+        """
+        if self.read_only:
+            raise RuntimeError("Event log faqat o'qish uchun ochilgan")
+        with self._lock:
+            active = self._segments[-1]
+            for offset, envelope in records:
+                if offset != active.next_offset:
+                    raise ValueError(f"Offset uzluksiz emas: {offset} (kutilgan {active.next_offset})")
+                event_id, occurred_at = envelope_header(envelope)
+                if active.size and active.size + len(envelope) + 10 > self.segment_bytes:
+                    active = self._roll()
+                active.append(offset, envelope, event_id, occurred_at, self.index_interval_bytes)
+            active.flush(self.fsync)
+
+    def _roll(self) -> Segment:
+        """Faol segmentni yopib, yangisini ochadi va retention ni qo'llaydi"""
+        previous = self._segments[-1]
+        previous.flush(fsync=True)
+        previous.close()
+        segment = Segment(self.directory, previous.next_offset)
+        segment.open_for_append()
+        self._segments.append(segment)
+        self._enforce_retention()
+        return segment
+
+    def _enforce_retention(self) -> None:
+        cutoff = (time.time() - self.retention_seconds) * 1e9 if self.retention_seconds else None
+        while len(self._segments) > 1:
+            oldest = self._segments[0]
+            expired = cutoff is not None and oldest.max_timestamp < cutoff
+            if len(self._segments) <= self.retention_segments and not expired:
+                break
+            self._segments.pop(0)
+            oldest.delete()
+            logger.info("🗑️ Event log segmenti o'chirildi: %s", oldest.path.name)
+
+    def _segments_snapshot(self) -> List[Segment]:
+        with self._lock:
+            return list(self._segments)
+
+    def replay(self, from_offset: Optional[int] = None, since: Optional[int] = None) -> Iterator[Record]:
+        """
+        Eventlarni disk dan ketma-ket o'qiydi
+
+        Args:
+            from_offset: Shu offsetdan boshlab (retention dan chiqqan bo'lsa -
+                eng eskisidan)
+            since: occurred_at (nanosekund) shu vaqtdan keyingi birinchi
+                eventdan boshlab; undan keyingi barcha eventlar offset
+                tartibida qaytariladi
+
+        Yields:
+            (offset, EventEnvelope baytlari)
+        """
+        segments = self._segments_snapshot()
+        if since is not None:
+            # Segmentdagi eng katta occurred_at since dan kichik - butun segment o'tkaziladi
+            start = next((i for i, segment in enumerate(segments) if segment.max_timestamp >= since), len(segments))
+            if start == len(segments):
+                return
+            buffer = segments[start].buffer()
+            first = next(segments[start].records_since(buffer, since), None)
+            if first is None:
+                return
+            from_offset = first[0]
+            segments = segments[start:]
+        from_offset = from_offset or 1
+
+        for segment in segments:
+            if segment.next_offset <= from_offset:
+                continue
+            buffer = segment.buffer()
+            for offset, start, end in segment.records(buffer, from_offset):
+                yield offset, buffer[start:end]
+
+    def read(self, from_offset: int, limit: int) -> List[Record]:
+        """from_offset dan boshlab ko'pi bilan limit ta event"""
+        records = []
+        for record in self.replay(from_offset=from_offset):
+            records.append(record)
+            if len(records) >= limit:
+                break
+        return records
+
+    def find(self, event_id: str) -> Optional[Record]:
+        """
+        event_id bo'yicha eventni hash indeks orqali topadi (yangi
+        segmentlardan boshlab)
+
+        Returns:
+            (offset, EventEnvelope baytlari) yoki None
+        """
+        for segment in reversed(self._segments_snapshot()):
+            candidates = segment.lookup(event_id)
+            if not candidates:
+                continue
+            buffer = segment.buffer()
+            for candidate in candidates:
+                for offset, start, end in segment.records(buffer, candidate):
+                    if envelope_header(buffer[start:end])[0] == event_id:
+                        return offset, buffer[start:end]
+                    break
+        return None
+
+    def load_offsets(self) -> Dict[str, int]:
+        """Saqlangan subscriber offsetlari (fayl bo'lmasa yoki buzilgan bo'lsa - bo'sh)"""
+        path = self.directory / OFFSETS_FILE_NAME
+        try:
+            offsets = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.error(f"❌ {path} o'qilmadi, subscriberlar boshidan o'qiydi: {e}")
+            return {}
+        return {str(subscriber_id): int(offset) for subscriber_id, offset in offsets.items()}
+
+    def save_offsets(self, offsets: Dict[str, int]) -> None:
+        """Subscriber offsetlarini atomik saqlaydi (faqat yozuvchi jarayonda)"""
+        if self.read_only:
+            raise RuntimeError("Event log faqat o'qish uchun ochilgan")
+        path = self.directory / OFFSETS_FILE_NAME
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(offsets, file)
+            if self.fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._segments[-1].close()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+
+def create_event_log(read_only: bool = False) -> Optional[EventLog]:
+    """
+    settings.EVENT_LOG asosida log (DIRECTORY None bo'lsa - None)
+
+    Raises:
+        EventLogLocked: yozish uchun ochilganda log boshqa jarayonda band bo'lsa
+    """
+    from django.conf import settings
+
+    config = getattr(settings, "EVENT_LOG", {})
+    if not config.get("DIRECTORY"):
+        return None
+    return EventLog(
+        config["DIRECTORY"],
+        segment_bytes=config.get("SEGMENT_BYTES", DEFAULT_SEGMENT_BYTES),
+        index_interval_bytes=config.get("INDEX_INTERVAL_BYTES", DEFAULT_INDEX_INTERVAL_BYTES),
+        retention_segments=config.get("RETENTION_SEGMENTS", DEFAULT_RETENTION_SEGMENTS),
+        retention_seconds=config.get("RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS),
+        fsync=config.get("FSYNC", False),
+        read_only=read_only,
+    )
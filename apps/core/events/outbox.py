@@ -0,0 +1,287 @@
+"""
+Transactional outbox: domain eventlari model bilan bitta tranzaksiyada
+``OutboxEvent`` jadvaliga yoziladi, relay esa ularni batch qilib broker ga
+yuboradi.
+
+* so'rov faqat bitta qo'shimcha INSERT qiladi - broker/subscriberlarni
+  kutmaydi;
+* tranzaksiya rollback bo'lsa event ham yo'qoladi, commit bo'lsa - yo'qolmaydi;
+* relay ``BATCH_SIZE`` tagacha qatorni qisqa tranzaksiyada band qiladi
+  (``claimed_until``), commit dan keyin ``publish_batch`` bilan yuboradi
+  va o'chiradi. Har bir manzil (EventFeed broker va Celery fan-out)
+  yetkazilgani qatorda belgilanadi (``published``, ``fanned_out``), shuning
+  uchun bitta manzil ishlamasa, qayta urinishda faqat u takrorlanadi va
+  broker ga bir xil event yangi offset bilan qayta qo'shilmaydi.
+
+Kafolat at-least-once: relay broker ga yuborib, ``published`` belgisini
+yozishga ulgurmay o'lsa (yoki baza shu UPDATE da xato bersa), qatorlar
+``CLAIM_TIMEOUT`` dan keyin qayta yuboriladi - bu holda bitta event feed
+va disk log da ikki offset bilan uchraydi.
+
+Relay broker joylashgan jarayonda ishlaydi (``run_grpc_server``). Shu
+jarayondagi commitlar ``transaction.on_commit`` orqali relay ni darhol
+uyg'otadi; boshqa jarayonlarda yozilgan eventlar ``POLL_INTERVAL`` da
+olinadi. ``EVENT_FANOUT`` yoqilgan bo'lsa, xuddi shu relay har bir batchni
+Celery task lariga ham beradi (qarang fanout.py).
+
+Outbox qatori yuborilgach o'chiriladi, ya'ni har bir event faqat bitta
+relay ga tegadi. Shuning uchun deploymentda bitta relay bo'ladi va u
+ikkala manzilni ham ta'minlaydi:
+
+* ``run_grpc_server`` ishlasa - relay uning ichida (EventFeed broker i +
+  Celery fan-out); alohida ``run_outbox_relay`` ishga tushirilmaydi;
+* gRPC server bo'lmasa - ``run_outbox_relay`` (faqat ``EVENT_FANOUT``
+  yoqilgan bo'lsa, aks holda eventlar hech kimga yetmaydi).
+
+::
+
+    EVENT_OUTBOX = {
+        "BATCH_SIZE": 500,
+        "POLL_INTERVAL": 0.5,   # sekund
+        "CLAIM_TIMEOUT": 60,    # sekund
+    }
+"""
+import logging
+import threading
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from google.protobuf.message import Message
+
+from apps.core.events.broker import ENVELOPE_FIELDS, EventBroker, get_event_broker
+from apps.core.events.fanout import CeleryFanout, get_event_fanout
+from apps.core.models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_CLAIM_TIMEOUT = 60
+
+
+def _outbox_row(event: Message) -> OutboxEvent:
+    event_type = ENVELOPE_FIELDS.get(event.DESCRIPTOR.full_name)
+    if event_type is None:
+        raise ValueError(f"EventEnvelope da qo'llab-quvvatlanmaydigan event: {event.DESCRIPTOR.full_name}")
+    return OutboxEvent(event_type=event_type, payload=event.SerializeToString())
+
+
+def enqueue_event(event: Message, using: Optional[str] = None) -> OutboxEvent:
+    """
+    Eventni joriy tranzaksiyada outbox ga yozadi
+
+    Args:
+        event: EventEnvelope da bor event (ApplicationCreatedEvent, ...)
+        using: Ma'lumotlar bazasi aliasi
+
+    Returns:
+        Yaratilgan OutboxEvent
+    """
+    row = _outbox_row(event)
+    row.save(using=using)
+    transaction.on_commit(wake_outbox_relay, using=using)
+    return row
+
+
+def enqueue_events(
+    events: Iterable[Message], using: Optional[str] = None, batch_size: Optional[int] = None
+) -> List[OutboxEvent]:
+    """
+    Ko'p eventni bitta bulk INSERT bilan outbox ga yozadi (on_commit - bir marta)
+
+    Args:
+        events: EventEnvelope da bor eventlar
+        using: Ma'lumotlar bazasi aliasi
+        batch_size: bulk_create batch hajmi
+
+    Returns:
+        Yaratilgan OutboxEvent lar
+    """
+    rows = [_outbox_row(event) for event in events]
+    if not rows:
+        return rows
+
+    rows = OutboxEvent.objects.using(using).bulk_create(rows, batch_size=batch_size)
+    transaction.on_commit(wake_outbox_relay, using=using)
+    return rows
+
+
+def wake_outbox_relay() -> None:
+    """Shu jarayonda relay ishlayotgan bo'lsa, uni darhol uyg'otadi"""
+    get_outbox_relay().wake()
+
+
+class OutboxRelay:
+    """Outbox jadvalini batchlab broker ga o'tkazadi"""
+
+    def __init__(
+        self,
+        broker: EventBroker = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        fanout: Optional[CeleryFanout] = None,
+        claim_timeout: float = DEFAULT_CLAIM_TIMEOUT,
+    ):
+        self._broker = broker
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.fanout = fanout
+        # Relay yuborish paytida o'lib qolsa, qatorlar shundan keyin qayta olinadi
+        self.claim_timeout = claim_timeout
+        # Uyg'otilgandan keyin yana commitlar yig'ilishini kutish (task lar kattaroq bo'lishi uchun)
+        self.linger = fanout.max_delay_ms / 1000 if fanout is not None else 0.0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def broker(self) -> EventBroker:
+        return self._broker if self._broker is not None else get_event_broker()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def drain_once(self) -> int:
+        """
+        Bitta batch: eng eski eventlarni band qiladi, yuboradi va o'chiradi
+
+        Qatorlar qisqa tranzaksiyada band qilinadi (``claimed_until``) va
+        broker/Celery ga commit dan keyin yuboriladi. Har bir manzil
+        alohida belgilanadi: masalan Celery ishlamasa, keyingi urinishda
+        eventlar EventFeed ga qayta qo'shilmaydi, faqat fan-out takrorlanadi.
+
+        Returns:
+            Yuborilgan eventlar soni
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            # skip_locked - bir nechta relay bir xil qatorlarni olmasligi uchun
+            # (SQLite da select_for_update e'tiborga olinmaydi, yozuvlar ketma-ket)
+            rows = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+                .order_by("id")
+                .values_list("id", "event_type", "payload", "published", "fanned_out")[:self.batch_size]
+            )
+            if not rows:
+                return 0
+            ids = [row[0] for row in rows]
+            OutboxEvent.objects.filter(id__in=ids).update(
+                claimed_until=now + timedelta(seconds=self.claim_timeout)
+            )
+
+        rows = [(pk, event_type, bytes(payload), *flags) for pk, event_type, payload, *flags in rows]
+        fanned_out = []
+        try:
+            unpublished = [row for row in rows if not row[3]]
+            if unpublished:
+                self.broker.publish_batch((event_type, payload) for _, event_type, payload, _, _ in unpublished)
+                OutboxEvent.objects.filter(id__in=[row[0] for row in unpublished]).update(published=True)
+            if self.fanout is not None:
+                self.fanout.publish_batch(
+                    ((pk, event_type, payload) for pk, event_type, payload, _, done in rows if not done),
+                    on_sent=fanned_out.extend,
+                )
+            OutboxEvent.objects.filter(id__in=ids).delete()
+        except Exception:
+            # Yuborilgan task lar belgilanadi, band qilish bekor qilinadi - keyingi
+            # poll faqat yetmagan manzillarga qayta yuboradi
+            if fanned_out:
+                OutboxEvent.objects.filter(id__in=fanned_out).update(fanned_out=True)
+            OutboxEvent.objects.filter(id__in=ids).update(claimed_until=None)
+            raise
+        return len(rows)
+
+    def drain(self) -> int:
+        """
+        Outbox bo'shaguncha batchlab yuboradi
+
+        Returns:
+            Jami yuborilgan eventlar soni
+        """
+        total = 0
+        while True:
+            count = self.drain_once()
+            total += count
+            if count < self.batch_size:
+                return total
+
+    def wake(self) -> None:
+        """Relay thread ini keyingi poll ni kutmasdan ishga tushiradi"""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Relay ni fon thread ida ishga tushiradi"""
+        with self._lock:
+            if self.running:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox-relay", daemon=True)
+            self._thread.start()
+        logger.info("📮 Outbox relay ishga tushdi (batch %d, poll %.1fs)", self.batch_size, self.poll_interval)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Relay thread ini to'xtatadi"""
+        self._stopped.set()
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                woken = self._wakeup.wait(self.poll_interval)
+                if woken and self.linger:
+                    self._stopped.wait(self.linger)
+                self._wakeup.clear()
+                if self._stopped.is_set():
+                    break
+                close_old_connections()
+                try:
+                    count = self.drain()
+                except Exception as e:
+                    logger.error(f"❌ Outbox relay xatosi: {e}")
+                    continue
+                if count:
+                    logger.debug("📤 Outbox dan %d ta event yuborildi", count)
+        finally:
+            connection.close()
+
+
+_relay: Optional[OutboxRelay] = None
+_relay_lock = threading.Lock()
+
+
+def get_outbox_relay() -> OutboxRelay:
+    """settings.EVENT_OUTBOX asosida jarayon bo'yicha yagona relay (ishga tushirilmagan)"""
+    global _relay
+    if _relay is not None:
+        return _relay
+
+    from django.conf import settings
+
+    config = getattr(settings, "EVENT_OUTBOX", {})
+    with _relay_lock:
+        if _relay is None:
+            _relay = OutboxRelay(
+                batch_size=config.get("BATCH_SIZE", DEFAULT_BATCH_SIZE),
+                poll_interval=config.get("POLL_INTERVAL", DEFAULT_POLL_INTERVAL),
+                fanout=get_event_fanout(),
+                claim_timeout=config.get("CLAIM_TIMEOUT", DEFAULT_CLAIM_TIMEOUT),
+            )
+    return _relay
+
+
+def reset_outbox_relay(**kwargs) -> None:
+    """Sozlamalar o'zgarganda relay qayta yaratilishi uchun"""
+    global _relay
+    if kwargs.get("setting", "EVENT_OUTBOX") == "EVENT_OUTBOX":
+        relay, _relay = _relay, None
+        if relay is not None:
+            relay.stop(timeout=0)
@@ -1,18 +1,74 @@
+import logging
 import uuid
 from google.protobuf.timestamp_pb2 import Timestamp
 from datetime import datetime
 from apps.core.dtos.platform.v1 import events_pb2
+from apps.core.events.broker import get_event_broker
+from apps.core.events.outbox import enqueue_event, enqueue_events
+from apps.core.mappers import application_mapper
 
-def publish_application_created(application):
-    event = events_pb2.ApplicationCreatedEvent(
-        base=events_pb2.BaseEvent(
-            event_id=str(uuid.uuid4()),
-            type=events_pb2.EventType.APPLICATION_CREATED,
-            occurred_at=Timestamp(seconds=int(datetime.utcnow().timestamp()))
-        ),
+logger = logging.getLogger(__name__)
+
+# Application.status qiymati -> ApplicationStatus enum ("pending" -> PENDING)
+APPLICATION_STATUS_TO_PROTO = application_mapper.enum_tables["status"]
+
+
+def _base_event(event_type, occurred_at=None):
+    return events_pb2.BaseEvent(
+        event_id=str(uuid.uuid4()),
+        type=event_type,
+        occurred_at=occurred_at or Timestamp(seconds=int(datetime.utcnow().timestamp()))
+    )
+
+
+def build_application_created_event(application, occurred_at=None):
+    return events_pb2.ApplicationCreatedEvent(
+        base=_base_event(events_pb2.EventType.APPLICATION_CREATED, occurred_at),
         application_id=application.id,
         student_id=application.student_id,
         vacancy_id=application.vacancy_id
     )
-    
-    print(event)
+
+
+def build_application_status_changed_event(application_id, old_status, new_status, occurred_at=None):
+    return events_pb2.ApplicationStatusChangedEvent(
+        base=_base_event(events_pb2.EventType.APPLICATION_STATUS_CHANGED, occurred_at),
+        application_id=application_id,
+        old_status=APPLICATION_STATUS_TO_PROTO[old_status],
+        new_status=APPLICATION_STATUS_TO_PROTO[new_status]
+    )
+
+
+def enqueue_application_created(application, using=None):
+    """Eventni ariza bilan bitta tranzaksiyada outbox ga yozadi (relay yuboradi)"""
+    return enqueue_event(build_application_created_event(application), using=using)
+
+
+def enqueue_applications_created(applications, using=None, batch_size=None):
+    """Ko'p ariza uchun eventlarni bitta bulk INSERT bilan outbox ga yozadi"""
+    occurred_at = Timestamp(seconds=int(datetime.utcnow().timestamp()))
+    events = (build_application_created_event(application, occurred_at) for application in applications)
+    return enqueue_events(events, using=using, batch_size=batch_size)
+
+
+def enqueue_application_status_changes(changes, new_status, using=None, batch_size=None):
+    """
+    Status o'zgarishlari uchun eventlarni outbox ga yozadi
+
+    Args:
+        changes: [(application_id, old_status)]
+        new_status: Yangi status qiymati
+    """
+    occurred_at = Timestamp(seconds=int(datetime.utcnow().timestamp()))
+    events = (
+        build_application_status_changed_event(application_id, old_status, new_status, occurred_at)
+        for application_id, old_status in changes
+    )
+    return enqueue_events(events, using=using, batch_size=batch_size)
+
+
+def publish_application_created(application):
+    """Eventni outbox siz, darhol broker ga yuboradi"""
+    offset = get_event_broker().publish(build_application_created_event(application))
+    logger.debug("📤 ApplicationCreatedEvent #%d: application %s", offset, application.id)
+    return offset
@@ -0,0 +1,102 @@
+"""
+Domain eventlari uchun sink registry.
+
+Sink Celery worker da bitta task dagi shu turdagi barcha eventlarni bir
+chaqiruvda oladi. Yetkazish at-least-once, shuning uchun sinklar
+``event.base.event_id`` bo'yicha idempotent bo'lishi kerak.
+
+Ilovalar sinklarini ``<app>/event_sinks.py`` modulida ro'yxatdan
+o'tkazadi::
+
+    from apps.core.events.sinks import sinks
+
+    @sinks.register(event_type="application_created")
+    def index_applications(events):
+        ...
+"""
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+from google.protobuf.message import Message
+
+from apps.core.dtos.platform.v1.events_pb2 import EventBatch
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[List[Message]], None]
+
+
+class SinkRegistry:
+    """EventEnvelope oneof maydoni (event_type) bo'yicha sinklar"""
+
+    def __init__(self):
+        self._sinks: Dict[Optional[str], List[Sink]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, func: Optional[Sink] = None, *, event_type: Optional[str] = None):
+        """
+        Sink ni ro'yxatdan o'tkazadi (decorator sifatida ham ishlatiladi)
+
+        Args:
+            func: sink(events) - events shu turdagi event message lari
+            event_type: Masalan "application_created" (None - barcha turlar)
+        """
+        def decorator(sink: Sink) -> Sink:
+            with self._lock:
+                self._sinks.setdefault(event_type, []).append(sink)
+            return sink
+
+        if func is not None:
+            return decorator(func)
+        return decorator
+
+    def unregister(self, func: Sink) -> None:
+        """Sink ni barcha turlardan olib tashlaydi"""
+        with self._lock:
+            for registered in self._sinks.values():
+                registered[:] = [sink for sink in registered if sink is not func]
+
+    def deliver(self, batch: bytes) -> int:
+        """
+        EventBatch ni turlarga ajratib sinklarga uzatadi
+
+        Barcha sinklar chaqiriladi; xato bo'lsa oxirida birinchisi qayta
+        ko'tariladi (task qayta urinishi uchun).
+
+        Returns:
+            Chaqirilgan sinklar soni
+        """
+        grouped: Dict[str, List[Message]] = {}
+        for envelope in EventBatch.FromString(batch).events:
+            event_type = envelope.WhichOneof("event")
+            if event_type:
+                grouped.setdefault(event_type, []).append(getattr(envelope, event_type))
+
+        calls = 0
+        error = None
+        for event_type, events in grouped.items():
+            for sink in self._sinks_for(event_type):
+                calls += 1
+                try:
+                    sink(events)
+                except Exception as e:
+                    logger.error(f"❌ Sink xatosi ({sink.__module__}.{sink.__qualname__}, {event_type}): {e}")
+                    error = error or e
+        if error is not None:
+            raise error
+        return calls
+
+    def _sinks_for(self, event_type: str) -> Sequence[Sink]:
+        return (*self._sinks.get(event_type, ()), *self._sinks.get(None, ()))
+
+
+# Loyiha bo'yicha umumiy registry
+sinks = SinkRegistry()
+
+
+def autodiscover() -> None:
+    """INSTALLED_APPS dagi har bir ilovaning event_sinks modulini yuklaydi"""
+    from django.utils.module_loading import autodiscover_modules
+
+    autodiscover_modules("event_sinks")
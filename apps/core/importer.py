@@ -0,0 +1,241 @@
+"""
+Length-delimited entities_pb2 dumplaridan ommaviy import.
+
+Fayl ``CHUNK_SIZE`` tadan message larga bo'linadi; har bir bo'lak o'z
+tranzaksiyasida parse qilinadi va ``bulk_create`` bilan ``batch_size``
+tadan yoziladi. ``save()`` va post_save chaqirilmaydi - shuning uchun
+outbox eventlari yozilmaydi; Application uchun vakansiya hisoblagichlari
+bo'lak tranzaksiyasida yangilanadi.
+
+``workers > 1`` bo'lsa asosiy jarayon faqat freymlarni ajratadi, parse va
+INSERT ``spawn`` qilingan worker jarayonlarda bajariladi (bir vaqtda
+ko'pi bilan ``workers * 2`` bo'lak navbatda - xotira cheklangan).
+Bo'laklar mustaqil commit bo'ladi: xato bo'lsa oldingi bo'laklar qoladi,
+qayta ishga tushirishda ``ignore_conflicts`` ular ustidan o'tadi.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_PROGRESS_INTERVAL = 2.0
+
+ENTITIES = ("students", "vacancies", "applications")
+
+
+class ImportStats(NamedTuple):
+    rows: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _mapper(entity: str):
+    from apps.core.mappers import application_mapper, student_mapper, vacancy_mapper
+
+    return {"students": student_mapper, "vacancies": vacancy_mapper, "applications": application_mapper}[entity]
+
+
+@contextmanager
+def _upstream_dates(model):
+    """
+    auto_now_add / auto_now ni vaqtincha o'chiradi - dump dagi sanalar
+    import vaqti bilan almashtirilmasligi uchun
+
+    Returns:
+        [(maydon, default funksiyasi)] - qiymati yo'q qatorlar uchun
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False) or getattr(field, "auto_now", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield [
+            (field, timezone.now if isinstance(field, models.DateTimeField) else timezone.localdate)
+            for field in fields
+        ]
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def import_messages(
+    entity: str,
+    messages: List[bytes],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    ignore_conflicts: bool = False,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """
+    Bitta bo'lakni bitta tranzaksiyada yozadi
+
+    Args:
+        entity: "students", "vacancies" yoki "applications"
+        messages: Serializatsiya qilingan message lar
+        batch_size: INSERT batch hajmi
+        ignore_conflicts: Mavjud pk/unikal qiymatli qatorlar o'tkazib yuboriladi
+        using: Baza alias i
+
+    Returns:
+        Yozilgan (ignore_conflicts da - yuborilgan) qatorlar soni
+    """
+    mapper = _mapper(entity)
+    model = mapper.model
+    objs = mapper.from_messages(map(mapper.message_class.FromString, messages))
+
+    with _upstream_dates(model) as date_fields, transaction.atomic(using=using):
+        for field, default in date_fields:
+            value = None
+            for obj in objs:
+                if getattr(obj, field.attname) is None:
+                    value = value or default()
+                    setattr(obj, field.attname, value)
+        model._base_manager.using(using).bulk_create(objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts)
+
+        if entity == "applications" and not ignore_conflicts:
+            from apps.core.models import VacancyApplicationCount
+
+            VacancyApplicationCount.objects.using(using).apply_deltas(
+                Counter((obj.vacancy_id, obj.status) for obj in objs)
+            )
+    return len(objs)
+
+
+def _init_worker() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+    django.setup()
+
+
+def iter_chunks(messages: Iterable[bytes], chunk_size: int) -> Iterator[List[bytes]]:
+    chunk = []
+    for data in messages:
+        chunk.append(data)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BulkImporter:
+    """Length-delimited stream ni bo'laklab (ixtiyoriy - parallel) import qiladi"""
+
+    def __init__(
+        self,
+        entity: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+        ignore_conflicts: bool = False,
+        using: str = DEFAULT_DB_ALIAS,
+        progress: Optional[Callable[[ImportStats], None]] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ):
+        """
+        Args:
+            entity: "students", "vacancies" yoki "applications"
+            batch_size: INSERT batch hajmi
+            chunk_size: Bitta tranzaksiyadagi qatorlar soni
+            workers: Worker jarayonlar soni (1 - joriy jarayonda)
+            ignore_conflicts: Mavjud qatorlarni o'tkazib yuborish
+            using: Baza alias i
+            progress: Har ``progress_interval`` soniyada chaqiriladi
+        """
+        if entity not in ENTITIES:
+            raise ValueError(f"Noma'lum entity: {entity}")
+        self.entity = entity
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.ignore_conflicts = ignore_conflicts
+        self.using = using
+        self.progress = progress
+        self.progress_interval = progress_interval
+
+    def run(self, stream: BinaryIO) -> ImportStats:
+        """
+        Args:
+            stream: Varint-length-delimited message lar (read(n) li obyekt)
+
+        Returns:
+            ImportStats (qatorlar soni va vaqt)
+        """
+        from protobuf_decoder import iter_delimited_messages
+
+        started = time.monotonic()
+        self._started = self._reported = started
+        self._rows = 0
+        chunks = iter_chunks(iter_delimited_messages(stream), self.chunk_size)
+        if self.workers > 1:
+            self._run_parallel(chunks)
+        else:
+            for chunk in chunks:
+                self._done(import_messages(self.entity, chunk, self.batch_size, self.ignore_conflicts, self.using))
+
+        if self.entity == "applications" and self.ignore_conflicts and self._rows:
+            # O'tkazib yuborilgan qatorlar noma'lum - hisoblagichlar qayta sanaladi
+            from apps.core.models import VacancyApplicationCount
+
+            VacancyApplicationCount.objects.using(self.using).reconcile()
+        self._reset_sequences()
+        return ImportStats(self._rows, time.monotonic() - started)
+
+    def _run_parallel(self, chunks: Iterator[List[bytes]]) -> None:
+        # Worker jarayonlar o'z ulanishlarini ochadi
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as executor:
+            pending = set()
+            try:
+                for chunk in chunks:
+                    if len(pending) >= self.workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._done(future.result())
+                    pending.add(executor.submit(
+                        import_messages, self.entity, chunk, self.batch_size, self.ignore_conflicts, self.using
+                    ))
+                for future in pending:
+                    self._done(future.result())
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    def _done(self, rows: int) -> None:
+        self._rows += rows
+        now = time.monotonic()
+        if self.progress is not None and now - self._reported >= self.progress_interval:
+            self._reported = now
+            self.progress(ImportStats(self._rows, now - self._started))
+
+    def _reset_sequences(self) -> None:
+        """pk lar dump dan olingan - keyingi INSERT lar to'qnashmasligi uchun sequence yangilanadi"""
+        from django.core.management.color import no_style
+
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(no_style(), [_mapper(self.entity).model])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
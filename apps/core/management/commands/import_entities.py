@@ -0,0 +1,59 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.importer import DEFAULT_BATCH_SIZE, DEFAULT_CHUNK_SIZE, ENTITIES, BulkImporter
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def decompress(stream):
+    """gzip sarlavhasi bo'lsa stream ni ochib o'qiydigan obyekt"""
+    if stream.peek(2)[:2] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+class Command(BaseCommand):
+    help = (
+        "Length-delimited entities_pb2 (Student/Vacancy/Application) dumpini bulk_create bilan import qiladi. "
+        "post_save va outbox eventlari chaqirilmaydi; to'xtab qolsa --ignore-conflicts bilan qayta ishga tushiring"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("entity", choices=ENTITIES)
+        parser.add_argument("path", help="Fayl (.gz ham bo'lishi mumkin) yoki stdin uchun -")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="INSERT batch hajmi")
+        parser.add_argument(
+            "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Bitta tranzaksiyadagi qatorlar soni"
+        )
+        parser.add_argument("--workers", type=int, default=1, help="Worker jarayonlar soni")
+        parser.add_argument("--ignore-conflicts", action="store_true", help="Mavjud qatorlarni o'tkazib yuborish")
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        if min(options["batch_size"], options["chunk_size"], options["workers"]) < 1:
+            raise CommandError("--batch-size, --chunk-size va --workers musbat bo'lishi kerak")
+
+        importer = BulkImporter(
+            options["entity"],
+            batch_size=options["batch_size"],
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            ignore_conflicts=options["ignore_conflicts"],
+            using=options["database"],
+            progress=lambda stats: self.stderr.write(f"📥 {stats.rows} qator, {stats.rate:,.0f} qator/s"),
+        )
+        if options["path"] == "-":
+            stats = importer.run(decompress(sys.stdin.buffer))
+        else:
+            try:
+                raw = open(options["path"], "rb")
+            except OSError as e:
+                raise CommandError(f"Faylni ochib bo'lmadi: {e}")
+            with raw:
+                stats = importer.run(decompress(raw))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {stats.rows} ta {options['entity']} import qilindi: {stats.seconds:.1f} s, {stats.rate:,.0f} qator/s"
+        ))
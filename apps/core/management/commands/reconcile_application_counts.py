@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.models import VacancyApplicationCount
+
+
+class Command(BaseCommand):
+    help = "Vakansiya ariza hisoblagichlarini Application jadvalidagi haqiqiy sonlar bilan tuzatadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Bitta tranzaksiyadagi vakansiyalar soni")
+
+    def handle(self, *args, **options):
+        fixed = VacancyApplicationCount.objects.reconcile(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"🔢 {fixed} ta hisoblagich tuzatildi"))
@@ -0,0 +1,56 @@
+import sys
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.events.log import create_event_log
+from protobuf_scanner import encode_varint
+
+
+class Command(BaseCommand):
+    help = (
+        "Disk dagi event log dan eventlarni length-delimited EventEnvelope "
+        "ko'rinishida chiqaradi (offset, vaqt yoki event_id bo'yicha)"
+    )
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument("--from-offset", type=int, help="Shu offsetdan boshlab")
+        group.add_argument("--since", help="occurred_at shu vaqtdan (ISO 8601) keyingi birinchi eventdan boshlab")
+        group.add_argument("--event-id", help="Faqat shu event_id li event")
+        parser.add_argument("--limit", type=int, default=0, help="Ko'pi bilan shuncha event (0 - cheklanmagan)")
+        parser.add_argument("--output", help="Fayl (default - stdout)")
+
+    def handle(self, *args, **options):
+        log = create_event_log(read_only=True)
+        if log is None:
+            raise CommandError("EVENT_LOG['DIRECTORY'] sozlanmagan")
+
+        if options["event_id"]:
+            found = log.find(options["event_id"])
+            records = [found] if found else []
+        else:
+            since = None
+            if options["since"]:
+                try:
+                    moment = datetime.fromisoformat(options["since"])
+                except ValueError as e:
+                    raise CommandError(f"Noto'g'ri --since: {e}")
+                if moment.tzinfo is None:
+                    moment = moment.replace(tzinfo=timezone.utc)
+                since = int(moment.timestamp() * 1_000_000_000)
+            records = log.replay(from_offset=options["from_offset"], since=since)
+
+        output = open(options["output"], "wb") if options["output"] else sys.stdout.buffer
+        count = 0
+        try:
+            for _, envelope in records:
+                output.write(encode_varint(len(envelope)) + envelope)
+                count += 1
+                if count == options["limit"]:
+                    break
+        finally:
+            if options["output"]:
+                output.close()
+            log.close()
+        self.stderr.write(f"📤 {count} ta event chiqarildi")
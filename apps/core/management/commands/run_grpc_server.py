@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.events.broker import reset_event_broker
+from apps.core.events.log import EventLogLocked
+from apps.core.events.outbox import get_outbox_relay
+from protobuf_grpc import DEFAULT_ADDRESS, DEFAULT_MAX_WORKERS, create_server
+
+
+class Command(BaseCommand):
+    help = "gRPC serverini ishga tushiradi (DataExchange: SendWebhook, StreamWebhooks; EventFeed: Subscribe)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--address", default=DEFAULT_ADDRESS, help="Tinglanadigan manzil (host:port)")
+        parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                            help="Bir vaqtda ishlanadigan RPC lar soni")
+        parser.add_argument("--grace", type=float, default=10.0,
+                            help="To'xtatishda ishlanayotgan RPC lar uchun kutish (sekund)")
+        parser.add_argument("--no-outbox-relay", action="store_true",
+                            help="Outbox relay ni ishga tushirmaslik (relay boshqa gRPC server da "
+                                 "ishlaganda; bu serverning EventFeed i eventlarni olmaydi). Relay "
+                                 "EVENT_FANOUT yoqilgan bo'lsa Celery ga ham yuboradi - "
+                                 "run_outbox_relay bilan birga ishlatilmaydi")
+
+    def handle(self, *args, **options):
+        relay = None if options["no_outbox_relay"] else get_outbox_relay()
+        if relay is not None:
+            try:
+                # Event log ni hoziroq ochamiz: boshqa relay yozayotgan bo'lsa ishga tushmaymiz
+                relay.broker
+            except EventLogLocked as e:
+                raise CommandError(str(e))
+
+        server = create_server(max_workers=options["max_workers"])
+        try:
+            port = server.add_insecure_port(options["address"])
+        except RuntimeError as e:
+            raise CommandError(f"Manzilni band qilib bo'lmadi: {options['address']} ({e})")
+
+        server.start()
+        if relay is not None:
+            relay.start()
+        self.stdout.write(self.style.SUCCESS(
+            f"🚀 gRPC server ishga tushdi: {options['address']} (port {port})"
+        ))
+        try:
+            server.wait_for_termination()
+        except KeyboardInterrupt:
+            self.stdout.write("🛑 Server to'xtatilmoqda...")
+            server.stop(options["grace"]).wait()
+        finally:
+            if relay is not None:
+                relay.stop(timeout=options["grace"])
+            # Subscriber offsetlari saqlanadi va event log lock i bo'shatiladi
+            reset_event_broker()
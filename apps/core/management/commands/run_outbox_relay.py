@@ -0,0 +1,43 @@
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.events.log import EventLogLocked
+from apps.core.events.outbox import get_outbox_relay
+
+
+class Command(BaseCommand):
+    help = (
+        "Outbox relay ni alohida jarayonda ishga tushiradi (EVENT_FANOUT bilan - Celery ga). "
+        "Faqat run_grpc_server ishlatilmaydigan deploymentlar uchun: gRPC server o'z relay i "
+        "bilan EventFeed ga ham, Celery ga ham yuboradi, ikkinchi relay esa eventlarni "
+        "EventFeed dan olib qo'yadi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Outbox ni bir marta bo'shatib chiqish")
+
+    def handle(self, *args, **options):
+        relay = get_outbox_relay()
+        if relay.fanout is None:
+            # Bu jarayon broker ining subscriberlari yo'q - eventlar o'chiriladi-yu, hech kimga yetmaydi
+            raise CommandError(
+                "EVENT_FANOUT o'chirilgan: EventFeed uchun outbox relay run_grpc_server ichida ishlaydi"
+            )
+        try:
+            relay.broker
+        except EventLogLocked as e:
+            raise CommandError(str(e))
+        if options["once"]:
+            count = relay.drain()
+            self.stdout.write(self.style.SUCCESS(f"📤 {count} ta event yuborildi"))
+            return
+
+        relay.start()
+        self.stdout.write(self.style.SUCCESS("📮 Outbox relay ishga tushdi (Celery fan-out)"))
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            self.stdout.write("🛑 Relay to'xtatilmoqda...")
+        finally:
+            relay.stop(timeout=10)
@@ -0,0 +1,14 @@
+"""
+entities.proto message lari uchun model mapperlari.
+
+Rejalar import vaqtida bir marta tuziladi; proto va model maydonlari
+mos kelmasa ilova ishga tushishida ``ImproperlyConfigured`` chiqadi.
+"""
+from apps.core.dtos.platform.v1 import entities_pb2
+from apps.core.models import Application, Student, Vacancy, VacancyApplicationCount
+from protobuf_mapper import ModelMapper
+
+student_mapper = ModelMapper(Student, entities_pb2.Student)
+vacancy_mapper = ModelMapper(Vacancy, entities_pb2.Vacancy)
+application_mapper = ModelMapper(Application, entities_pb2.Application)
+application_count_mapper = ModelMapper(VacancyApplicationCount, entities_pb2.VacancyApplicationCount)
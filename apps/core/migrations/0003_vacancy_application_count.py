@@ -0,0 +1,46 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_counts(apps, schema_editor):
+    Application = apps.get_model("core", "Application")
+    VacancyApplicationCount = apps.get_model("core", "VacancyApplicationCount")
+    db = schema_editor.connection.alias
+    rows = (
+        Application.objects.using(db)
+        .values("vacancy_id", "status")
+        .annotate(count=models.Count("pk"))
+        .order_by()
+        .values_list("vacancy_id", "status", "count")
+    )
+    VacancyApplicationCount.objects.using(db).bulk_create(
+        VacancyApplicationCount(vacancy_id=vacancy_id, status=status, count=count)
+        for vacancy_id, status, count in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_list_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VacancyApplicationCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reviewed', 'Reviewed'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('vacancy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_counts', to='core.vacancy')),
+            ],
+            options={
+                'verbose_name': 'Vacancy application count',
+                'verbose_name_plural': 'Vacancy application counts',
+                'constraints': [models.UniqueConstraint(fields=('vacancy', 'status'), name='vacancy_status_count_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_vacancy_application_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='outboxevent',
+            name='fanned_out',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='outboxevent',
+            name='published',
+            field=models.BooleanField(default=False),
+        ),
+    ]
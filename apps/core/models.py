@@ -1,4 +1,16 @@
-from django.db import models
+import logging
+from collections import Counter
+
+from django.db import NotSupportedError, connections, models, router, transaction
+
+logger = logging.getLogger(__name__)
+
+APPLICATION_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('reviewed', 'Reviewed'),
+    ('accepted', 'Accepted'),
+    ('rejected', 'Rejected'),
+]
 
 
 class Student(models.Model):
@@ -33,19 +45,132 @@ class Vacancy(models.Model):
         ordering = ["-posted_date"]
         indexes = [
             models.Index(fields=["title"], name="title_idx"),
+            # Keyset pagination: ORDER BY title, id
+            models.Index(fields=["title", "id"], name="title_id_idx"),
         ]
 
 
+class ApplicationQuerySet(models.QuerySet):
+    """
+    Bulk operatsiyalar post_save ni chaqirmaydi, shuning uchun eventlar
+    shu metodlarda bitta tranzaksiyada, bitta bulk INSERT bilan outbox ga
+    yoziladi.
+    """
+
+    def bulk_create_with_events(self, objs, batch_size=None):
+        """
+        Arizalarni bulk_create qiladi va ApplicationCreatedEvent larni yozadi
+
+        Args:
+            objs: Saqlanmagan Application lar
+            batch_size: INSERT batch hajmi
+
+        Returns:
+            Yaratilgan Application lar (pk bilan)
+        """
+        from apps.core.events.publishers import enqueue_applications_created
+
+        with transaction.atomic(using=self.db):
+            created = self.bulk_create(objs, batch_size=batch_size)
+            if any(obj.pk is None for obj in created):
+                raise NotSupportedError("Baza bulk_create da pk qaytarmaydi - eventlarni yozib bo'lmaydi")
+            enqueue_applications_created(created, using=self.db, batch_size=batch_size)
+            VacancyApplicationCount.objects.using(self.db).apply_deltas(
+                Counter((obj.vacancy_id, obj.status) for obj in created)
+            )
+        return created
+
+    def update_status(self, status, batch_size=None):
+        """
+        Querysetdagi arizalar statusini o'zgartiradi va haqiqatda o'zgargan
+        har biri uchun ApplicationStatusChangedEvent yozadi
+
+        Eski statuslar bitta SELECT ... FOR UPDATE bilan olinadi, UPDATE
+        faqat shu qatorlarga qo'llanadi (keyin qo'shilgan qatorlar eventsiz
+        o'zgarib qolmasligi uchun). Vakansiya hisoblagichlari ham shu
+        tranzaksiyada yangilanadi.
+
+        Args:
+            status: Yangi status ("reviewed", "accepted", ...)
+            batch_size: Outbox INSERT batch hajmi
+
+        Returns:
+            O'zgartirilgan qatorlar soni
+        """
+        from apps.core.events.publishers import APPLICATION_STATUS_TO_PROTO, enqueue_application_status_changes
+
+        if status not in APPLICATION_STATUS_TO_PROTO:
+            raise ValueError(f"Noma'lum status: {status}")
+
+        with transaction.atomic(using=self.db):
+            rows = list(
+                self.exclude(status=status).select_for_update().order_by("pk")
+                .values_list("pk", "vacancy_id", "status")
+            )
+            if not rows:
+                return 0
+
+            ids = [pk for pk, _, _ in rows]
+            base = self.model._base_manager.using(self.db)
+            chunk = connections[self.db].ops.bulk_batch_size(["pk"], ids) or len(ids)
+            updated = sum(
+                base.filter(pk__in=ids[i:i + chunk]).update(status=status)
+                for i in range(0, len(ids), chunk)
+            )
+            changes = [(pk, old_status) for pk, _, old_status in rows]
+            enqueue_application_status_changes(changes, status, using=self.db, batch_size=batch_size)
+
+            deltas = Counter()
+            for _, vacancy_id, old_status in rows:
+                deltas[vacancy_id, old_status] -= 1
+                deltas[vacancy_id, status] += 1
+            VacancyApplicationCount.objects.using(self.db).apply_deltas(deltas)
+        return updated
+
+
 class Application(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     vacancy = models.ForeignKey(Vacancy, on_delete=models.CASCADE)
     application_date = models.DateField(auto_now_add=True)
-    status = models.CharField(max_length=20, choices=[
-        ('pending', 'Pending'),
-        ('reviewed', 'Reviewed'),
-        ('accepted', 'Accepted'),
-        ('rejected', 'Rejected'),
-    ], default='pending')
+    status = models.CharField(max_length=20, choices=APPLICATION_STATUS_CHOICES, default='pending')
+
+    objects = ApplicationQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Bazadagi status - o'zgarganini save da qayta SELECT qilmasdan bilish uchun
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or "status" in fields:
+            self._loaded_status = self.__dict__.get("status")
+
+    def save(self, *args, **kwargs):
+        from apps.core.events.publishers import enqueue_application_status_changes
+
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        update_fields = kwargs.get("update_fields")
+        old_status = getattr(self, "_loaded_status", None)
+        status_changed = (
+            old_status is not None
+            and old_status != self.__dict__.get("status", old_status)
+            and (update_fields is None or "status" in update_fields)
+        )
+
+        # post_save dagi outbox yozuvi ariza bilan bitta tranzaksiyada bo'lishi uchun
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            if status_changed:
+                enqueue_application_status_changes([(self.pk, old_status)], self.status, using=using)
+                VacancyApplicationCount.objects.using(using).apply_deltas(
+                    {(self.vacancy_id, old_status): -1, (self.vacancy_id, self.status): 1}
+                )
+
+        if update_fields is None or "status" in update_fields:
+            self._loaded_status = self.__dict__.get("status")
 
     def __str__(self):
         return f"Application of {self.student} for {self.vacancy}"
@@ -56,4 +181,148 @@ class Application(models.Model):
         ordering = ["-application_date"]
         indexes = [
             models.Index(fields=["status"], name="status_idx"),
+            # Keyset pagination: WHERE status = ? ORDER BY id
+            models.Index(fields=["status", "id"], name="status_id_idx"),
         ]
+
+
+class VacancyApplicationCountQuerySet(models.QuerySet):
+    def apply_deltas(self, deltas):
+        """
+        Hisoblagichlarga o'zgarishlarni qo'shadi (bitta upsert so'rovi)
+
+        Chaqiruvchi tranzaksiyasi ichida ishlatiladi: qatorlar kalit
+        tartibida lock qilinadi, shuning uchun parallel tranzaksiyalar
+        deadlock ga tushmaydi.
+
+        Args:
+            deltas: {(vacancy_id, status): o'zgarish}
+        """
+        items = sorted((key, delta) for key, delta in deltas.items() if delta)
+        if not items:
+            return
+
+        connection = connections[self.db]
+        if connection.features.supports_update_conflicts_with_target:
+            qn = connection.ops.quote_name
+            table = qn(self.model._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {table} ({qn('vacancy_id')}, {qn('status')}, {qn('count')}) "
+                    f"VALUES (%s, %s, %s) "
+                    f"ON CONFLICT ({qn('vacancy_id')}, {qn('status')}) "
+                    f"DO UPDATE SET {qn('count')} = {table}.{qn('count')} + EXCLUDED.{qn('count')}",
+                    [(vacancy_id, status, delta) for (vacancy_id, status), delta in items],
+                )
+            return
+
+        for (vacancy_id, status), delta in items:
+            updated = self.filter(vacancy_id=vacancy_id, status=status).update(count=models.F("count") + delta)
+            if not updated:
+                self.create(vacancy_id=vacancy_id, status=status, count=delta)
+
+    def reconcile(self, batch_size=500):
+        """
+        Hisoblagichlarni Application dagi haqiqiy sonlar bilan solishtirib
+        tuzatadi (bulk/raw SQL o'zgarishlar, vakansiya almashtirish va h.k.
+        natijasidagi farqlar uchun)
+
+        Vakansiyalar ``batch_size`` tadan, alohida tranzaksiyalarda
+        tekshiriladi. Avval hisoblagichlar lock qilinadi, keyin sanaladi -
+        shu paytda yozayotgan tranzaksiyalar o'z o'zgarishini lock
+        bo'shagach qo'shadi va natija buzilmaydi.
+
+        Returns:
+            Tuzatilgan hisoblagichlar soni
+        """
+        vacancy_ids = list(Vacancy._base_manager.using(self.db).order_by("pk").values_list("pk", flat=True))
+        fixed = 0
+        for i in range(0, len(vacancy_ids), batch_size):
+            chunk = vacancy_ids[i:i + batch_size]
+            with transaction.atomic(using=self.db):
+                current = {
+                    (counter.vacancy_id, counter.status): counter
+                    for counter in self.filter(vacancy_id__in=chunk).select_for_update().order_by("pk")
+                }
+                actual = Counter({
+                    (vacancy_id, status): count
+                    for vacancy_id, status, count in Application._base_manager.using(self.db)
+                    .filter(vacancy_id__in=chunk)
+                    .values("vacancy_id", "status")
+                    .annotate(count=models.Count("pk"))
+                    .order_by()
+                    .values_list("vacancy_id", "status", "count")
+                })
+
+                to_update = []
+                for key, counter in current.items():
+                    if counter.count != actual[key]:
+                        counter.count = actual[key]
+                        to_update.append(counter)
+                to_create = [
+                    self.model(vacancy_id=vacancy_id, status=status, count=count)
+                    for (vacancy_id, status), count in actual.items()
+                    if (vacancy_id, status) not in current
+                ]
+                self.bulk_update(to_update, ["count"])
+                self.bulk_create(to_create)
+            fixed += len(to_update) + len(to_create)
+
+        if fixed:
+            logger.warning("⚠️ %d ta ariza hisoblagichi tuzatildi", fixed)
+        return fixed
+
+
+class VacancyApplicationCount(models.Model):
+    """
+    Vakansiya bo'yicha har bir statusdagi arizalar soni (denormalizatsiya).
+
+    Application yaratilganda, statusi o'zgarganda va o'chirilganda shu
+    tranzaksiyada yangilanadi, shuning uchun dashboard o'qishi jadval
+    hajmiga bog'liq emas. Farqlar ``reconcile()`` bilan tuzatiladi.
+    """
+    vacancy = models.ForeignKey(Vacancy, on_delete=models.CASCADE, related_name="application_counts")
+    status = models.CharField(max_length=20, choices=APPLICATION_STATUS_CHOICES)
+    # Drift bo'lsa ham yozuv to'xtamasligi uchun manfiy qiymat taqiqlanmagan
+    count = models.IntegerField(default=0)
+
+    objects = VacancyApplicationCountQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.vacancy_id}/{self.status}: {self.count}"
+
+    class Meta:
+        verbose_name = "Vacancy application count"
+        verbose_name_plural = "Vacancy application counts"
+        constraints = [
+            models.UniqueConstraint(fields=["vacancy", "status"], name="vacancy_status_count_uniq"),
+        ]
+
+
+class OutboxEvent(models.Model):
+    """
+    Hali broker ga yuborilmagan domain eventi (transactional outbox).
+
+    Model bilan bir tranzaksiyada yoziladi, relay uni batch qilib broker ga
+    yuboradi va o'chiradi (apps/core/events/outbox.py). Har bir manzilga
+    (EventFeed broker, Celery fan-out) yetkazilgani alohida belgilanadi,
+    shuning uchun qayta urinishda faqat yetmagan manzilga yuboriladi.
+    """
+    # EventEnvelope.event oneof maydoni, masalan "application_created"
+    event_type = models.CharField(max_length=50)
+    payload = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Relay qatorni shu vaqtgacha band qilgan (None - bo'sh)
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    # EventFeed broker (va disk log) ga yuborilgan
+    published = models.BooleanField(default=False)
+    # Celery fan-out ga yuborilgan
+    fanned_out = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"OutboxEvent #{self.pk} ({self.event_type})"
+
+    class Meta:
+        verbose_name = "Outbox event"
+        verbose_name_plural = "Outbox events"
+        ordering = ["id"]
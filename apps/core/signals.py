@@ -1,13 +1,36 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from apps.core.models import Application
-from apps.core.events.publishers import publish_application_created
+from apps.core.cache import get_entity_cache
+from apps.core.models import Application, Student, Vacancy, VacancyApplicationCount
+from apps.core.events.publishers import enqueue_application_created
 
 
 @receiver(post_save, sender=Application)
-def application_created_signal(sender, instance, created, **kwargs):
+def application_created_signal(sender, instance, created, using, **kwargs):
     if not created:
         return
 
-    publish_application_created(instance)
+    enqueue_application_created(instance, using=using)
+    VacancyApplicationCount.objects.using(using).apply_deltas({(instance.vacancy_id, instance.status): 1})
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted_signal(sender, instance, using, origin=None, **kwargs):
+    # Vakansiya o'chirilganda uning hisoblagichlari ham CASCADE bilan o'chadi
+    if getattr(origin, "model", type(origin)) is Vacancy:
+        return
+    VacancyApplicationCount.objects.using(using).apply_deltas({(instance.vacancy_id, instance.status): -1})
+
+
+@receiver([post_save, post_delete], sender=Student)
+@receiver([post_save, post_delete], sender=Vacancy)
+def entity_cache_invalidation_signal(sender, instance, using, **kwargs):
+    cache = get_entity_cache(sender)
+    if cache is None:
+        return
+
+    # Commit dan oldin o'chirilsa, parallel o'quvchi eski qatorni qayta keshga yozib qo'yishi mumkin
+    pk = instance.pk
+    transaction.on_commit(lambda: cache.invalidate(pk), using=using)
@@ -0,0 +1,21 @@
+from celery import shared_task
+
+from apps.core.events.sinks import sinks
+from apps.core.models import VacancyApplicationCount
+
+
+@shared_task(
+    name="core.deliver_events",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def deliver_events(batch: bytes) -> int:
+    """EventBatch (serializatsiya qilingan) dagi eventlarni ro'yxatdagi sinklarga yetkazadi"""
+    return sinks.deliver(batch)
+
+
+@shared_task(name="core.reconcile_application_counts")
+def reconcile_application_counts() -> int:
+    """Vakansiya ariza hisoblagichlarini haqiqiy sonlar bilan tekshiradi (Celery beat)"""
+    return VacancyApplicationCount.objects.reconcile()
@@ -1,3 +1,1813 @@
-from django.test import TestCase
+import datetime
+import gzip
+import io
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import grpc
+from asgiref.sync import async_to_sync, sync_to_async
+from celery.contrib.testing.worker import start_worker
+from google.protobuf.timestamp_pb2 import Timestamp
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, transaction
+from django.db.models import Count, QuerySet
+from django.test import TestCase, override_settings
+
+from apps.core.dtos.platform.v1.data_exchange_pb2 import (
+    WebhookBatch, WebhookData, WebhookItemResult, WebhookResponse
+)
+from apps.core.dtos.platform.v1.data_exchange_pb2_grpc import DataExchangeStub
+from apps.core.dtos.platform.v1.events_pb2 import (
+    ApplicationCreatedEvent, ApplicationStatusChangedEvent, BaseEvent, EventBatch, EventEnvelope, EventType,
+    SubscribeAck, SubscribeRequest, SubscribeStart
+)
+from apps.core.cache import get_entity_cache, reset_entity_caches
+from apps.core.dtos.platform.v1 import entities_pb2
+from apps.core.dtos.platform.v1.entities_pb2 import ApplicationStatus
+from apps.core.dtos.platform.v1.events_pb2_grpc import EventFeedStub
+from apps.core.events.broker import EventBroker, encode_envelope
+from apps.core.events.fanout import CeleryFanout
+from apps.core.events.feed import EventFeedService, add_event_feed_service
+from apps.core.events.log import EventLog, EventLogLocked
+from apps.core.events.outbox import OutboxRelay
+from apps.core.events.publishers import publish_application_created
+from apps.core.events.sinks import SinkRegistry, sinks
+from apps.core.importer import BulkImporter, import_messages
+from apps.core.mappers import application_mapper, student_mapper
+from apps.core.models import Application, OutboxEvent, Student, Vacancy, VacancyApplicationCount
+from apps.core.tasks import deliver_events
+from config import celery_app
+from protobuf_admission import DEFAULT_RETRY_AFTER, AdmissionController
+from protobuf_cache import MessageCache
+from protobuf_decoder import (
+    DelimitedStreamError,
+    LazyWebhookData,
+    ProtobufDecoder,
+    encode_delimited,
+    encode_varint,
+    iter_delimited_messages,
+)
+from protobuf_dedup import ClaimResult, EventDeduplicator, LRUTTLCache, SQLiteDedupStore, get_deduplicator
+from protobuf_grpc import SERVICE_NAME, create_server
+from protobuf_handlers import HandlerRegistry, registry
+from protobuf_logging import EventLogger, EventLogSampler
+from protobuf_mapper import ModelMapper
+from protobuf_metrics import MetricsRegistry, get_metrics, mark_process_dead
+from protobuf_offload import ProcessOffloader, WebhookSummary
+from protobuf_pagination import encode_cursor
+from protobuf_response import ItemResult, ResponseEncoder
+from protobuf_scanner import WireFormatError, count_field, scan_webhook_header
+
+
+def make_webhook_data(event_type="user_created", event_id="evt_1", items=1):
+    """Testlar uchun WebhookData yaratadi"""
+    webhook_data = WebhookData(event_type=event_type, event_id=event_id)
+    webhook_data.timestamp.GetCurrentTime()
+    if event_type == "user_created":
+        webhook_data.user_data.id = 1
+        webhook_data.user_data.name = "Alisher Navoi"
+        webhook_data.user_data.email = "alisher@example.uz"
+    elif event_type == "product_updated":
+        webhook_data.product_data.id = 2
+        webhook_data.product_data.name = "Kitob"
+        webhook_data.product_data.price = 25.0
+    elif event_type == "order_placed":
+        webhook_data.order_data.id = 3
+        webhook_data.order_data.user_id = 1
+        for i in range(items):
+            item = webhook_data.order_data.items.add()
+            item.product_id = i
+            item.product_name = f"Product_{i}"
+            item.quantity = 1
+            item.unit_price = 10.0
+            item.total_price = 10.0
+        webhook_data.order_data.total_amount = 10.0 * items
+    return webhook_data
+
+
+@override_settings(
+    WEBHOOK_DEDUP={"ENABLED": True, "SHARED_PATH": None},
+    WEBHOOK_METRICS={"MULTIPROCESS_DIR": None},
+    EVENT_LOG={"DIRECTORY": None},
+)
+class WebhookTestCase(TestCase):
+    """Har bir test toza dedup holati bilan boshlanadi"""
+
+    def setUp(self):
+        get_deduplicator().clear()
+        # Kesh test tranzaksiyasi rollback qilinganda tozalanmaydi
+        cache.clear()
+        reset_entity_caches()
+
+
+class WebhookBatchTests(WebhookTestCase):
+    def test_batch_endpoint_reports_each_item(self):
+        batch = WebhookBatch(items=[
+            make_webhook_data("user_created", "evt_1"),
+            make_webhook_data("product_updated", "evt_2"),
+            make_webhook_data("order_placed", "evt_3", items=3),
+        ])
+
+        response = self.client.post(
+            "/webhook/protobuf/batch/",
+            data=batch.SerializeToString(),
+            content_type="application/x-protobuf",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        webhook_response = WebhookResponse.FromString(response.content)
+        self.assertTrue(webhook_response.success)
+        self.assertEqual(
+            [(r.index, r.event_id, r.success) for r in webhook_response.results],
+            [(0, "evt_1", True), (1, "evt_2", True), (2, "evt_3", True)],
+        )
+
+    def test_batch_failure_is_reported_per_item(self):
+        batch = WebhookBatch(items=[
+            make_webhook_data("user_created", "evt_1"),
+            make_webhook_data("product_updated", "evt_2"),
+        ])
+
+        def fail(webhook_data, product):
+            raise ValueError("boom")
+
+        registry.register(fail, data_case="product_data")
+        self.addCleanup(registry.unregister, fail)
+
+        response = self.client.post(
+            "/webhook/protobuf/batch/",
+            data=batch.SerializeToString(),
+            content_type="application/x-protobuf",
+        )
+
+        webhook_response = WebhookResponse.FromString(response.content)
+        self.assertFalse(webhook_response.success)
+        self.assertTrue(webhook_response.results[0].success)
+        self.assertFalse(webhook_response.results[1].success)
+        self.assertEqual(webhook_response.results[1].message, "boom")
+
+    def test_batch_endpoint_rejects_garbage(self):
+        response = self.client.post(
+            "/webhook/protobuf/batch/",
+            data=b"\xff\xff\xff",
+            content_type="application/x-protobuf",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class WebhookStreamTests(WebhookTestCase):
+    def make_stream(self, count):
+        return b"".join(
+            encode_delimited(make_webhook_data("order_placed", f"evt_{i}", items=2).SerializeToString())
+            for i in range(count)
+        )
+
+    def test_iter_delimited_messages_across_small_chunks(self):
+        messages = [make_webhook_data("user_created", f"evt_{i}").SerializeToString() for i in range(5)]
+        stream = io.BytesIO(b"".join(encode_delimited(m) for m in messages))
+
+        self.assertEqual(list(iter_delimited_messages(stream, chunk_size=3)), messages)
+
+    def test_iter_delimited_messages_reads_rest_of_large_message_at_once(self):
+        message = b"\x01" * 10_000
+        stream = io.BytesIO(encode_delimited(message))
+
+        with mock.patch.object(stream, "read", wraps=stream.read) as read:
+            self.assertEqual(list(iter_delimited_messages(stream, chunk_size=100)), [message])
+        # Birinchi bo'lak, message ning qolgani, EOF
+        self.assertEqual([call.args[0] for call in read.call_args_list], [100, 10_000 + 2 - 100, 100])
+
+    def test_iter_delimited_messages_rejects_truncated_stream(self):
+        data = encode_delimited(make_webhook_data().SerializeToString())
+
+        with self.assertRaises(DelimitedStreamError):
+            list(iter_delimited_messages(io.BytesIO(data[:-1])))
+
+    def test_iter_delimited_messages_rejects_oversized_message(self):
+        stream = io.BytesIO(encode_varint(1024) + b"\x00" * 1024)
+
+        with self.assertRaises(DelimitedStreamError):
+            list(iter_delimited_messages(stream, max_message_size=100))
+
+    def test_stream_endpoint_processes_every_event(self):
+        response = self.client.post(
+            "/webhook/protobuf/stream/",
+            data=self.make_stream(50),
+            content_type="application/x-protobuf",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        webhook_response = WebhookResponse.FromString(response.content)
+        self.assertTrue(webhook_response.success)
+        self.assertIn("50 ta event", webhook_response.message)
+        self.assertEqual(len(webhook_response.results), 0)
+
+    def test_stream_endpoint_reports_broken_framing(self):
+        response = self.client.post(
+            "/webhook/protobuf/stream/",
+            data=self.make_stream(3)[:-5],
+            content_type="application/x-protobuf",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        webhook_response = WebhookResponse.FromString(response.content)
+        self.assertFalse(webhook_response.success)
+        self.assertIn("2 ta event", webhook_response.message)
+
+
+class LazyWebhookDataTests(WebhookTestCase):
+    def test_views_do_not_build_dicts(self):
+        binary_data = make_webhook_data("order_placed", items=5).SerializeToString()
+
+        with mock.patch("protobuf_decoder.MessageToDict") as message_to_dict:
+            class_response = self.client.post(
+                "/webhook/protobuf/", data=binary_data, content_type="application/x-protobuf"
+            )
+            function_response = self.client.post(
+                "/api/protobuf-receiver/", data=binary_data, content_type="application/x-protobuf"
+            )
+
+        self.assertEqual(class_response.status_code, 200)
+        self.assertEqual(function_response.json()["event_type"], "order_placed")
+        message_to_dict.assert_not_called()
+
+    def test_lazy_view_materializes_once_on_demand(self):
+        view = ProtobufDecoder().process_webhook_data(
+            make_webhook_data("user_created", "evt_9").SerializeToString(), lazy=True
+        )
+
+        self.assertEqual(view.data_case, "user_data")
+        self.assertEqual(view.get("eventId"), "evt_9")
+        self.assertIs(view.to_dict(), view.to_dict())
+        self.assertEqual(view.get("userData")["name"], "Alisher Navoi")
+        self.assertEqual(json.loads(view.to_json())["eventType"], "user_created")
+
+    def test_dict_mode_is_unchanged(self):
+        decoder = ProtobufDecoder()
+        webhook_data = make_webhook_data("product_updated")
+
+        self.assertEqual(
+            decoder.process_webhook_data(webhook_data.SerializeToString()),
+            decoder.protobuf_to_dict(webhook_data),
+        )
+        self.assertEqual(decoder.process_webhook_data(b"\xff\xff"), {"error": "Decode failed"})
+
+
+class WireScannerTests(WebhookTestCase):
+    def test_header_matches_full_parse(self):
+        for event_type, data_case in [
+            ("user_created", "user_data"),
+            ("product_updated", "product_data"),
+            ("order_placed", "order_data"),
+        ]:
+            webhook_data = make_webhook_data(event_type, "evt_42", items=100)
+            binary_data = webhook_data.SerializeToString()
+
+            header = scan_webhook_header(binary_data)
+
+            self.assertEqual(header.event_type, event_type)
+            self.assertEqual(header.event_id, "evt_42")
+            self.assertEqual(header.timestamp_seconds, webhook_data.timestamp.seconds)
+            self.assertEqual(header.timestamp_nanos, webhook_data.timestamp.nanos)
+            self.assertEqual(header.data_case, webhook_data.WhichOneof("data"))
+            self.assertEqual(header.data_case, data_case)
+            payload = getattr(webhook_data, data_case).SerializeToString()
+            self.assertEqual(
+                binary_data[header.data_offset:header.data_offset + header.data_size], payload
+            )
+
+    def test_last_oneof_field_wins(self):
+        binary_data = (
+            make_webhook_data("user_created").SerializeToString()
+            + WebhookData(product_data={"id": 5}).SerializeToString()
+        )
+
+        header = scan_webhook_header(binary_data)
+
+        self.assertEqual(header.data_case, WebhookData.FromString(binary_data).WhichOneof("data"))
+        self.assertEqual(header.data_case, "product_data")
+
+    def test_empty_message_and_malformed_input(self):
+        self.assertIsNone(scan_webhook_header(b"").data_case)
+        with self.assertRaises(WireFormatError):
+            scan_webhook_header(make_webhook_data().SerializeToString()[:-3])
+        with self.assertRaises(WireFormatError):
+            scan_webhook_header(b"\x0a\x02\xff\xfe")
+
+    def test_views_reject_malformed_without_full_parse(self):
+        with mock.patch.object(ProtobufDecoder, "decode_webhook_data") as decode:
+            response = self.client.post(
+                "/webhook/protobuf/", data=b"\x0a\x10abc", content_type="application/x-protobuf"
+            )
+
+        self.assertEqual(response.status_code, 400)
+        decode.assert_not_called()
+
+    def test_should_decode_can_skip_events(self):
+        binary_data = make_webhook_data("order_placed").SerializeToString()
+
+        with mock.patch.object(ProtobufDecoder, "should_decode", return_value=False), \
+                mock.patch.object(ProtobufDecoder, "decode_webhook_data") as decode:
+            response = self.client.post(
+                "/api/protobuf-receiver/", data=binary_data, content_type="application/x-protobuf"
+            )
+
+        self.assertEqual(response.json()["event_type"], "order_placed")
+        decode.assert_not_called()
+
+
+class HandlerRegistryTests(WebhookTestCase):
+    def test_dispatch_by_event_type_and_data_case(self):
+        local_registry = HandlerRegistry()
+        calls = []
+        local_registry.register(lambda w, p: calls.append(("any", None)))
+        local_registry.register(lambda w, p: calls.append(("order", p.id)), data_case="order_data")
+        local_registry.register(
+            lambda w, p: calls.append(("placed", w.event_id)),
+            event_type="order_placed", data_case="order_data",
+        )
+        local_registry.register(lambda w, p: calls.append(("user", p.id)), data_case="user_data")
+
+        ProtobufDecoder(registry=local_registry).handle_webhook_data(
+            make_webhook_data("order_placed", "evt_7")
+        )
+
+        self.assertEqual(calls, [("placed", "evt_7"), ("order", 3), ("any", None)])
+
+    def test_async_handlers_and_timing(self):
+        local_registry = HandlerRegistry()
+        seen = []
+
+        @local_registry.register(data_case="user_data")
+        async def remember(webhook_data, user):
+            seen.append(user.name)
+
+        local_registry.dispatch(make_webhook_data("user_created"))
+        async_to_sync(local_registry.dispatch_async)(make_webhook_data("user_created"))
+
+        self.assertEqual(seen, ["Alisher Navoi", "Alisher Navoi"])
+        stats = local_registry.stats()[f"{remember.__module__}.{remember.__qualname__}"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["errors"], 0)
+        self.assertGreater(stats["total_seconds"], 0)
+
+    def test_registering_invalidates_route_cache(self):
+        local_registry = HandlerRegistry()
+        webhook_data = make_webhook_data("product_updated")
+        self.assertEqual(local_registry.dispatch(webhook_data), 0)
+
+        local_registry.register(lambda w, p: None, event_type="product_updated")
+
+        self.assertEqual(local_registry.dispatch(webhook_data), 1)
+
+
+class EventDedupTests(WebhookTestCase):
+    def post(self, webhook_data, url="/webhook/protobuf/"):
+        return self.client.post(
+            url, data=webhook_data.SerializeToString(), content_type="application/x-protobuf"
+        )
+
+    def test_replayed_event_is_not_decoded_again(self):
+        webhook_data = make_webhook_data("order_placed", "evt_dup")
+        self.post(webhook_data)
+
+        with mock.patch.object(ProtobufDecoder, "decode_webhook_data") as decode:
+            response = self.post(webhook_data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(WebhookResponse.FromString(response.content).message, "O'tkazib yuborildi")
+        decode.assert_not_called()
+        self.assertEqual(get_deduplicator().stats()["hits"], 1)
+        self.assertEqual(get_deduplicator().stats()["misses"], 1)
+
+    def test_failed_event_is_released_for_retry(self):
+        webhook_data = make_webhook_data("user_created", "evt_retry")
+
+        def fail(webhook_data, user):
+            raise ValueError("boom")
+
+        registry.register(fail, data_case="user_data")
+        try:
+            self.assertEqual(self.post(webhook_data).status_code, 500)
+        finally:
+            registry.unregister(fail)
+
+        self.assertEqual(self.post(webhook_data).status_code, 200)
+        self.assertEqual(get_deduplicator().stats()["misses"], 2)
+
+    def test_batch_and_stream_skip_duplicates(self):
+        batch = WebhookBatch(items=[make_webhook_data(event_id="evt_a"), make_webhook_data(event_id="evt_a")])
+        response = WebhookResponse.FromString(self.client.post(
+            "/webhook/protobuf/batch/", data=batch.SerializeToString(), content_type="application/x-protobuf"
+        ).content)
+        self.assertEqual([r.message for r in response.results], ["", "Takroriy event"])
+
+        stream = encode_delimited(make_webhook_data(event_id="evt_a").SerializeToString())
+        response = WebhookResponse.FromString(self.client.post(
+            "/webhook/protobuf/stream/", data=stream, content_type="application/x-protobuf"
+        ).content)
+        self.assertIn("1 ta takroriy", response.message)
+
+    def test_lru_evicts_oldest_and_expires(self):
+        cache = LRUTTLCache(max_size=2, ttl_seconds=60)
+        cache.add("a")
+        cache.add("b")
+        cache.contains("a")
+        cache.add("c")
+
+        self.assertTrue(cache.contains("a"))
+        self.assertFalse(cache.contains("b"))
+
+        expired = LRUTTLCache(ttl_seconds=-1)
+        expired.add("a")
+        self.assertFalse(expired.contains("a"))
+
+    def test_shared_store_dedups_across_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dedup.sqlite3")
+            # Ikki alohida jarayonni ikki mustaqil deduplicator bilan taqlid qilamiz
+            first = EventDeduplicator(LRUTTLCache(), SQLiteDedupStore(path))
+            second = EventDeduplicator(LRUTTLCache(), SQLiteDedupStore(path))
+
+            self.assertIs(first.claim("evt_x"), ClaimResult.CLAIMED)
+            # Ishlanayotgan event takroriy deb keshlanmaydi - qayta yuborish kerak
+            self.assertIs(second.claim("evt_x"), ClaimResult.BUSY)
+            self.assertIs(second.claim("evt_x"), ClaimResult.BUSY)
+            self.assertEqual(second.stats()["busy"], 2)
+
+            # Egasi xato bilan bo'shatsa, qayta yuborilgan event boshqa jarayonda ishlanadi
+            first.release("evt_x")
+            self.assertIs(second.claim("evt_x"), ClaimResult.CLAIMED)
+            second.complete("evt_x")
+
+            self.assertIs(first.claim("evt_x"), ClaimResult.DUPLICATE)
+            self.assertTrue(first.cache.contains("evt_x"))
+            self.assertEqual(first.stats()["hits"], 1)
+
+    def test_stale_processing_claim_expires(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dedup.sqlite3")
+            crashed = EventDeduplicator(LRUTTLCache(), SQLiteDedupStore(path, processing_timeout=-1))
+            self.assertIs(crashed.claim("evt_y"), ClaimResult.CLAIMED)
+
+            # Egasi complete/release qilmasdan o'lgan - muddat o'tgach event qayta band qilinadi
+            other = EventDeduplicator(LRUTTLCache(), SQLiteDedupStore(path))
+            self.assertIs(other.claim("evt_y"), ClaimResult.CLAIMED)
+
+    def test_busy_event_returns_retryable_conflict(self):
+        webhook_data = make_webhook_data("order_placed", "evt_busy")
+        self.assertIs(get_deduplicator().claim("evt_busy"), ClaimResult.CLAIMED)
+
+        response = self.post(webhook_data)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(WebhookResponse.FromString(response.content).success)
+
+        batch = WebhookBatch(items=[webhook_data])
+        response = WebhookResponse.FromString(self.client.post(
+            "/webhook/protobuf/batch/", data=batch.SerializeToString(), content_type="application/x-protobuf"
+        ).content)
+        self.assertFalse(response.results[0].success)
+
+        get_deduplicator().complete("evt_busy")
+        response = self.post(webhook_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(WebhookResponse.FromString(response.content).message, "O'tkazib yuborildi")
+
+
+class AsyncWebhookViewTests(WebhookTestCase):
+    async def post(self, webhook_data, url="/webhook/protobuf/async/"):
+        return await self.async_client.post(
+            url, data=webhook_data.SerializeToString(), content_type="application/x-protobuf"
+        )
+
+    async def test_async_handlers_are_awaited(self):
+        seen = []
+
+        async def remember(webhook_data, order):
+            seen.append(len(order.items))
+
+        registry.register(remember, data_case="order_data")
+        self.addCleanup(registry.unregister, remember)
+
+        response = await self.post(make_webhook_data("order_placed", "evt_async", items=3))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(WebhookResponse.FromString(response.content).success)
+
+        response = await self.post(
+            make_webhook_data("order_placed", "evt_async_fn", items=2), url="/api/protobuf-receiver/async/"
+        )
+        self.assertEqual(json.loads(response.content)["event_type"], "order_placed")
+        self.assertEqual(seen, [3, 2])
+
+    async def test_large_payload_is_decoded_off_the_event_loop(self):
+        with mock.patch("protobuf_decoder.ASYNC_INLINE_DECODE_MAX_SIZE", 0), \
+                mock.patch("protobuf_decoder.sync_to_async", wraps=sync_to_async) as offload:
+            response = await self.post(make_webhook_data("order_placed", "evt_big", items=100))
+
+        self.assertEqual(response.status_code, 200)
+        offload.assert_called_once_with(mock.ANY, thread_sensitive=False)
+
+    async def test_duplicates_and_malformed_input(self):
+        webhook_data = make_webhook_data(event_id="evt_async_dup")
+        await self.post(webhook_data)
+        response = await self.post(webhook_data)
+        self.assertEqual(WebhookResponse.FromString(response.content).message, "O'tkazib yuborildi")
+
+        response = await self.async_client.post(
+            "/webhook/protobuf/async/", data=b"\xff\xff", content_type="application/x-protobuf"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ProcessOffloadTests(WebhookTestCase):
+    def test_should_offload_by_size_and_item_count(self):
+        offloader = ProcessOffloader(size_threshold=10_000, item_threshold=20)
+        self.assertFalse(offloader.should_offload(make_webhook_data("order_placed", items=19).SerializeToString()))
+        self.assertTrue(offloader.should_offload(make_webhook_data("order_placed", items=20).SerializeToString()))
+        self.assertTrue(offloader.should_offload(make_webhook_data("order_placed", items=500).SerializeToString()))
+        self.assertFalse(offloader.should_offload(make_webhook_data("user_created").SerializeToString()))
+        self.assertFalse(offloader.should_offload(b"\xff\xff"))
+
+    def test_count_field_stops_at_limit(self):
+        binary_data = make_webhook_data("order_placed", items=50).SerializeToString()
+        header = scan_webhook_header(binary_data)
+        end = header.data_offset + header.data_size
+
+        self.assertEqual(count_field(binary_data, header.data_offset, end, 3), 50)
+        self.assertEqual(count_field(binary_data, header.data_offset, end, 3, limit=10), 10)
+
+    def test_heavy_events_are_processed_in_worker_process(self):
+        offloader = ProcessOffloader(max_workers=1, item_threshold=5)
+        self.addCleanup(offloader.shutdown)
+        decoder = ProtobufDecoder(offloader=offloader)
+        binary_data = make_webhook_data("order_placed", "evt_heavy", items=10).SerializeToString()
+
+        view = decoder.process_webhook_data(binary_data, lazy=True)
+        self.assertIsInstance(view, LazyWebhookData)
+        self.assertEqual(view.summary, WebhookSummary("order_placed", "evt_heavy", "order_data"))
+        self.assertEqual(view.get("eventType"), "order_placed")
+        # Inline natija bilan bir xil interfeys: message/dict/JSON shu jarayonda parse qilinadi
+        self.assertEqual(len(view.message.order_data.items), 10)
+        self.assertEqual(len(view.to_dict()["orderData"]["items"]), 10)
+        self.assertIn('"evt_heavy"', view.to_json())
+
+        full = decoder.process_webhook_data(binary_data)
+        self.assertEqual(len(full["orderData"]["items"]), 10)
+
+        view = async_to_sync(decoder.process_webhook_data_async)(binary_data)
+        self.assertEqual((view.event_id, view.data_case), ("evt_heavy", "order_data"))
+        self.assertEqual(len(view.get("orderData")["items"]), 10)
+
+    def test_broken_pool_falls_back_to_inline(self):
+        offloader = ProcessOffloader(item_threshold=1)
+        decoder = ProtobufDecoder(offloader=offloader)
+
+        with mock.patch.object(offloader, "submit", side_effect=BrokenProcessPool("boom")), \
+                mock.patch.object(offloader, "shutdown") as shutdown:
+            view = decoder.process_webhook_data(make_webhook_data("order_placed").SerializeToString(), lazy=True)
+
+        self.assertEqual(view.data_case, "order_data")
+        shutdown.assert_called_once_with(wait=False)
+
+
+class AdmissionControlTests(WebhookTestCase):
+    def post(self, source, event_id, url="/webhook/protobuf/"):
+        return self.client.post(
+            url,
+            data=make_webhook_data(event_id=event_id).SerializeToString(),
+            content_type="application/x-protobuf",
+            headers={"X-Event-Source": source},
+        )
+
+    @override_settings(WEBHOOK_ADMISSION={"ENABLED": True, "SOURCE_RATE": 0.01, "SOURCE_BURST": 2})
+    def test_source_over_its_bucket_gets_429(self):
+        self.assertEqual(self.post("bursty", "evt_1").status_code, 200)
+        self.assertEqual(self.post("bursty", "evt_2", url="/api/protobuf-receiver/").status_code, 200)
+
+        with mock.patch("django.http.request.HttpRequest.body", new_callable=mock.PropertyMock) as body:
+            response = self.post("bursty", "evt_3")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        # Rad etilgan so'rov body si o'qilmaydi, lekin metrikada ko'rinadi
+        body.assert_not_called()
+        self.assertIn('webhook_admission_rejected_total{source="bursty"} 1', get_metrics().render())
+
+        # Boshqa manbaga ta'sir qilmaydi, GET cheklanmaydi
+        self.assertEqual(self.post("quiet", "evt_4").status_code, 200)
+        self.assertEqual(self.client.get("/webhook/protobuf/").status_code, 200)
+
+    @override_settings(WEBHOOK_ADMISSION={"ENABLED": True, "SOURCE_RATE": 0.01, "SOURCE_BURST": 1})
+    async def test_async_views_share_the_limits(self):
+        response = await self.async_client.post(
+            "/webhook/protobuf/async/",
+            data=make_webhook_data(event_id="evt_a1").SerializeToString(),
+            content_type="application/x-protobuf",
+            headers={"X-Event-Source": "noisy"},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = await self.async_client.post(
+            "/api/protobuf-receiver/async/",
+            data=make_webhook_data(event_id="evt_a2").SerializeToString(),
+            content_type="application/x-protobuf",
+            headers={"X-Event-Source": "noisy"},
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_full_queue_and_queue_timeout_reject(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.01)
+        self.assertIsNone(controller.acquire("a"))
+
+        self.assertIsNotNone(controller.acquire("b"))
+        self.assertEqual(controller.stats(), {"in_flight": 1, "queued": 0, "rejected": 1})
+
+        controller.max_queue = 0
+        self.assertEqual(controller.acquire("b"), DEFAULT_RETRY_AFTER)
+
+        controller.release()
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_waiting_sources_are_admitted_round_robin(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=10, queue_timeout=5)
+        self.assertIsNone(controller.acquire("holder"))
+        admitted = []
+
+        def request(source):
+            self.assertIsNone(controller.acquire(source))
+            admitted.append(source)
+
+        threads = []
+        for source in ["a", "a", "a", "b"]:
+            thread = threading.Thread(target=request, args=(source,))
+            thread.start()
+            threads.append(thread)
+            while controller.queued < len(threads):
+                time.sleep(0.001)
+
+        for expected in range(1, 5):
+            controller.release()
+            while len(admitted) < expected:
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(admitted, ["a", "b", "a", "a"])
+        controller.release()
+        self.assertEqual(controller.stats()["in_flight"], 0)
+
+
+class MetricsTests(WebhookTestCase):
+    def test_views_record_stages_events_and_errors(self):
+        self.client.post(
+            "/webhook/protobuf/",
+            data=make_webhook_data("order_placed", "evt_m1").SerializeToString(),
+            content_type="application/x-protobuf",
+        )
+        self.client.post("/api/protobuf-receiver/", data=b"\xff\xff", content_type="application/x-protobuf")
+
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        self.assertIn('webhook_requests_total{view="webhook",status="200"} 1', text)
+        self.assertIn('webhook_requests_total{view="receiver",status="400"} 1', text)
+        self.assertIn('webhook_events_total{event_type="order_placed",data_case="order_data"} 1', text)
+        self.assertIn('webhook_decode_errors_total{kind="wire_format"} 1', text)
+        for stage, count in (("read_body", 2), ("scan", 1), ("parse", 1), ("handlers", 1), ("response", 1)):
+            self.assertIn(f'webhook_stage_seconds_count{{stage="{stage}"}} {count}', text)
+        self.assertIn('webhook_payload_bytes_bucket{view="webhook",le="256"} 1', text)
+
+    def test_render_merges_worker_process_snapshots(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for pid, latency in ((101, 0.002), (102, 0.2)):
+                worker = MetricsRegistry(multiprocess_dir=tmp)
+                worker.inc("webhook_events_total", "user_created", "user_data")
+                worker.observe("webhook_stage_seconds", latency, "parse")
+                with mock.patch("protobuf_metrics.os.getpid", return_value=pid):
+                    worker.flush()
+
+            text = MetricsRegistry(multiprocess_dir=tmp).render()
+
+        self.assertIn('webhook_events_total{event_type="user_created",data_case="user_data"} 2', text)
+        self.assertIn('webhook_stage_seconds_bucket{stage="parse",le="0.0025"} 1', text)
+        self.assertIn('webhook_stage_seconds_bucket{stage="parse",le="+Inf"} 2', text)
+        self.assertIn('webhook_stage_seconds_count{stage="parse"} 2', text)
+        self.assertIn('webhook_stage_seconds_sum{stage="parse"} 0.202', text)
+
+    def test_exited_processes_are_archived_and_pids_can_be_reused(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            registries = []
+            for value in (3, 2):
+                # Ikkinchi jarayon birinchisining PID ini qayta ishlatadi
+                worker = MetricsRegistry(multiprocess_dir=tmp)
+                worker.inc("webhook_decode_errors_total", "parse", value=value)
+                with mock.patch("protobuf_metrics.os.getpid", return_value=4242):
+                    worker.flush()
+                registries.append(worker)
+            self.assertEqual(len(list(Path(tmp).glob("metrics_4242_*.json"))), 2)
+
+            # atexit: oxirgi (hali flush qilinmagan) qiymatlar ham arxivga tushadi
+            exiting = MetricsRegistry(multiprocess_dir=tmp)
+            exiting.inc("webhook_decode_errors_total", "parse", value=5)
+            exiting.close()
+            exiting.flush()
+            self.assertEqual(mark_process_dead(4242, tmp), 2)
+
+            self.assertEqual([path.name for path in Path(tmp).glob("*.json")], ["archive.json"])
+            text = MetricsRegistry(multiprocess_dir=tmp).render()
+        self.assertIn('webhook_decode_errors_total{kind="parse"} 10', text)
+
+    def test_label_cardinality_is_bounded(self):
+        metrics = MetricsRegistry()
+        with mock.patch("protobuf_metrics.MAX_LABEL_SETS", 2):
+            for i in range(5):
+                metrics.inc("webhook_events_total", f"type_{i}", "user_data")
+
+        text = metrics.render()
+        self.assertIn('webhook_events_total{event_type="other",data_case="other"} 3', text)
+        self.assertNotIn("type_2", text)
+
+
+class GrpcServiceTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server = create_server(max_workers=2)
+        port = self.server.add_insecure_port("localhost:0")
+        self.server.start()
+        self.addCleanup(self.server.stop, None)
+        self.channel = grpc.insecure_channel(f"localhost:{port}")
+        self.addCleanup(self.channel.close)
+        self.stub = DataExchangeStub(self.channel)
+
+    def test_send_webhook_runs_handlers_and_dedups(self):
+        seen = []
+
+        def remember(webhook_data, user):
+            seen.append(user.id)
+
+        registry.register(remember, data_case="user_data")
+        self.addCleanup(registry.unregister, remember)
+
+        response = self.stub.SendWebhook(make_webhook_data(event_id="evt_g1"))
+        self.assertTrue(response.success)
+        self.assertEqual(response.message, "Muvaffaqiyatli qabul qilindi")
+
+        response = self.stub.SendWebhook(make_webhook_data(event_id="evt_g1"))
+        self.assertEqual(response.message, "O'tkazib yuborildi")
+        self.assertEqual(seen, [1])
+
+    def test_send_webhook_rejects_malformed_bytes(self):
+        send_raw = self.channel.unary_unary(f"/{SERVICE_NAME}/SendWebhook")
+        with self.assertRaises(grpc.RpcError) as error:
+            send_raw(b"\xff\xff")
+        self.assertEqual(error.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_stream_webhooks_reports_summary(self):
+        webhooks = [make_webhook_data(event_id=f"evt_s{i}") for i in range(3)]
+        webhooks.append(make_webhook_data(event_id="evt_s0"))
+
+        response = self.stub.StreamWebhooks(iter(webhooks))
+
+        self.assertTrue(response.success)
+        self.assertIn("4", response.message)
+        self.assertIn("1 ta takroriy", response.message)
+        self.assertEqual(len(response.results), 0)
+        self.assertIn('webhook_requests_total{view="grpc_StreamWebhooks",status="OK"}', get_metrics().render())
+
+    def test_stream_webhooks_records_failed_items(self):
+        stream_raw = self.channel.stream_unary(f"/{SERVICE_NAME}/StreamWebhooks")
+        response = WebhookResponse.FromString(stream_raw(iter([
+            make_webhook_data(event_id="evt_f0").SerializeToString(),
+            b"\xff\xff",
+        ])))
+
+        self.assertFalse(response.success)
+        self.assertEqual([result.index for result in response.results], [1])
+        self.assertIn('webhook_requests_total{view="grpc_StreamWebhooks",status="INTERNAL"} 1', get_metrics().render())
+
+
+class EventFeedTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.broker = EventBroker(retention=100)
+        self.server = grpc.server(ThreadPoolExecutor(max_workers=2))
+        add_event_feed_service(EventFeedService(self.broker, max_in_flight=3, max_batch_size=2), self.server)
+        port = self.server.add_insecure_port("localhost:0")
+        self.server.start()
+        self.addCleanup(self.server.stop, None)
+        self.channel = grpc.insecure_channel(f"localhost:{port}")
+        self.addCleanup(self.channel.close)
+        self.stub = EventFeedStub(self.channel)
+
+    def publish(self, count):
+        for i in range(count):
+            self.broker.publish(ApplicationCreatedEvent(application_id=i + 1))
+
+    def subscribe(self, start):
+        requests = queue.Queue()
+        requests.put(SubscribeRequest(start=start))
+        responses = self.stub.Subscribe(iter(requests.get, None))
+        self.addCleanup(requests.put, None)
+        return requests, responses
+
+    def offsets(self, batch):
+        return [envelope.offset for envelope in batch.events]
+
+    def test_broker_assigns_offsets_and_trims_retention(self):
+        broker = EventBroker(retention=4)
+        offsets = [broker.publish(ApplicationCreatedEvent(application_id=i)) for i in range(10)]
+        self.assertEqual(offsets, list(range(1, 11)))
+        self.assertGreater(broker.first_offset, 1)
+
+        events = broker.read(1, 2)
+        self.assertEqual(events[0][0], broker.first_offset)
+        envelope = EventEnvelope.FromString(events[0][1])
+        self.assertEqual(envelope.offset, broker.first_offset)
+        self.assertEqual(envelope.application_created.application_id, broker.first_offset - 1)
+
+        with self.assertRaises(ValueError):
+            broker.publish(BaseEvent(event_id="x"))
+
+    def test_credits_window_and_acks(self):
+        self.publish(5)
+        requests, responses = self.subscribe(SubscribeStart(subscriber_id="s1", credits=4))
+
+        self.assertEqual(self.offsets(next(responses)), [1, 2])
+        # Kredit 4 ta bo'lsa ham, oyna (max_in_flight=3) uchinchisida to'xtatadi
+        self.assertEqual(self.offsets(next(responses)), [3])
+
+        requests.put(SubscribeRequest(ack=SubscribeAck(offset=2)))
+        self.assertEqual(self.offsets(next(responses)), [4])
+        requests.put(SubscribeRequest(ack=SubscribeAck(offset=4, credits=1)))
+        self.assertEqual(self.offsets(next(responses)), [5])
+
+        # Yangi event kelishi bilan yuboriladi
+        requests.put(SubscribeRequest(ack=SubscribeAck(offset=5, credits=1)))
+        self.publish(1)
+        self.assertEqual(self.offsets(next(responses)), [6])
+        requests.put(SubscribeRequest(ack=SubscribeAck(offset=6)))
+        requests.put(None)
+        self.assertEqual(list(responses), [])
+        self.assertEqual(self.broker.committed("s1"), 6)
+
+    def test_resumes_from_committed_offset(self):
+        self.publish(3)
+        self.broker.commit("s2", 2)
+        requests, responses = self.subscribe(SubscribeStart(subscriber_id="s2", credits=10))
+        self.assertEqual(self.offsets(next(responses)), [3])
+        responses.cancel()
+
+    def test_first_message_must_be_start(self):
+        responses = self.stub.Subscribe(iter([SubscribeRequest(ack=SubscribeAck(offset=1))]))
+        with self.assertRaises(grpc.RpcError) as error:
+            list(responses)
+        self.assertEqual(error.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_publish_application_created_goes_to_broker(self):
+        application = Application(id=7, student_id=1, vacancy_id=2)
+        with mock.patch("apps.core.events.publishers.get_event_broker", return_value=self.broker):
+            offset = publish_application_created(application)
+
+        (read_offset, data), = self.broker.read(1, 10)
+        self.assertEqual(read_offset, offset)
+        event = EventEnvelope.FromString(data).application_created
+        self.assertEqual((event.application_id, event.student_id, event.vacancy_id), (7, 1, 2))
+
+
+class OutboxTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.broker = EventBroker()
+        self.relay = OutboxRelay(self.broker, batch_size=2)
+        self.student = Student.objects.create(
+            email="s@example.com", first_name="A", last_name="B", enrollment_date="2024-09-01"
+        )
+        self.vacancy = Vacancy.objects.create(title="Backend", description="Django")
+
+    def create_application(self):
+        return Application.objects.create(student=self.student, vacancy=self.vacancy)
+
+    def test_application_save_writes_outbox_and_wakes_relay_on_commit(self):
+        with mock.patch("apps.core.events.outbox.wake_outbox_relay") as wake:
+            with self.captureOnCommitCallbacks(execute=True):
+                application = self.create_application()
+                self.assertEqual(OutboxEvent.objects.count(), 1)
+                wake.assert_not_called()
+        wake.assert_called_once_with()
+
+        # Qayta saqlash yangi ApplicationCreatedEvent yozmaydi
+        application.save()
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+        self.assertEqual(self.relay.drain(), 1)
+        self.assertFalse(OutboxEvent.objects.exists())
+        (offset, data), = self.broker.read(1, 10)
+        event = EventEnvelope.FromString(data).application_created
+        self.assertEqual((event.application_id, event.student_id), (application.id, self.student.id))
+
+    def test_rollback_discards_event(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.create_application()
+                raise RuntimeError("rollback")
+        self.assertFalse(Application.objects.exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_drain_publishes_in_order_and_batches(self):
+        applications = [self.create_application() for _ in range(5)]
+
+        with mock.patch.object(self.broker, "publish_batch", wraps=self.broker.publish_batch) as publish_batch:
+            self.assertEqual(self.relay.drain(), 5)
+        self.assertEqual(publish_batch.call_count, 3)
+
+        published = [
+            EventEnvelope.FromString(data).application_created.application_id
+            for _, data in self.broker.read(1, 10)
+        ]
+        self.assertEqual(published, [application.id for application in applications])
+        self.assertEqual(self.relay.drain(), 0)
+
+    def test_failed_delete_does_not_republish_to_feed(self):
+        self.create_application()
+
+        with mock.patch.object(QuerySet, "delete", side_effect=DatabaseError("disk full")):
+            with self.assertRaises(DatabaseError):
+                self.relay.drain_once()
+        self.assertEqual(self.broker.last_offset, 1)
+
+        self.assertEqual(self.relay.drain(), 1)
+        self.assertEqual(self.broker.last_offset, 1)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def drained_events(self):
+        self.relay.drain()
+        envelopes = [EventEnvelope.FromString(data) for _, data in self.broker.read(1, 1000)]
+        return [getattr(envelope, envelope.WhichOneof("event")) for envelope in envelopes]
+
+    def test_bulk_create_with_events(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            created = Application.objects.bulk_create_with_events(
+                [Application(student=self.student, vacancy=self.vacancy) for _ in range(3)]
+            )
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(OutboxEvent.objects.count(), 3)
+
+        events = self.drained_events()
+        self.assertEqual([event.application_id for event in events], [application.id for application in created])
+        self.assertEqual({event.base.type for event in events}, {EventType.APPLICATION_CREATED})
+
+    def test_update_status_emits_events_only_for_changed_rows(self):
+        applications = Application.objects.bulk_create_with_events(
+            [Application(student=self.student, vacancy=self.vacancy) for _ in range(3)]
+        )
+        Application.objects.filter(pk=applications[0].pk).update(status="accepted")
+        OutboxEvent.objects.all().delete()
+
+        # SAVEPOINT, SELECT, UPDATE, outbox INSERT, hisoblagich upsert, RELEASE
+        with self.assertNumQueries(6):
+            updated = Application.objects.all().update_status("accepted")
+        self.assertEqual(updated, 2)
+        self.assertEqual(Application.objects.filter(status="accepted").count(), 3)
+
+        events = self.drained_events()
+        self.assertEqual(
+            [(event.application_id, event.old_status, event.new_status) for event in events],
+            [(application.pk, ApplicationStatus.PENDING, ApplicationStatus.ACCEPTED) for application in applications[1:]],
+        )
+        self.assertEqual(Application.objects.all().update_status("accepted"), 0)
+
+        with self.assertRaises(ValueError):
+            Application.objects.update_status("archived")
+
+    def test_status_change_on_save_emits_event_without_select(self):
+        application_id = self.create_application().pk
+        OutboxEvent.objects.all().delete()
+        application = Application.objects.get(pk=application_id)
+
+        application.status = "reviewed"
+        # SAVEPOINT, UPDATE, outbox INSERT, hisoblagich upsert, RELEASE - eski status uchun SELECT yo'q
+        with self.assertNumQueries(5):
+            application.save()
+        # Status o'zgarmagan - event ham yo'q
+        with self.assertNumQueries(3):
+            application.save()
+
+        application.status = "accepted"
+        application.save(update_fields=["status"])
+        application.status = "rejected"
+        application.save(update_fields=["vacancy"])
+
+        events = self.drained_events()
+        self.assertEqual(
+            [(event.application_id, event.old_status, event.new_status) for event in events],
+            [
+                (application_id, ApplicationStatus.PENDING, ApplicationStatus.REVIEWED),
+                (application_id, ApplicationStatus.REVIEWED, ApplicationStatus.ACCEPTED),
+            ],
+        )
+
+    def test_status_tracking_follows_refresh_and_deferred_fields(self):
+        application = self.create_application()
+        Application.objects.filter(pk=application.pk).update(status="accepted")
+        application.refresh_from_db()
+        OutboxEvent.objects.all().delete()
+
+        application.status = "accepted"
+        application.save()
+        self.assertFalse(OutboxEvent.objects.exists())
+
+        deferred = Application.objects.defer("status").get(pk=application.pk)
+        deferred.vacancy = self.vacancy
+        deferred.save()
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_publish_batch_matches_envelope_serialization(self):
+        event = ApplicationStatusChangedEvent(application_id=300, new_status=ApplicationStatus.ACCEPTED)
+        for _ in range(200):
+            self.broker.publish(event)
+        (offset, data), = self.broker.read(200, 1)
+
+        expected = EventEnvelope(offset=200)
+        expected.application_status_changed.CopyFrom(event)
+        self.assertEqual(data, expected.SerializeToString())
+
+
+class CeleryFanoutTests(WebhookTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # namespace="CELERY" - settings dagi nom bilan o'rnatiladi
+        cls.broker_url = celery_app.conf.CELERY_BROKER_URL
+        celery_app.conf.CELERY_BROKER_URL = "memory://"
+        cls.worker = start_worker(celery_app, perform_ping_check=False, queues=["events"])
+        cls.worker.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.worker.__exit__(None, None, None)
+        celery_app.conf.CELERY_BROKER_URL = cls.broker_url
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        student = Student.objects.create(
+            email="s@example.com", first_name="A", last_name="B", enrollment_date="2024-09-01"
+        )
+        vacancy = Vacancy.objects.create(title="Backend", description="Django")
+        self.applications = Application.objects.bulk_create_with_events(
+            [Application(student=student, vacancy=vacancy) for _ in range(5)]
+        )
+
+    def test_relay_fans_out_batches_to_sinks_via_celery(self):
+        received = []
+        done = threading.Event()
+
+        @sinks.register(event_type="application_created")
+        def collect(events):
+            received.append([event.application_id for event in events])
+            if sum(map(len, received)) == 5:
+                done.set()
+
+        self.addCleanup(sinks.unregister, collect)
+        relay = OutboxRelay(EventBroker(), fanout=CeleryFanout(max_batch_size=2, max_delay_ms=0))
+
+        with mock.patch.object(deliver_events, "delay", wraps=deliver_events.delay) as delay:
+            self.assertEqual(relay.drain(), 5)
+        self.assertEqual(delay.call_count, 3)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+        self.assertTrue(done.wait(10))
+        self.assertEqual(
+            sorted(sum(received, [])), [application.id for application in self.applications]
+        )
+        self.assertTrue(all(len(batch) <= 2 for batch in received))
+
+    def test_single_relay_feeds_broker_and_fanout(self):
+        broker = EventBroker()
+        relay = OutboxRelay(broker, fanout=CeleryFanout(max_delay_ms=0))
+
+        with mock.patch.object(deliver_events, "delay") as delay:
+            self.assertEqual(relay.drain(), 5)
+        delay.assert_called_once()
+        self.assertEqual(len(broker.read(1, 10)), 5)
+
+    def test_celery_outage_does_not_republish_to_feed(self):
+        broker = EventBroker()
+        relay = OutboxRelay(broker, fanout=CeleryFanout(max_delay_ms=0))
+
+        with mock.patch.object(deliver_events, "delay", side_effect=ConnectionError("celery down")):
+            for _ in range(3):
+                with self.assertRaises(ConnectionError):
+                    relay.drain_once()
+        self.assertEqual(broker.last_offset, 5)
+        self.assertEqual(OutboxEvent.objects.filter(published=True, claimed_until=None).count(), 5)
+
+        with mock.patch.object(deliver_events, "delay") as delay:
+            self.assertEqual(relay.drain(), 5)
+        delay.assert_called_once()
+        self.assertEqual(broker.last_offset, 5)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_partial_fanout_resends_only_missing_chunks(self):
+        relay = OutboxRelay(EventBroker(), fanout=CeleryFanout(max_batch_size=2, max_delay_ms=0))
+        ids = list(OutboxEvent.objects.values_list("id", flat=True))
+
+        with mock.patch.object(deliver_events, "delay", side_effect=[None, ConnectionError("celery down")]):
+            with self.assertRaises(ConnectionError):
+                relay.drain_once()
+        self.assertEqual(list(OutboxEvent.objects.filter(fanned_out=True).values_list("id", flat=True)), ids[:2])
+
+        with mock.patch.object(deliver_events, "delay") as delay:
+            self.assertEqual(relay.drain(), 5)
+        resent = [
+            event.offset for (batch,), _ in delay.call_args_list for event in EventBatch.FromString(batch).events
+        ]
+        self.assertEqual(resent, ids[2:])
+
+    def test_standalone_relay_requires_fanout(self):
+        with self.settings(EVENT_FANOUT={"ENABLED": False}):
+            with self.assertRaisesMessage(CommandError, "run_grpc_server"):
+                call_command("run_outbox_relay", once=True)
+        self.assertEqual(OutboxEvent.objects.count(), 5)
+
+    def test_fanout_batch_matches_event_batch_serialization(self):
+        rows = list(OutboxEvent.objects.values_list("id", "event_type", "payload"))
+        with mock.patch.object(deliver_events, "delay") as delay:
+            CeleryFanout(max_batch_size=10).publish_batch((pk, t, bytes(p)) for pk, t, p in rows)
+
+        (batch,), _ = delay.call_args
+        expected = EventBatch()
+        for pk, _, payload in rows:
+            expected.events.add(offset=pk).application_created.ParseFromString(bytes(payload))
+        self.assertEqual(batch, expected.SerializeToString())
+
+    def test_sink_error_is_raised_after_all_sinks_run(self):
+        calls = []
+
+        def broken(events):
+            raise RuntimeError("sink down")
+
+        sink_registry = SinkRegistry()
+        sink_registry.register(broken, event_type="application_created")
+        sink_registry.register(lambda events: calls.append(len(events)))
+
+        batch = EventBatch()
+        batch.events.add(offset=1).application_created.application_id = 1
+        with self.assertRaises(RuntimeError):
+            sink_registry.deliver(batch.SerializeToString())
+        self.assertEqual(calls, [1])
+
+
+class EventLogTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def open_log(self, **kwargs):
+        kwargs = {"segment_bytes": 512, "index_interval_bytes": 128, "retention_seconds": 0, **kwargs}
+        log = EventLog(self.directory, **kwargs)
+        self.addCleanup(log.close)
+        return log
+
+    def event(self, i):
+        return ApplicationCreatedEvent(
+            base=BaseEvent(event_id=f"evt_{i}", occurred_at=Timestamp(seconds=1_700_000_000 + i * 10)),
+            application_id=i,
+        )
+
+    def application_ids(self, records):
+        return [EventEnvelope.FromString(data).application_created.application_id for _, data in records]
+
+    def test_broker_writes_segments_and_replays_from_offset_and_time(self):
+        log = self.open_log()
+        broker = EventBroker(retention=4, log=log)
+        for i in range(1, 61):
+            broker.publish(self.event(i))
+
+        self.assertGreater(len(list(Path(self.directory).glob("*.log"))), 2)
+        records = list(log.replay(from_offset=1))
+        self.assertEqual([offset for offset, _ in records], list(range(1, 61)))
+        self.assertEqual(self.application_ids(records), list(range(1, 61)))
+
+        # Xotiradan chiqqan offsetlar disk dan o'qiladi
+        self.assertEqual(self.application_ids(broker.read(3, 5)), [3, 4, 5, 6, 7])
+        self.assertEqual(self.application_ids(broker.read(59, 5)), [59, 60])
+
+        since = (1_700_000_000 + 25 * 10) * 1_000_000_000
+        self.assertEqual(self.application_ids(log.replay(since=since)), list(range(25, 61)))
+        self.assertEqual(list(log.replay(since=since * 2)), [])
+
+        offset, data = log.find("evt_42")
+        self.assertEqual((offset, self.application_ids([(offset, data)])), (42, [42]))
+        self.assertIsNone(log.find("evt_missing"))
+
+    def test_reopen_recovers_torn_write_and_indexes(self):
+        log = self.open_log()
+        log.append_batch((i, encode_envelope(i, "application_created", self.event(i).SerializeToString()))
+                         for i in range(1, 21))
+        log.close()
+
+        active = sorted(Path(self.directory).glob("*.log"))[-1]
+        with open(active, "ab") as file:
+            file.write(b"\x40\x08\x15")  # chala yozuv
+        active.with_suffix(".idindex").unlink()
+
+        log = self.open_log()
+        self.assertEqual(log.next_offset, 21)
+        self.assertEqual(log.find("evt_20")[0], 20)
+        self.assertEqual(self.application_ids(log.read(18, 10)), [18, 19, 20])
+
+        # Offsetlar broker da diskdagi log dan davom etadi
+        self.assertEqual(EventBroker(log=log).publish(self.event(21)), 21)
+        readonly = EventLog(self.directory, read_only=True)
+        self.assertEqual(self.application_ids(readonly.read(21, 1)), [21])
+
+    def test_second_writer_fails_fast(self):
+        log = self.open_log()
+        log.append_batch([(1, encode_envelope(1, "application_created", self.event(1).SerializeToString()))])
+
+        with self.assertRaisesMessage(EventLogLocked, str(os.getpid())):
+            EventLog(self.directory)
+        # O'quvchilar lock siz ochiladi
+        self.assertEqual(self.application_ids(EventLog(self.directory, read_only=True).read(1, 10)), [1])
+
+        log.close()
+        self.assertEqual(self.open_log().next_offset, 2)
+
+    def test_committed_offsets_survive_restart(self):
+        log = self.open_log()
+        broker = EventBroker(log=log, offsets_flush_interval=60)
+        for i in range(1, 6):
+            broker.publish(self.event(i))
+        broker.commit("s1", 2)
+        broker.flush_offsets()
+        # Oraliq o'tmaguncha har bir commit diskka yozilmaydi
+        with mock.patch.object(log, "save_offsets") as save_offsets:
+            broker.commit("s1", 4)
+        save_offsets.assert_not_called()
+        broker.close()
+
+        restarted = EventBroker(log=self.open_log())
+        self.assertEqual(restarted.committed("s1"), 4)
+        self.assertEqual(restarted.committed("s2"), 0)
+        self.assertEqual(restarted.publish(self.event(6)), 6)
+
+    def test_retention_drops_oldest_segments(self):
+        log = self.open_log(retention_segments=2)
+        broker = EventBroker(log=log)
+        for i in range(1, 61):
+            broker.publish(self.event(i))
+
+        self.assertEqual(len(list(Path(self.directory).glob("*.log"))), 2)
+        self.assertGreater(log.first_offset, 1)
+        self.assertEqual(next(log.replay(from_offset=1))[0], log.first_offset)
+        self.assertIsNone(log.find("evt_1"))
+
+    def test_replay_events_command(self):
+        log = self.open_log()
+        broker = EventBroker(log=log)
+        for i in range(1, 11):
+            broker.publish(self.event(i))
+        output = os.path.join(self.directory, "replay.bin")
+
+        with override_settings(EVENT_LOG={"DIRECTORY": self.directory}):
+            call_command("replay_events", from_offset=7, output=output, stderr=io.StringIO())
+
+        with open(output, "rb") as file:
+            envelopes = list(iter_delimited_messages(file))
+        self.assertEqual(self.application_ids((None, data) for data in envelopes), [7, 8, 9, 10])
+
+
+class ApplicationCountTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = Student.objects.create(
+            email="s@example.com", first_name="A", last_name="B", enrollment_date="2024-09-01"
+        )
+        self.vacancy, self.other = Vacancy.objects.bulk_create(
+            [Vacancy(title="Backend", description=""), Vacancy(title="Frontend", description="")]
+        )
+
+    def counts(self, vacancy=None):
+        return dict(
+            VacancyApplicationCount.objects.filter(vacancy=vacancy or self.vacancy, count__gt=0)
+            .values_list("status", "count")
+        )
+
+    def actual(self, vacancy=None):
+        return dict(
+            Application.objects.filter(vacancy=vacancy or self.vacancy)
+            .values("status").annotate(n=Count("pk")).order_by().values_list("status", "n")
+        )
+
+    def test_create_status_change_and_delete_update_counters(self):
+        first = Application.objects.create(student=self.student, vacancy=self.vacancy)
+        second = Application.objects.create(student=self.student, vacancy=self.vacancy)
+        self.assertEqual(self.counts(), {"pending": 2})
+
+        first.status = "accepted"
+        first.save()
+        second.save()  # status o'zgarmagan - hisoblagich ham o'zgarmaydi
+        self.assertEqual(self.counts(), {"pending": 1, "accepted": 1})
+
+        first.delete()
+        self.assertEqual(self.counts(), {"pending": 1})
+
+    def test_bulk_paths_update_counters(self):
+        Application.objects.bulk_create_with_events(
+            [Application(student=self.student, vacancy=vacancy) for vacancy in [self.vacancy] * 3 + [self.other]]
+        )
+        ids = list(Application.objects.filter(vacancy=self.vacancy).values_list("pk", flat=True)[:2])
+        Application.objects.filter(pk__in=ids).update_status("reviewed")
+
+        self.assertEqual(self.counts(), {"pending": 1, "reviewed": 2})
+        self.assertEqual(self.counts(self.other), {"pending": 1})
+
+    def test_deleting_vacancy_drops_its_counters(self):
+        Application.objects.create(student=self.student, vacancy=self.vacancy)
+        Application.objects.create(student=self.student, vacancy=self.other)
+        self.vacancy.delete()
+        self.assertEqual(list(VacancyApplicationCount.objects.values_list("vacancy_id", "count")), [(self.other.id, 1)])
+
+        self.student.delete()
+        self.assertEqual(self.counts(self.other), {})
+
+    def test_reconcile_fixes_drift(self):
+        Application.objects.bulk_create_with_events(
+            [Application(student=self.student, vacancy=self.vacancy) for _ in range(3)]
+        )
+        # Plain update() hisoblagichlarni chetlab o'tadi
+        Application.objects.filter(pk=Application.objects.first().pk).update(status="rejected")
+        Application.objects.bulk_create([Application(student=self.student, vacancy=self.other)])
+        self.assertNotEqual(self.counts(), self.actual())
+
+        self.assertEqual(VacancyApplicationCount.objects.reconcile(batch_size=1), 3)
+        self.assertEqual(self.counts(), self.actual())
+        self.assertEqual(self.counts(self.other), self.actual(self.other))
+        self.assertEqual(VacancyApplicationCount.objects.reconcile(), 0)
+
+    def test_counts_endpoint_reads_counters_without_grouping(self):
+        Application.objects.create(student=self.student, vacancy=self.vacancy, status="accepted")
+        Application.objects.create(student=self.student, vacancy=self.other)
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/application-counts/", {"vacancy_id": self.vacancy.id})
+            data = b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        counts = [entities_pb2.VacancyApplicationCount.FromString(m) for m in iter_delimited_messages(io.BytesIO(data))]
+        self.assertEqual(
+            [(c.vacancy_id, c.status, c.count) for c in counts], [(self.vacancy.id, ApplicationStatus.ACCEPTED, 1)]
+        )
+        self.assertEqual(self.client.get("/api/application-counts/", {"vacancy_id": "x"}).status_code, 400)
+
+
+class EntityCacheTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.students = Student.objects.bulk_create([
+            Student(email=f"s{i}@example.com", first_name=f"A{i}", last_name="B", enrollment_date="2024-09-01")
+            for i in range(3)
+        ])
+        self.cache = get_entity_cache(Student)
+
+    def test_repeated_reads_skip_query_and_serialization(self):
+        pk = self.students[0].pk
+        with self.assertNumQueries(1):
+            data = self.cache.get(pk)
+        self.assertEqual(entities_pb2.Student.FromString(data).email, "s0@example.com")
+
+        with self.assertNumQueries(0), mock.patch.object(entities_pb2.Student, "SerializeToString") as serialize:
+            self.assertEqual(self.cache.get(pk), data)
+            # Local qatlam bo'sh - baytlar shared backend dan olinadi
+            self.cache.clear_local()
+            self.assertEqual(self.cache.get(pk), data)
+        serialize.assert_not_called()
+
+    def test_get_many_loads_only_missing_rows(self):
+        first, second, third = (student.pk for student in self.students)
+        self.cache.get(first)
+
+        with self.assertNumQueries(1) as context:
+            found = self.cache.get_many([second, first, 999_999, third])
+        self.assertEqual(sorted(found), sorted([first, second, third]))
+        self.assertIn(f"IN ({second}, 999999, {third})", context.captured_queries[0]["sql"])
+
+    def test_save_and_delete_invalidate_after_commit(self):
+        student = self.students[0]
+        self.cache.get(student.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            student.first_name = "Yangi"
+            student.save()
+            # Commit gacha eski qiymat qoladi
+            self.assertEqual(entities_pb2.Student.FromString(self.cache.get(student.pk)).first_name, "A0")
+        self.assertEqual(entities_pb2.Student.FromString(self.cache.get(student.pk)).first_name, "Yangi")
+
+        pk = student.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            student.delete()
+        self.assertIsNone(self.cache.get(pk))
+
+    def test_invalidate_during_load_does_not_leave_stale_entry(self):
+        student = self.students[0]
+        load = self.cache._load
+
+        def load_then_commit(pks):
+            # Eski qator o'qilgandan keyin boshqa so'rov yozib, commit qiladi
+            rows = load(pks)
+            with self.captureOnCommitCallbacks(execute=True):
+                Student.objects.filter(pk=student.pk).update(first_name="Yangi")
+                self.cache.invalidate(student.pk)
+            return rows
+
+        with mock.patch.object(self.cache, "_load", side_effect=load_then_commit):
+            self.assertEqual(entities_pb2.Student.FromString(self.cache.get(student.pk)).first_name, "A0")
+
+        self.cache.clear_local()
+        with self.assertNumQueries(1):
+            data = self.cache.get(student.pk)
+        self.assertEqual(entities_pb2.Student.FromString(data).first_name, "Yangi")
+
+    def test_version_outlives_entry_filled_after_invalidate(self):
+        student = self.students[0]
+        message_cache = MessageCache(self.cache.mapper, timeout=100, local_max_size=0)
+        load = message_cache._load
+        clock = [time.time()]
+
+        def load_then_commit(pks):
+            rows = load(pks)
+            Student.objects.filter(pk=student.pk).update(first_name="Yangi")
+            message_cache.invalidate(student.pk)
+            # Eski qator invalidate dan keyinroq keshga yoziladi
+            clock[0] += 50
+            return rows
+
+        with mock.patch("time.time", side_effect=lambda: clock[0]):
+            with mock.patch.object(message_cache, "_load", side_effect=load_then_commit):
+                message_cache.get(student.pk)
+            # Yozuv hali eskirmagan, versiya kaliti esa yozuvlar timeout idan o'tgan
+            clock[0] += 70
+            data = message_cache.get(student.pk)
+        self.assertEqual(entities_pb2.Student.FromString(data).first_name, "Yangi")
+
+    def test_entity_endpoints(self):
+        first, second = self.students[0].pk, self.students[1].pk
+        response = self.client.get(f"/api/students/{first}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(entities_pb2.Student.FromString(response.content).id, first)
+
+        response = self.client.get("/api/students/by-id/", {"id": [second, 999_999, first]})
+        ids = [entities_pb2.Student.FromString(m).id for m in iter_delimited_messages(io.BytesIO(response.content))]
+        self.assertEqual(ids, [second, first])
+
+        self.assertEqual(self.client.get("/api/students/999999/").status_code, 404)
+        self.assertEqual(self.client.get("/api/vacancies/by-id/", {"id": "x"}).status_code, 400)
+
+    @override_settings(ENTITY_CACHE={"ENABLED": False})
+    def test_disabled_cache_reads_database(self):
+        self.assertIsNone(get_entity_cache(Student))
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/students/{self.students[0].pk}/")
+        self.assertEqual(response.status_code, 200)
+
+
+class ImportEntitiesTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_dump(self, name, messages, compress=False):
+        path = os.path.join(self.directory, name)
+        with (gzip.open if compress else open)(path, "wb") as output:
+            for message in messages:
+                output.write(encode_delimited(message.SerializeToString()))
+        return path
+
+    def import_entities(self, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command("import_entities", *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_gzip_dump_is_imported_in_chunks_with_upstream_ids(self):
+        path = self.write_dump("students.pb.gz", (
+            entities_pb2.Student(
+                id=100 + i, email=f"s{i}@example.com", first_name="A", last_name="B",
+                enrollment_date={"seconds": 1725148800},
+            )
+            for i in range(250)
+        ), compress=True)
+
+        with mock.patch("apps.core.importer.import_messages", wraps=import_messages) as chunks:
+            stdout, _ = self.import_entities("students", path, "--chunk-size", "100", "--batch-size", "30")
+
+        self.assertEqual(chunks.call_count, 3)
+        self.assertIn("250 ta students import qilindi", stdout)
+        self.assertEqual(Student.objects.count(), 250)
+        student = Student.objects.get(pk=100)
+        self.assertEqual((student.email, student.enrollment_date), ("s0@example.com", datetime.date(2024, 9, 1)))
+
+    def test_applications_keep_dates_update_counters_and_skip_events(self):
+        student = Student.objects.create(email="s@example.com", first_name="A", last_name="B", enrollment_date="2024-09-01")
+        vacancy = Vacancy.objects.create(title="Backend", description="")
+        OutboxEvent.objects.all().delete()
+        applications = [
+            entities_pb2.Application(
+                student_id=student.id, vacancy_id=vacancy.id, status=status,
+                application_date={"seconds": 1704067200} if status == ApplicationStatus.ACCEPTED else None,
+            )
+            for status in (ApplicationStatus.PENDING, ApplicationStatus.PENDING, ApplicationStatus.ACCEPTED)
+        ]
+        self.import_entities("applications", self.write_dump("applications.pb", applications))
+
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(
+            Application.objects.get(status="accepted").application_date, datetime.date(2024, 1, 1)
+        )
+        self.assertEqual(Application.objects.filter(status="pending").first().application_date, datetime.date.today())
+        self.assertEqual(
+            dict(VacancyApplicationCount.objects.values_list("status", "count")), {"pending": 2, "accepted": 1}
+        )
+        # auto_now_add oddiy save uchun qayta yoqilgan
+        self.assertTrue(Application._meta.get_field("application_date").auto_now_add)
+
+    def test_rerun_with_ignore_conflicts_skips_existing_rows(self):
+        vacancies = [entities_pb2.Vacancy(id=i, title=f"V{i}", description="") for i in range(1, 6)]
+        self.import_entities("vacancies", self.write_dump("part.pb", vacancies[:2]))
+        self.import_entities("vacancies", self.write_dump("all.pb", vacancies), "--ignore-conflicts")
+        self.assertEqual(sorted(Vacancy.objects.values_list("id", flat=True)), [1, 2, 3, 4, 5])
+
+    def test_progress_reports_rows_per_second(self):
+        path = self.write_dump("vacancies.pb", (entities_pb2.Vacancy(title=f"V{i}") for i in range(20)))
+        importer = BulkImporter("vacancies", chunk_size=5, progress_interval=0.0, progress=mock.Mock())
+        with open(path, "rb") as stream:
+            stats = importer.run(stream)
+        self.assertEqual(stats.rows, 20)
+        self.assertEqual([call.args[0].rows for call in importer.progress.call_args_list], [5, 10, 15, 20])
+        self.assertGreater(stats.rate, 0)
+
+
+class ModelMapperTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = Student.objects.create(
+            email="s@example.com", first_name="A", last_name="B", enrollment_date=datetime.date(2024, 9, 1)
+        )
+        self.vacancy = Vacancy.objects.create(title="Backend", description="Django")
+
+    def test_round_trip_converts_dates_enums_and_foreign_keys(self):
+        message = student_mapper.to_message(self.student)
+        self.assertEqual(message.enrollment_date.ToDatetime().date(), datetime.date(2024, 9, 1))
+        self.assertEqual(student_mapper.to_values(message)["enrollment_date"], datetime.date(2024, 9, 1))
+
+        application = Application.objects.create(student=self.student, vacancy=self.vacancy, status="accepted")
+        message = application_mapper.to_message(application)
+        self.assertEqual(message.status, ApplicationStatus.ACCEPTED)
+        self.assertEqual((message.student_id, message.vacancy_id), (self.student.id, self.vacancy.id))
+
+        values = application_mapper.to_values(message)
+        self.assertEqual(values["status"], "accepted")
+        self.assertEqual(values["student_id"], self.student.id)
+
+    def test_unset_fields_keep_model_defaults(self):
+        application = application_mapper.from_message(
+            entities_pb2.Application(student_id=self.student.id, vacancy_id=self.vacancy.id)
+        )
+        self.assertIsNone(application.pk)
+        self.assertEqual(application.status, "pending")
+        self.assertNotIn("application_date", application_mapper.to_values(entities_pb2.Application()))
+
+    def test_queryset_export_uses_one_query(self):
+        Application.objects.bulk_create(
+            [Application(student=self.student, vacancy=self.vacancy, status="reviewed") for _ in range(5)]
+        )
+        with self.assertNumQueries(1):
+            messages = application_mapper.to_messages(Application.objects.order_by("id"))
+
+        self.assertEqual(len(messages), 5)
+        self.assertTrue(all(m.status == ApplicationStatus.REVIEWED for m in messages))
+
+        imported = application_mapper.from_messages(messages)
+        for application in imported:
+            application.pk = None
+        Application.objects.bulk_create(imported)
+        self.assertEqual(Application.objects.filter(status="reviewed").count(), 10)
+
+    def test_mismatched_message_is_rejected_at_build_time(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ModelMapper(Vacancy, entities_pb2.Student)
+
+
+class ListViewTests(WebhookTestCase):
+    def setUp(self):
+        super().setUp()
+        Student.objects.bulk_create([
+            Student(email=f"s{i:02d}@example.com", first_name="A", last_name="B", enrollment_date="2024-09-01")
+            for i in range(7)
+        ])
+        # Bir xil sarlavhalar sahifa chegarasida ham id bo'yicha ajratiladi
+        Vacancy.objects.bulk_create([Vacancy(title=title, description="") for title in "BABABAC"])
+
+    def fetch(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-protobuf")
+        data = b"".join(response.streaming_content)
+        return list(iter_delimited_messages(io.BytesIO(data))), response.get("X-Next-Cursor")
+
+    def fetch_all(self, url, message_class, limit, **params):
+        pages, items, cursor = 0, [], None
+        while True:
+            if cursor:
+                params["after"] = cursor
+            with self.assertNumQueries(2):
+                messages, cursor = self.fetch(url, limit=limit, **params)
+            pages += 1
+            items.extend(message_class.FromString(data) for data in messages)
+            if cursor is None:
+                return items, pages
+
+    def test_students_are_paged_by_email(self):
+        students, pages = self.fetch_all("/api/students/", entities_pb2.Student, limit=3)
+        self.assertEqual(pages, 3)
+        self.assertEqual([s.email for s in students], [f"s{i:02d}@example.com" for i in range(7)])
+        self.assertEqual(students[0].enrollment_date.ToDatetime().date(), datetime.date(2024, 9, 1))
+
+    def test_composite_keyset_does_not_skip_or_repeat_ties(self):
+        vacancies, _ = self.fetch_all("/api/vacancies/", entities_pb2.Vacancy, limit=2)
+        expected = list(Vacancy.objects.order_by("title", "id").values_list("title", "id"))
+        self.assertEqual([(v.title, v.id) for v in vacancies], expected)
+
+    def test_applications_filter_by_status(self):
+        student, vacancy = Student.objects.first(), Vacancy.objects.first()
+        Application.objects.bulk_create([
+            Application(student=student, vacancy=vacancy, status="accepted" if i % 2 else "pending")
+            for i in range(6)
+        ])
+        applications, pages = self.fetch_all(
+            "/api/applications/", entities_pb2.Application, limit=2, status="accepted"
+        )
+        self.assertEqual(pages, 2)  # oxirgi sahifa to'la bo'lsa keyingisi bo'sh keladi
+        self.assertEqual([a.status for a in applications], [ApplicationStatus.ACCEPTED] * 3)
+        self.assertEqual(
+            [a.id for a in applications],
+            list(Application.objects.filter(status="accepted").order_by("id").values_list("id", flat=True)),
+        )
+
+    def test_rows_added_after_the_cursor_are_not_lost(self):
+        _, cursor = self.fetch("/api/students/", limit=3)
+        Student.objects.create(email="s05a@example.com", first_name="A", last_name="B", enrollment_date="2024-09-01")
+
+        students, _ = self.fetch_all("/api/students/", entities_pb2.Student, limit=3, after=cursor)
+        self.assertEqual(
+            [s.email for s in students],
+            ["s03@example.com", "s04@example.com", "s05@example.com", "s05a@example.com", "s06@example.com"],
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.client.get("/api/students/", {"after": "not-a-cursor"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/vacancies/", {"after": encode_cursor(["B"])}).status_code, 400)
+        # To'g'ri tuzilgan, lekin qiymatlari buzilgan kursorlar
+        for values in (["B", "abc"], ["B", {"a": 1}], ["B", None], [None, 1], ["B", [1]]):
+            with self.subTest(values=values):
+                response = self.client.get("/api/vacancies/", {"after": encode_cursor(values)})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get("/api/students/", {"limit": 0}).status_code, 400)
+        self.assertEqual(self.client.get("/api/applications/", {"status": "unknown"}).status_code, 400)
+
+
+class ResponseEncoderTests(WebhookTestCase):
+    def expected(self, success, message, now_ns, results=()):
+        response = WebhookResponse(success=success, message=message)
+        response.processed_at.FromNanoseconds(now_ns)
+        for result in results:
+            response.results.add(
+                index=result.index, event_id=result.event_id,
+                success=result.success, message=result.message,
+            )
+        return response.SerializeToString()
+
+    def test_encode_matches_serialize_to_string(self):
+        encoder = ResponseEncoder()
+        for success, message, now_ns in [
+            (True, "Muvaffaqiyatli qabul qilindi", 1_700_000_000_123_456_789),
+            (False, "", 1_700_000_000_000_000_000),
+            (True, "O'zbekcha ✓ xabar", 5),
+            (False, "x" * 300, 0),
+        ]:
+            self.assertEqual(
+                encoder.encode(success, message, now_ns), self.expected(success, message, now_ns)
+            )
+
+    def test_encode_batch_matches_serialize_to_string(self):
+        results = [
+            ItemResult(0, "evt_0", True),
+            ItemResult(1, "", False, "boom"),
+            ItemResult(300, "evt_300", True, "Takroriy event"),
+        ]
+        self.assertEqual(
+            ResponseEncoder().encode_batch(False, "2/3", results, 1_700_000_000_5),
+            self.expected(False, "2/3", 1_700_000_000_5, results),
+        )
+
+    def test_only_constant_messages_are_cached(self):
+        encoder = ResponseEncoder(["ok"])
+        self.assertIs(encoder.prefix(True, "ok"), encoder.prefix(True, "ok"))
+        for i in range(10):
+            encoder.prefix(False, f"{i}/10 muvaffaqiyatli qabul qilindi")
+            encoder.encode_item(i, "evt", False, f"xato {i}")
+        encoder.encode_item(0, "evt", True)
+        self.assertEqual(set(encoder._prefixes), {(True, "ok")})
+        self.assertEqual(set(encoder._item_tails), {(True, "")})
+
+    def test_create_response_uses_current_time(self):
+        response = WebhookResponse.FromString(ProtobufDecoder().create_response(True, "ok"))
+        self.assertTrue(response.success)
+        self.assertAlmostEqual(response.processed_at.ToNanoseconds() / 1e9, time.time(), delta=5)
+        self.assertEqual(WebhookItemResult.FromString(
+            ResponseEncoder().encode_item(2, "evt", True)
+        ), WebhookItemResult(index=2, event_id="evt", success=True))
+
+
+class EventLoggingTests(WebhookTestCase):
+    def test_sampler_logs_one_in_n_per_event_type(self):
+        sampler = EventLogSampler({"default": 2, "order_placed": 3})
+
+        orders = [sampler.should_log("order_placed") for _ in range(6)]
+        others = [sampler.should_log("anything") for _ in range(4)]
+
+        self.assertEqual(orders, [True, False, False, True, False, False])
+        self.assertEqual(others, [True, False, True, False])
+
+    def test_single_compact_record_per_event(self):
+        decoder = ProtobufDecoder(registry=HandlerRegistry())
+
+        with self.assertLogs("protobuf_decoder.events", level="INFO") as logs:
+            decoder.handle_webhook_data(make_webhook_data("order_placed", "evt_5", items=50))
+
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual(record.webhook["event_id"], "evt_5")
+        self.assertEqual(record.webhook["data"]["items"], 50)
+        self.assertIn("case=order_data", record.getMessage())
+
+    def test_disabled_level_skips_formatting_and_sampling(self):
+        sampler = mock.Mock(spec=EventLogSampler)
+        event_logger = EventLogger(logger=mock.Mock(), sampler=sampler)
+        event_logger.logger.isEnabledFor.return_value = False
+
+        self.assertFalse(event_logger.log_event(make_webhook_data(), 0, 0.0))
+        sampler.should_log.assert_not_called()
+        event_logger.logger.log.assert_not_called()
+
+    @override_settings(WEBHOOK_LOGGING={"SAMPLE_RATES": {"user_created": 1000}})
+    def test_sample_rates_come_from_settings(self):
+        decoder = ProtobufDecoder(registry=HandlerRegistry())
+
+        with self.assertLogs("protobuf_decoder.events", level="INFO") as logs:
+            for i in range(5):
+                decoder.handle_webhook_data(make_webhook_data("user_created", f"evt_{i}"))
+
+        self.assertEqual(len(logs.records), 1)
+
+
+class BenchmarkCompareTests(TestCase):
+    def test_compare_flags_throughput_and_tail_regressions(self):
+        import benchmark_protobuf
+
+        baseline = {
+            "decode/user": {"ops_per_sec": 1000.0, "p99_us": 10.0},
+            "to_dict/user": {"ops_per_sec": 1000.0, "p99_us": 10.0},
+            "view/user": {"ops_per_sec": 1000.0, "p99_us": 10.0},
+        }
+        results = {
+            "decode/user": {"ops_per_sec": 980.0, "p99_us": 10.5},
+            "to_dict/user": {"ops_per_sec": 800.0, "p99_us": 10.0},
+            "view/user": {"ops_per_sec": 1000.0, "p99_us": 15.0},
+            "create_response": {"ops_per_sec": 1.0, "p99_us": 1.0},
+        }
+
+        with mock.patch("builtins.print"):
+            regressions = benchmark_protobuf.compare(results, baseline, threshold=0.10)
+
+        self.assertEqual(regressions, ["to_dict/user", "view/user"])
+
+    def test_measure_reports_allocations_of_each_call(self):
+        import benchmark_protobuf
+
+        result = benchmark_protobuf.measure(lambda: bytearray(1 << 20), iterations=5, warmup=0)
+
+        self.assertGreaterEqual(result["alloc_bytes_per_op"], 1 << 20)
@@ -3,7 +3,9 @@ import logging
 import sys
 import os
 from pathlib import Path
-from django.http import JsonResponse, HttpResponse
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
@@ -13,8 +15,16 @@ from django.views import View
 project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from apps.core.cache import get_entity_cache
+from apps.core.mappers import application_count_mapper, application_mapper, student_mapper, vacancy_mapper
+from protobuf_admission import admission_control
+from protobuf_metrics import get_metrics, instrument_view
+from protobuf_pagination import InvalidCursor, iter_delimited, paginate
+from protobuf_scanner import encode_varint
+
 try:
-    from protobuf_decoder import ProtobufDecoder
+    from protobuf_decoder import EVENT_BUSY_MESSAGE, ProtobufDecoder
+    from protobuf_dedup import ClaimResult, get_deduplicator
 except ImportError as e:
     # Fallback if protobuf_decoder can't be imported
     print(f"Warning: Could not import protobuf_decoder: {e}")
@@ -22,8 +32,19 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Event boshqa worker da hali ishlanayotganda sender shuncha sekunddan keyin qayta yuboradi
+EVENT_BUSY_RETRY_AFTER = 1
+
+
+def _event_busy(response):
+    """409 javobiga Retry-After qo'shadi: natija hali noma'lum, sender qayta yuborishi kerak"""
+    response["Retry-After"] = str(EVENT_BUSY_RETRY_AFTER)
+    return response
+
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(admission_control, name='post')
+@method_decorator(instrument_view("webhook"), name='post')
 class ProtobufWebhookView(View):
     """
     Protobuf formatdagi webhook ma'lumotlarini qabul qiluvchi view
@@ -32,7 +53,7 @@ class ProtobufWebhookView(View):
     def __init__(self):
         super().__init__()
         if ProtobufDecoder:
-            self.decoder = ProtobufDecoder()
+            self.decoder = ProtobufDecoder(deduplicator=get_deduplicator())
         else:
             self.decoder = None
     
@@ -48,7 +69,7 @@ class ProtobufWebhookView(View):
                 logger.error("Bo'sh ma'lumot keldi!")
                 return JsonResponse({"error": "Bo'sh ma'lumot"}, status=400)
             
-            logger.info(f"📥 Webhook qabul qilindi: {len(binary_data)} bytes")
+            logger.debug("📥 Webhook qabul qilindi: %d bytes", len(binary_data))
             
             if not self.decoder:
                 # Simple fallback processing
@@ -58,11 +79,38 @@ class ProtobufWebhookView(View):
                     "data_size": len(binary_data)
                 })
             
-            # Ma'lumotlarni decode qilish
-            decoded_data = self.decoder.process_webhook_data(binary_data)
+            # To'liq parse dan oldin sarlavhani tekshirish
+            header = self.decoder.scan_header(binary_data)
+            if header is None:
+                return JsonResponse({"error": "Noto'g'ri protobuf format"}, status=400)
             
-            if "error" in decoded_data:
+            claimed = self.decoder.should_decode(header)
+            if claimed is ClaimResult.BUSY:
+                return _event_busy(HttpResponse(
+                    self.decoder.create_response(False, EVENT_BUSY_MESSAGE),
+                    content_type='application/x-protobuf',
+                    status=409
+                ))
+            if not claimed:
+                logger.debug("⏭️ Event o'tkazib yuborildi: %s (%s)", header.event_type, header.event_id)
+                return HttpResponse(
+                    self.decoder.create_response(True, "O'tkazib yuborildi"),
+                    content_type='application/x-protobuf',
+                    status=200
+                )
+            
+            # Ma'lumotlarni decode qilish (dict/JSON faqat kerak bo'lsa yaratiladi)
+            try:
+                decoded_data = self.decoder.process_webhook_data(binary_data, lazy=True)
+            except Exception:
+                # Sender qayta yuborganda event yana ishlanishi kerak
+                self.decoder.release(header.event_id)
+                raise
+            
+            if decoded_data is None:
+                self.decoder.release(header.event_id)
                 return JsonResponse({"error": "Decode qila olmadim"}, status=400)
+            self.decoder.complete(header.event_id)
             
             # Muvaffaqiyatli response qaytarish
             response_data = self.decoder.create_response(True, "Muvaffaqiyatli qabul qilindi")
@@ -87,9 +135,212 @@ class ProtobufWebhookView(View):
         })
 
 
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(admission_control, name='post')
+@method_decorator(instrument_view("webhook_batch"), name='post')
+class ProtobufWebhookBatchView(View):
+    """
+    WebhookBatch formatida bir nechta webhookni bitta so'rovda qabul qiluvchi view
+    """
+    
+    def __init__(self):
+        super().__init__()
+        if ProtobufDecoder:
+            self.decoder = ProtobufDecoder(deduplicator=get_deduplicator())
+        else:
+            self.decoder = None
+    
+    def post(self, request):
+        """
+        POST request orqali WebhookBatch ni qabul qiladi va har bir element
+        natijasini WebhookResponse.results ichida qaytaradi
+        """
+        try:
+            binary_data = request.body
+            
+            if not binary_data:
+                logger.error("Bo'sh batch keldi!")
+                return JsonResponse({"error": "Bo'sh ma'lumot"}, status=400)
+            
+            if not self.decoder:
+                return JsonResponse({"error": "Decoder mavjud emas"}, status=503)
+            
+            results = self.decoder.process_webhook_batch(binary_data)
+            
+            if results is None:
+                return JsonResponse({"error": "Decode qila olmadim"}, status=400)
+            
+            response_data = self.decoder.create_batch_response(results)
+            
+            return HttpResponse(
+                response_data,
+                content_type='application/x-protobuf',
+                status=200
+            )
+            
+        except Exception as e:
+            logger.error(f"Batch ishlov berishda xato: {e}")
+            return JsonResponse({"error": str(e)}, status=500)
+    
+    def get(self, request):
+        """
+        GET request - test uchun
+        """
+        return JsonResponse({
+            "message": "Protobuf Webhook Batch Receiver tayyor!",
+            "instructions": "POST request bilan WebhookBatch binary data yuboring"
+        })
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(admission_control, name='post')
+@method_decorator(instrument_view("webhook_stream", read_body=False), name='post')
+class ProtobufWebhookStreamView(View):
+    """
+    Varint-length-delimited WebhookData stream ini qabul qiluvchi view.
+    
+    request.body ishlatilmaydi: eventlar request stream idan kelishi bilan
+    o'qiladi va ishlov beriladi, shuning uchun xotira sarfi yuklangan
+    ma'lumot hajmiga bog'liq emas.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        if ProtobufDecoder:
+            self.decoder = ProtobufDecoder(deduplicator=get_deduplicator())
+        else:
+            self.decoder = None
+    
+    def post(self, request):
+        """
+        POST request orqali length-delimited WebhookData stream ini qabul qiladi
+        """
+        try:
+            if not self.decoder:
+                return JsonResponse({"error": "Decoder mavjud emas"}, status=503)
+            
+            summary = self.decoder.process_webhook_stream(request)
+            
+            if summary["received"] == 0 and summary["error"] is None:
+                logger.error("Bo'sh stream keldi!")
+                return JsonResponse({"error": "Bo'sh ma'lumot"}, status=400)
+            
+            response_data = self.decoder.create_stream_response(summary)
+            
+            return HttpResponse(
+                response_data,
+                content_type='application/x-protobuf',
+                status=400 if summary["error"] else 200
+            )
+            
+        except Exception as e:
+            logger.error(f"Stream ishlov berishda xato: {e}")
+            return JsonResponse({"error": str(e)}, status=500)
+    
+    def get(self, request):
+        """
+        GET request - test uchun
+        """
+        return JsonResponse({
+            "message": "Protobuf Webhook Stream Receiver tayyor!",
+            "instructions": "POST request bilan varint-length-delimited WebhookData stream yuboring"
+        })
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(admission_control, name='post')
+@method_decorator(instrument_view("webhook_async"), name='post')
+class AsyncProtobufWebhookView(View):
+    """
+    ProtobufWebhookView ning ASGI uchun native async varianti.
+    
+    Body ASGI handler tomonidan event loop da o'qiladi, shuning uchun
+    sekin yuboruvchilar thread band qilmaydi; decode joyida (katta
+    payloadlar - thread pool da) bajariladi, async handlerlar await qilinadi.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        if ProtobufDecoder:
+            self.decoder = ProtobufDecoder(deduplicator=get_deduplicator())
+        else:
+            self.decoder = None
+    
+    async def post(self, request):
+        """
+        POST request orqali Protobuf ma'lumotlarini qabul qiladi
+        """
+        try:
+            binary_data = request.body
+            
+            if not binary_data:
+                logger.error("Bo'sh ma'lumot keldi!")
+                return JsonResponse({"error": "Bo'sh ma'lumot"}, status=400)
+            
+            logger.debug("📥 Async webhook qabul qilindi: %d bytes", len(binary_data))
+            
+            if not self.decoder:
+                return JsonResponse({
+                    "success": True,
+                    "message": "Ma'lumot qabul qilindi (basic processing)",
+                    "data_size": len(binary_data)
+                })
+            
+            header = self.decoder.scan_header(binary_data)
+            if header is None:
+                return JsonResponse({"error": "Noto'g'ri protobuf format"}, status=400)
+            
+            claimed = await self.decoder.should_decode_async(header)
+            if claimed is ClaimResult.BUSY:
+                return _event_busy(HttpResponse(
+                    self.decoder.create_response(False, EVENT_BUSY_MESSAGE),
+                    content_type='application/x-protobuf',
+                    status=409
+                ))
+            if not claimed:
+                logger.debug("⏭️ Event o'tkazib yuborildi: %s (%s)", header.event_type, header.event_id)
+                return HttpResponse(
+                    self.decoder.create_response(True, "O'tkazib yuborildi"),
+                    content_type='application/x-protobuf',
+                    status=200
+                )
+            
+            try:
+                decoded_data = await self.decoder.process_webhook_data_async(binary_data)
+            except Exception:
+                await self.decoder.release_async(header.event_id)
+                raise
+            
+            if decoded_data is None:
+                await self.decoder.release_async(header.event_id)
+                return JsonResponse({"error": "Decode qila olmadim"}, status=400)
+            await self.decoder.complete_async(header.event_id)
+            
+            return HttpResponse(
+                self.decoder.create_response(True, "Muvaffaqiyatli qabul qilindi"),
+                content_type='application/x-protobuf',
+                status=200
+            )
+            
+        except Exception as e:
+            logger.error(f"Async webhook ishlov berishda xato: {e}")
+            return JsonResponse({"error": str(e)}, status=500)
+    
+    async def get(self, request):
+        """
+        GET request - test uchun
+        """
+        return JsonResponse({
+            "message": "Async Protobuf Webhook Receiver tayyor!",
+            "instructions": "POST request bilan protobuf binary data yuboring"
+        })
+
+
 # Function-based view alternative
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
+@admission_control
+@instrument_view("receiver")
 def protobuf_webhook_receiver(request):
     """
     Function-based webhook receiver
@@ -105,12 +356,36 @@ def protobuf_webhook_receiver(request):
         try:
             binary_data = request.body
             
-            logger.info(f"📨 Protobuf webhook keldi: {len(binary_data)} bytes")
+            logger.debug("📨 Protobuf webhook keldi: %d bytes", len(binary_data))
             
             if ProtobufDecoder:
-                decoder = ProtobufDecoder()
+                decoder = ProtobufDecoder(deduplicator=get_deduplicator())
+                # To'liq parse dan oldin sarlavhani tekshirish
+                header = decoder.scan_header(binary_data)
+                if header is None:
+                    return JsonResponse({"error": "Noto'g'ri protobuf format"}, status=400)
+                
+                claimed = decoder.should_decode(header)
+                if claimed is ClaimResult.BUSY:
+                    return _event_busy(JsonResponse({"error": EVENT_BUSY_MESSAGE}, status=409))
+                if not claimed:
+                    return JsonResponse({
+                        "success": True,
+                        "message": "Event o'tkazib yuborildi",
+                        "data_size": len(binary_data),
+                        "event_type": header.event_type or "unknown"
+                    })
+                
                 # Decode qilish
-                decoded_data = decoder.process_webhook_data(binary_data)
+                try:
+                    decoded_data = decoder.process_webhook_data(binary_data, lazy=True)
+                except Exception:
+                    decoder.release(header.event_id)
+                    raise
+                if decoded_data is None:
+                    decoder.release(header.event_id)
+                    return JsonResponse({"error": "Decode qila olmadim"}, status=400)
+                decoder.complete(header.event_id)
                 event_type = decoded_data.get("eventType", "unknown")
             else:
                 # Simple processing without decoder
@@ -128,3 +403,221 @@ def protobuf_webhook_receiver(request):
         except Exception as e:
             logger.error(f"Xato: {e}")
             return JsonResponse({"error": str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+@admission_control
+@instrument_view("receiver_async")
+async def async_protobuf_webhook_receiver(request):
+    """
+    protobuf_webhook_receiver ning ASGI uchun native async varianti
+    """
+    if request.method == "GET":
+        return JsonResponse({
+            "status": "ready",
+            "message": "Async protobuf webhook receiver ishlayapti",
+            "content_type": "application/x-protobuf"
+        })
+    
+    try:
+        binary_data = request.body
+        
+        logger.debug("📨 Async protobuf webhook keldi: %d bytes", len(binary_data))
+        
+        if ProtobufDecoder:
+            decoder = ProtobufDecoder(deduplicator=get_deduplicator())
+            header = decoder.scan_header(binary_data)
+            if header is None:
+                return JsonResponse({"error": "Noto'g'ri protobuf format"}, status=400)
+            
+            claimed = await decoder.should_decode_async(header)
+            if claimed is ClaimResult.BUSY:
+                return _event_busy(JsonResponse({"error": EVENT_BUSY_MESSAGE}, status=409))
+            if not claimed:
+                return JsonResponse({
+                    "success": True,
+                    "message": "Event o'tkazib yuborildi",
+                    "data_size": len(binary_data),
+                    "event_type": header.event_type or "unknown"
+                })
+            
+            try:
+                decoded_data = await decoder.process_webhook_data_async(binary_data)
+            except Exception:
+                await decoder.release_async(header.event_id)
+                raise
+            if decoded_data is None:
+                await decoder.release_async(header.event_id)
+                return JsonResponse({"error": "Decode qila olmadim"}, status=400)
+            await decoder.complete_async(header.event_id)
+            event_type = decoded_data.get("eventType", "unknown")
+        else:
+            event_type = "unknown"
+        
+        return JsonResponse({
+            "success": True,
+            "message": "Ma'lumot muvaffaqiyatli ishlov berildi",
+            "data_size": len(binary_data),
+            "event_type": event_type
+        })
+        
+    except Exception as e:
+        logger.error(f"Xato: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@require_http_methods(["GET"])
+def metrics_view(request):
+    """
+    Barcha worker jarayonlar metrikalari (Prometheus text format)
+    """
+    return HttpResponse(
+        get_metrics().render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@method_decorator(instrument_view("list"), name='get')
+class ProtobufListView(View):
+    """
+    Model qatorlarini varint-length-delimited protobuf stream sifatida
+    qaytaruvchi view (keyset pagination).
+    
+    Query parametrlari: ``limit`` va ``after`` (oldingi javobning
+    ``X-Next-Cursor`` headeri). Qatorlar ``.iterator()`` bilan bo'laklab
+    o'qiladi va message lar kelishi bilan yuboriladi - sahifa ham, javob ham
+    to'liq xotiraga yuklanmaydi. ``X-Next-Cursor`` bo'lmasa - oxirgi sahifa.
+    """
+    
+    mapper = None
+    # Tartiblash kalitlari: indeksga mos, oxirgisi unikal
+    keys = ("id",)
+    
+    def get_queryset(self, request):
+        return self.mapper.model.objects.all()
+    
+    def get(self, request):
+        config = getattr(settings, "LIST_API", {})
+        max_limit = config.get("MAX_LIMIT", 10_000)
+        try:
+            limit = int(request.GET.get("limit", config.get("DEFAULT_LIMIT", 1000)))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= max_limit:
+            return JsonResponse({"error": f"limit 1..{max_limit} oralig'ida bo'lishi kerak"}, status=400)
+        
+        try:
+            queryset = self.get_queryset(request)
+            page, next_cursor = paginate(queryset, self.keys, limit, request.GET.get("after"))
+        except (InvalidCursor, ValidationError) as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        
+        chunk_size = config.get("CHUNK_SIZE", 500)
+        response = StreamingHttpResponse(
+            iter_delimited(self.mapper.iter_messages(page, chunk_size), chunk_size),
+            content_type="application/x-protobuf"
+        )
+        if next_cursor:
+            response["X-Next-Cursor"] = next_cursor
+        return response
+
+
+class StudentListView(ProtobufListView):
+    """Studentlar email bo'yicha (unikal, email_idx)"""
+    
+    mapper = student_mapper
+    keys = ("email",)
+
+
+class VacancyListView(ProtobufListView):
+    """Vakansiyalar sarlavha bo'yicha (title_id_idx)"""
+    
+    mapper = vacancy_mapper
+    keys = ("title", "id")
+
+
+class ApplicationListView(ProtobufListView):
+    """Arizalar id bo'yicha; ``?status=`` filtri status_id_idx dan foydalanadi"""
+    
+    mapper = application_mapper
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        status = request.GET.get("status")
+        if status is not None:
+            if status not in application_mapper.enum_tables["status"]:
+                raise ValidationError(f"Noma'lum status: {status}")
+            queryset = queryset.filter(status=status)
+        return queryset
+
+
+class ApplicationCountListView(ProtobufListView):
+    """
+    Vakansiyalar bo'yicha ariza hisoblagichlari (VacancyApplicationCount).
+    
+    Har bir qator - tayyor hisoblagich, GROUP BY bajarilmaydi;
+    ``?vacancy_id=1&vacancy_id=2`` bilan kerakli vakansiyalar tanlanadi.
+    """
+    
+    mapper = application_count_mapper
+    keys = ("vacancy_id", "status")
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        vacancy_ids = request.GET.getlist("vacancy_id")
+        if vacancy_ids:
+            try:
+                queryset = queryset.filter(vacancy_id__in=[int(value) for value in vacancy_ids])
+            except ValueError:
+                raise ValidationError("vacancy_id butun son bo'lishi kerak")
+        return queryset
+
+
+@method_decorator(instrument_view("entity"), name='get')
+class ProtobufEntityView(View):
+    """
+    Yozuvlarni pk bo'yicha protobuf baytlari sifatida qaytaruvchi view
+    (apps/core/cache.py dagi read-through kesh orqali).
+    
+    ``<pk>/`` - bitta message; ``?id=1&id=2`` - so'ralgan tartibdagi
+    varint-length-delimited stream (topilmaganlari tushib qoladi).
+    """
+    
+    mapper = None
+    
+    def load(self, pks):
+        cache = get_entity_cache(self.mapper.model)
+        if cache is not None:
+            return cache.get_many(pks)
+        queryset = self.mapper.model.objects.filter(pk__in=pks)
+        return {message.id: message.SerializeToString() for message in self.mapper.iter_messages(queryset)}
+    
+    def get(self, request, pk=None):
+        if pk is not None:
+            data = self.load([pk]).get(pk)
+            if data is None:
+                return JsonResponse({"error": "Topilmadi"}, status=404)
+            return HttpResponse(data, content_type="application/x-protobuf")
+        
+        max_ids = getattr(settings, "LIST_API", {}).get("MAX_LIMIT", 10_000)
+        try:
+            pks = [int(value) for value in request.GET.getlist("id")]
+        except ValueError:
+            return JsonResponse({"error": "id butun son bo'lishi kerak"}, status=400)
+        if not 1 <= len(pks) <= max_ids:
+            return JsonResponse({"error": f"1..{max_ids} ta id berilishi kerak"}, status=400)
+        
+        found = self.load(pks)
+        return HttpResponse(
+            b"".join(encode_varint(len(found[pk])) + found[pk] for pk in pks if pk in found),
+            content_type="application/x-protobuf"
+        )
+
+
+class StudentEntityView(ProtobufEntityView):
+    mapper = student_mapper
+
+
+class VacancyEntityView(ProtobufEntityView):
+    mapper = vacancy_mapper
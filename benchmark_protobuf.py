@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Protobuf decode/serializatsiya benchmarklari
+
+Ishlatish:
+    python benchmark_protobuf.py                    # barcha benchmarklar
+    python benchmark_protobuf.py --filter order     # nomida "order" borlari
+    python benchmark_protobuf.py --save main        # natijani baseline sifatida saqlash
+    python benchmark_protobuf.py --compare main     # baseline bilan solishtirish
+                                                    # (regressiya bo'lsa exit code 1)
+
+Har bir benchmark uchun ops/sec, p50/p99 kechikish va bitta operatsiya
+uchun ajratilgan xotira (tracemalloc, alohida o'tishda) hisoblanadi.
+Eslatma: upb (C) backend ichidagi ajratmalar tracemalloc ga ko'rinmaydi -
+faqat Python obyektlari hisoblanadi.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Django loyihasini Python path ga qo'shish
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+BASELINE_DIR = project_root / "benchmarks" / "baselines"
+ORDER_ITEM_COUNTS = [1, 10, 100, 1000, 10000]
+DEFAULT_THRESHOLD = 0.10
+
+
+def build_payload(kind: str, items: int = 1):
+    """Deterministik WebhookData yaratadi (har safar bir xil baytlar)"""
+    from apps.core.dtos.platform.v1.data_exchange_pb2 import OrderStatus, WebhookData
+
+    webhook_data = WebhookData(event_id=f"bench_{kind}_{items}")
+    webhook_data.timestamp.FromSeconds(1_700_000_000)
+    if kind == "user":
+        webhook_data.event_type = "user_created"
+        user = webhook_data.user_data
+        user.id = 1001
+        user.name = "Alisher Navoi"
+        user.email = "user1001@example.uz"
+        user.age = 35
+        user.is_active = True
+        user.created_at.FromSeconds(1_700_000_000)
+    elif kind == "product":
+        webhook_data.event_type = "product_updated"
+        product = webhook_data.product_data
+        product.id = 42
+        product.name = "Noutbuk"
+        product.description = "Professional ish uchun"
+        product.price = 1500.0
+        product.category = "Texnologiya"
+        product.quantity = 7
+        product.created_at.FromSeconds(1_700_000_000)
+    elif kind == "order":
+        webhook_data.event_type = "order_placed"
+        order = webhook_data.order_data
+        order.id = 50000
+        order.user_id = 1001
+        for i in range(items):
+            item = order.items.add()
+            item.product_id = i
+            item.product_name = f"Product_{i}"
+            item.quantity = i % 10 + 1
+            item.unit_price = 10.5
+            item.total_price = item.quantity * 10.5
+        order.total_amount = sum(item.total_price for item in order.items)
+        order.status = OrderStatus.ORDER_STATUS_CONFIRMED
+        order.created_at.FromSeconds(1_700_000_000)
+    else:
+        raise ValueError(f"Noma'lum payload turi: {kind}")
+    return webhook_data
+
+
+def payload_cases() -> Dict[str, object]:
+    """Benchmark qilinadigan payloadlar: nom -> WebhookData"""
+    cases = {"user": build_payload("user"), "product": build_payload("product")}
+    for items in ORDER_ITEM_COUNTS:
+        cases[f"order_{items}"] = build_payload("order", items)
+    return cases
+
+
+def iterations_for(size: int, budget: int) -> int:
+    """Katta payloadlar uchun iteratsiyalar sonini kamaytiradi"""
+    return max(5, min(budget, budget * 200 // max(size, 1)))
+
+
+def build_benchmarks(budget: int) -> Dict[str, tuple]:
+    """
+    Benchmarklar ro'yxati: nom -> (funksiya, iteratsiyalar soni)
+    """
+    import django
+    django.setup()
+
+    from django.test import Client, override_settings
+    from protobuf_decoder import ProtobufDecoder
+    from protobuf_handlers import HandlerRegistry
+
+    # Benchmark natijasiga handlerlar, dedup va admission control ta'sir
+    # qilmasligi kerak (bir xil event_id bitta manbadan qayta-qayta yuboriladi).
+    # Offload ham o'chiriladi: aks holda katta payloadli view benchmarklari
+    # decode ni emas, jarayonlararo uzatishni o'lchaydi va decode/* bilan
+    # solishtirib bo'lmaydi
+    override_settings(
+        WEBHOOK_DEDUP={"ENABLED": False},
+        WEBHOOK_ADMISSION={"ENABLED": False},
+        WEBHOOK_OFFLOAD={"ENABLED": False},
+    ).enable()
+    decoder = ProtobufDecoder(registry=HandlerRegistry())
+    client = Client(SERVER_NAME="localhost")
+    benchmarks = {}
+
+    for name, webhook_data in payload_cases().items():
+        binary_data = webhook_data.SerializeToString()
+        iterations = iterations_for(len(binary_data), budget)
+
+        benchmarks[f"decode/{name}"] = (lambda b=binary_data: decoder.decode_webhook_data(b), iterations)
+        benchmarks[f"to_dict/{name}"] = (lambda m=webhook_data: decoder.protobuf_to_dict(m), iterations)
+        benchmarks[f"to_json/{name}"] = (lambda m=webhook_data: decoder.protobuf_to_json(m), iterations)
+
+        def post(b=binary_data):
+            response = client.post("/webhook/protobuf/", data=b, content_type="application/x-protobuf")
+            assert response.status_code == 200, response.status_code
+
+        benchmarks[f"view/{name}"] = (post, iterations)
+
+    benchmarks["create_response"] = (
+        lambda: decoder.create_response(True, "Muvaffaqiyatli qabul qilindi"), budget
+    )
+    return benchmarks
+
+
+def measure(func: Callable[[], object], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    Funksiyani o'lchaydi
+
+    Returns:
+        ops_per_sec, p50_us, p99_us, alloc_bytes_per_op
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            started = time.perf_counter_ns()
+            func()
+            timings.append(time.perf_counter_ns() - started)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # Xotira - alohida o'tishda, chunki tracemalloc vaqtni buzadi. Peak har
+    # bir chaqiruv uchun alohida o'lchanadi: chaqiruvlar orasida bo'shatilgan
+    # vaqtinchalik obyektlar umumiy peak da yig'ilmaydi
+    alloc_iterations = min(iterations, 50)
+    allocated = 0
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            allocated += max(0, peak - before)
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    total_seconds = sum(timings) / 1e9
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / total_seconds if total_seconds else float("inf"),
+        "p50_us": statistics.median(timings) / 1000,
+        "p99_us": timings[min(len(timings) - 1, int(len(timings) * 0.99))] / 1000,
+        "alloc_bytes_per_op": allocated / alloc_iterations,
+    }
+
+
+def run(name_filter: Optional[str] = None, budget: int = 2000) -> Dict[str, Dict[str, float]]:
+    """Benchmarklarni ishga tushiradi va natijalarni qaytaradi"""
+    import logging
+    # Log I/O natijalarni buzmasligi uchun
+    logging.disable(logging.WARNING)
+
+    results = {}
+    for name, (func, iterations) in build_benchmarks(budget).items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(func, iterations)
+        print(format_row(name, results[name]))
+    return results
+
+
+def format_row(name: str, result: Dict[str, float]) -> str:
+    return (
+        f"{name:<24} {result['ops_per_sec']:>12,.0f} ops/s"
+        f"  p50 {result['p50_us']:>10,.1f}us  p99 {result['p99_us']:>10,.1f}us"
+        f"  {result['alloc_bytes_per_op']:>12,.0f} B/op"
+    )
+
+
+def save_baseline(name: str, results: Dict[str, Dict[str, float]]) -> Path:
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINE_DIR / f"{name}.json"
+    payload = {
+        "python": sys.version.split()[0],
+        "machine": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def load_baseline(name: str) -> Dict[str, Dict[str, float]]:
+    return json.loads((BASELINE_DIR / f"{name}.json").read_text())["results"]
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """
+    Natijalarni baseline bilan solishtiradi
+
+    Returns:
+        Regressiyalar ro'yxati (ops/sec threshold dan ko'proq tushgan yoki
+        p99 threshold dan ko'proq oshgan benchmarklar)
+    """
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        speed = result["ops_per_sec"] / old["ops_per_sec"] - 1
+        tail = result["p99_us"] / old["p99_us"] - 1 if old["p99_us"] else 0.0
+        marker = ""
+        if speed < -threshold or tail > threshold:
+            marker = "  ❌ REGRESSIYA"
+            regressions.append(name)
+        print(f"{name:<24} ops/s {speed:+7.1%}  p99 {tail:+7.1%}{marker}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Protobuf benchmarklari")
+    parser.add_argument("--filter", help="Faqat nomida shu matn bor benchmarklar")
+    parser.add_argument("--budget", type=int, default=2000, help="Kichik payloadlar uchun iteratsiyalar soni")
+    parser.add_argument("--save", metavar="NAME", help="Natijani baseline sifatida saqlash")
+    parser.add_argument("--compare", metavar="NAME", help="Baseline bilan solishtirish")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Ruxsat etilgan sekinlashish (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    print("🚀 Protobuf benchmark boshlandi\n")
+    results = run(args.filter, args.budget)
+
+    if args.save:
+        print(f"\n💾 Baseline saqlandi: {save_baseline(args.save, results)}")
+
+    if args.compare:
+        print(f"\n📊 '{args.compare}' baseline bilan solishtirish (threshold {args.threshold:.0%}):")
+        regressions = compare(results, load_baseline(args.compare), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} ta regressiya topildi")
+            return 1
+        print("\n✅ Regressiya yo'q")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
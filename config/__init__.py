@@ -0,0 +1,4 @@
+# Django ishga tushganda Celery ilovasi ham yuklanadi (shared_task lar unga bog'lanadi)
+from .celery import app as celery_app
+
+__all__ = ("celery_app",)
@@ -0,0 +1,17 @@
+"""
+Celery ilovasi (domain eventlarini worker jarayonlarga tarqatish uchun).
+
+Broker ``CELERY_BROKER_URL`` orqali tanlanadi: production da Redis, testlarda
+Celery ning ``memory://`` (yoki ``filesystem://``) transporti::
+
+    celery -A config worker -Q events -l info
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+app = Celery("config")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
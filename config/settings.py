@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -122,3 +123,151 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Webhook dedup (event_id bo'yicha idempotency)
+# SHARED_PATH - worker jarayonlari bo'lishadigan SQLite fayl (None - faqat jarayon ichida)
+
+WEBHOOK_DEDUP = {
+    "ENABLED": True,
+    "MAX_SIZE": 100_000,
+    "TTL_SECONDS": 24 * 60 * 60,
+    # Ishlanayotgan (processing) claim muddati: worker ishlov berish paytida
+    # o'lib qolsa, event shundan keyin boshqa worker da qayta ishlanadi
+    "PROCESSING_TIMEOUT": 60,
+    "SHARED_PATH": BASE_DIR / "webhook_dedup.sqlite3",
+}
+
+
+# Webhook event logging: har bir event uchun bitta yozuv, event turi bo'yicha
+# "N tadan 1 tasi" sampling ("default" - qolgan barcha turlar uchun)
+
+WEBHOOK_LOGGING = {
+    "LEVEL": "INFO",
+    "SAMPLE_RATES": {
+        "default": 1,
+    },
+}
+
+
+# Og'ir eventlarni (katta payload yoki ko'p Order.items) alohida jarayonlarda
+# ishlov berish - worker ichidagi boshqa so'rovlar GIL da kutib qolmasligi uchun
+
+WEBHOOK_OFFLOAD = {
+    "ENABLED": True,
+    "MAX_WORKERS": 2,
+    "SIZE_THRESHOLD": 512 * 1024,
+    "ITEM_THRESHOLD": 2000,
+}
+
+
+# Webhook admission control: jarayon bo'yicha bir vaqtdagi so'rovlar limiti,
+# X-Event-Source bo'yicha token bucket va cheklangan navbat (to'lsa - 429)
+
+WEBHOOK_ADMISSION = {
+    "ENABLED": True,
+    "MAX_IN_FLIGHT": 32,
+    "MAX_QUEUE": 64,
+    "QUEUE_TIMEOUT": 2.0,
+    "SOURCE_RATE": 200,
+    "SOURCE_BURST": 400,
+    "SOURCES": {},
+}
+
+
+# Webhook metrikalari (/metrics/ - Prometheus text format). Har bir jarayon
+# MULTIPROCESS_DIR ga o'z faylini yozadi, endpoint ularni qo'shib chiqaradi
+
+WEBHOOK_METRICS = {
+    "MULTIPROCESS_DIR": BASE_DIR / "webhook_metrics",
+    "FLUSH_INTERVAL": 5.0,
+}
+
+
+# Domain event feed (gRPC EventFeed.Subscribe): xotirada saqlanadigan eventlar,
+# subscriber uchun tasdiqlanmagan eventlar limiti va batch hajmi
+
+EVENT_FEED = {
+    "RETENTION": 100_000,
+    "MAX_IN_FLIGHT": 1000,
+    "MAX_BATCH_SIZE": 100,
+    # Subscriber offsetlari EVENT_LOG yoniga shu oraliqda (sekund) saqlanadi
+    "OFFSETS_FLUSH_INTERVAL": 1.0,
+}
+
+
+# Transactional outbox relay (run_grpc_server ichida ishlaydi): bir
+# tranzaksiyada yuboriladigan eventlar va boshqa jarayonlar uchun poll oralig'i.
+# Deploymentda bitta relay bo'ladi - u EventFeed ga ham, EVENT_FANOUT ga ham
+# yuboradi (run_outbox_relay - faqat gRPC serversiz, fan-out uchun)
+
+EVENT_OUTBOX = {
+    "BATCH_SIZE": 500,
+    "POLL_INTERVAL": 0.5,
+    # Relay yuborish paytida o'lsa, band qilingan qatorlar shundan keyin qayta olinadi
+    "CLAIM_TIMEOUT": 60,
+}
+
+
+# Celery: domain eventlarini sinklarga yetkazish (apps/core/tasks.py).
+# Testlarda CELERY_BROKER_URL=memory:// ishlatiladi
+
+CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_TASK_SERIALIZER = "json"
+CELERY_ACCEPT_CONTENT = ["json"]
+CELERY_TASK_IGNORE_RESULT = True
+# Worker yiqilsa task qayta beriladi (at-least-once)
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_ROUTES = {"core.deliver_events": {"queue": "events"}}
+# Vakansiya ariza hisoblagichlarini davriy tekshirish (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-application-counts": {
+        "task": "core.reconcile_application_counts",
+        "schedule": 60 * 60,
+    },
+}
+
+
+# Outbox dan Celery ga fan-out: bitta task ga ko'pi bilan MAX_BATCH_SIZE ta
+# event; relay uyg'otilgach yana eventlar yig'ilishi uchun MAX_DELAY_MS kutadi
+
+EVENT_FANOUT = {
+    "ENABLED": False,
+    "MAX_BATCH_SIZE": 100,
+    "MAX_DELAY_MS": 50,
+}
+
+
+# Domain eventlarining disk dagi append-only logi (replay va feed uchun
+# xotiradan chiqqan offsetlar). DIRECTORY None - o'chirilgan
+
+EVENT_LOG = {
+    "DIRECTORY": BASE_DIR / "event_log",
+    "SEGMENT_BYTES": 64 * 1024 * 1024,
+    "INDEX_INTERVAL_BYTES": 4096,
+    "RETENTION_SEGMENTS": 32,
+    "RETENTION_SECONDS": 7 * 24 * 3600,
+    "FSYNC": False,
+}
+
+
+# Protobuf list endpointlari (api/students/ va h.k.): keyset pagination,
+# sahifa hajmi (limit) va stream bo'laklari
+
+LIST_API = {
+    "DEFAULT_LIMIT": 1000,
+    "MAX_LIMIT": 10_000,
+    "CHUNK_SIZE": 500,
+}
+
+
+# Student/Vacancy protobuf baytlari keshi: CACHES dagi backend + jarayon
+# ichidagi LRU. Boshqa jarayonlar local nusxasi LOCAL_TTL gacha eski qolishi mumkin
+
+ENTITY_CACHE = {
+    "ENABLED": True,
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": 300,
+    "LOCAL_MAX_SIZE": 10_000,
+    "LOCAL_TTL": 5.0,
+}
@@ -17,10 +17,37 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from apps.core.views import ProtobufWebhookView, protobuf_webhook_receiver
+from apps.core.views import (
+    ApplicationCountListView,
+    ApplicationListView,
+    AsyncProtobufWebhookView,
+    ProtobufWebhookBatchView,
+    ProtobufWebhookStreamView,
+    ProtobufWebhookView,
+    StudentEntityView,
+    StudentListView,
+    VacancyEntityView,
+    VacancyListView,
+    async_protobuf_webhook_receiver,
+    metrics_view,
+    protobuf_webhook_receiver,
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("webhook/protobuf/", ProtobufWebhookView.as_view(), name="protobuf_webhook"),
+    path("webhook/protobuf/batch/", ProtobufWebhookBatchView.as_view(), name="protobuf_webhook_batch"),
+    path("webhook/protobuf/stream/", ProtobufWebhookStreamView.as_view(), name="protobuf_webhook_stream"),
+    path("webhook/protobuf/async/", AsyncProtobufWebhookView.as_view(), name="protobuf_webhook_async"),
     path("api/protobuf-receiver/", protobuf_webhook_receiver, name="protobuf_receiver"),
+    path("api/protobuf-receiver/async/", async_protobuf_webhook_receiver, name="protobuf_receiver_async"),
+    path("api/students/", StudentListView.as_view(), name="student_list"),
+    path("api/students/by-id/", StudentEntityView.as_view(), name="student_batch"),
+    path("api/students/<int:pk>/", StudentEntityView.as_view(), name="student_detail"),
+    path("api/vacancies/", VacancyListView.as_view(), name="vacancy_list"),
+    path("api/vacancies/by-id/", VacancyEntityView.as_view(), name="vacancy_batch"),
+    path("api/vacancies/<int:pk>/", VacancyEntityView.as_view(), name="vacancy_detail"),
+    path("api/applications/", ApplicationListView.as_view(), name="application_list"),
+    path("api/application-counts/", ApplicationCountListView.as_view(), name="application_count_list"),
+    path("metrics/", metrics_view, name="metrics"),
 ]
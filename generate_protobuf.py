@@ -3,9 +3,32 @@
 Protobuf fayllarini Python kodiga o'tkazish uchun script
 """
 import os
+import re
 import subprocess
 import sys
 
+# protoc "from platform.v1 import ..." deb yozadi, lekin "platform" standart
+# kutubxona moduli bilan to'qnashadi - shuning uchun to'liq yo'lga almashtiramiz
+IMPORT_PATTERN = re.compile(r"^from platform\.v1 import ", re.MULTILINE)
+IMPORT_REPLACEMENT = "from apps.core.dtos.platform.v1 import "
+
+
+def fix_generated_imports(output_dir):
+    """Generate qilingan fayllardagi importlarni tuzatadi"""
+    for root, dirs, files in os.walk(output_dir):
+        for file in files:
+            if not file.endswith(('_pb2.py', '_pb2_grpc.py')):
+                continue
+            path = os.path.join(root, file)
+            with open(path) as f:
+                content = f.read()
+            fixed = IMPORT_PATTERN.sub(IMPORT_REPLACEMENT, content)
+            if fixed != content:
+                with open(path, 'w') as f:
+                    f.write(fixed)
+                print(f"🔧 Importlar tuzatildi: {path}")
+
+
 def generate_protobuf_files():
     """Proto fayllarini Python kodiga o'tkazadi"""
     
@@ -51,6 +74,8 @@ def generate_protobuf_files():
             print(f"Xato matni: {e.stderr}")
             return False
     
+    fix_generated_imports(output_dir)
+    
     print("🎉 Barcha proto fayllar muvaffaqiyatli compile qilindi!")
     return True
 
@@ -0,0 +1,327 @@
+"""
+Webhook endpointlari uchun admission control.
+
+Bir vaqtda ishlanayotgan so'rovlar soni global chegara bilan cheklanadi.
+Har bir manba (``X-Event-Source`` sarlavhasi) uchun alohida token bucket
+bor, shuning uchun bitta producer ning burst i boshqalarga ta'sir qilmaydi.
+Bo'sh joy bo'lmasa so'rov cheklangan navbatda kutadi; navbat manbalar
+bo'yicha navbatma-navbat (round-robin) bo'shatiladi. Navbat to'lgan, kutish
+vaqti tugagan yoki manba limitdan oshgan bo'lsa - ``429`` va ``Retry-After``::
+
+    WEBHOOK_ADMISSION = {
+        "ENABLED": True,
+        "MAX_IN_FLIGHT": 32,      # jarayon bo'yicha bir vaqtdagi so'rovlar
+        "MAX_QUEUE": 64,          # kutayotgan so'rovlar
+        "QUEUE_TIMEOUT": 2.0,     # navbatda kutish (sekund)
+        "SOURCE_RATE": 200,       # manba uchun so'rov/sekund
+        "SOURCE_BURST": 400,
+        "SOURCES": {"protobuf-learning-project": {"RATE": 50, "BURST": 100}},
+    }
+
+Sinxron va async viewlar bitta controller ni bo'lishadi (ASGI da sinxron
+viewlar thread larda ishlaydi).
+"""
+import asyncio
+import functools
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction
+from django.http import JsonResponse
+
+from protobuf_metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+SOURCE_HEADER = "X-Event-Source"
+# Sarlavhasiz so'rovlar bitta umumiy bucket ni bo'lishadi
+UNKNOWN_SOURCE = "-"
+
+DEFAULT_MAX_IN_FLIGHT = 32
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_QUEUE_TIMEOUT = 2.0
+DEFAULT_SOURCE_RATE = 200.0
+DEFAULT_SOURCE_BURST = 400.0
+DEFAULT_RETRY_AFTER = 1.0
+# Manba nomi tashqaridan keladi - bucketlar soni cheklanadi
+MAX_TRACKED_SOURCES = 10_000
+
+
+class TokenBucket:
+    """Sekundiga ``rate`` ta, eng ko'pi ``burst`` ta token"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Bitta token oladi
+
+        Returns:
+            0 - token olindi, aks holda keyingi token uchun kutish (sekund)
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else DEFAULT_RETRY_AFTER
+
+
+class _Waiter:
+    """Navbatdagi so'rov: slot berilganda uyg'otiladi (thread yoki event loop)"""
+
+    __slots__ = ("source", "granted", "_event", "_future", "_loop")
+
+    def __init__(self, source: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.source = source
+        self.granted = False
+        self._loop = loop
+        if loop is None:
+            self._event = threading.Event()
+            self._future = None
+        else:
+            self._event = None
+            self._future = loop.create_future()
+
+    def wake(self) -> None:
+        if self._loop is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self._future.done():
+            self._future.set_result(None)
+
+    def wait(self, timeout: float) -> None:
+        self._event.wait(timeout)
+
+    async def wait_async(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(asyncio.shield(self._future), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class AdmissionController:
+    """Global in-flight limit, manba bo'yicha token bucket va adolatli navbat"""
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+        source_rate: float = DEFAULT_SOURCE_RATE,
+        source_burst: float = DEFAULT_SOURCE_BURST,
+        sources: Optional[Dict[str, Dict[str, float]]] = None,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.source_rate = source_rate
+        self.source_burst = source_burst
+        self.source_limits = {
+            name: (limits.get("RATE", source_rate), limits.get("BURST", source_burst))
+            for name, limits in (sources or {}).items()
+        }
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        # manba -> kutayotganlar; manbalar round-robin tartibida aylanadi
+        self._waiters: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, source: str) -> TokenBucket:
+        bucket = self._buckets.get(source)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_SOURCES:
+                self._buckets.popitem(last=False)
+            rate, burst = self.source_limits.get(source, (self.source_rate, self.source_burst))
+            bucket = self._buckets[source] = TokenBucket(rate, burst)
+        else:
+            self._buckets.move_to_end(source)
+        return bucket
+
+    def _try_admit(self, source: str, loop=None) -> Tuple[Optional[float], Optional[_Waiter]]:
+        """
+        Lock ichida: (retry_after, None) - rad etildi, (None, None) - darhol
+        qabul qilindi, (None, waiter) - navbatga qo'yildi
+        """
+        retry_after = self._bucket(source).take()
+        if retry_after:
+            self.rejected += 1
+            return retry_after, None
+        if self.in_flight < self.max_in_flight:
+            self.in_flight += 1
+            return None, None
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            return DEFAULT_RETRY_AFTER, None
+        waiter = _Waiter(source, loop)
+        self._waiters.setdefault(source, deque()).append(waiter)
+        self.queued += 1
+        return None, waiter
+
+    def _abandon(self, waiter: _Waiter) -> Optional[float]:
+        """Kutish tugadi: slot berilgan bo'lsa None, aks holda navbatdan chiqaradi"""
+        with self._lock:
+            if waiter.granted:
+                return None
+            queue = self._waiters.get(waiter.source)
+            if queue is not None:
+                queue.remove(waiter)
+                if not queue:
+                    del self._waiters[waiter.source]
+            self.queued -= 1
+            self.rejected += 1
+        return max(self.queue_timeout, DEFAULT_RETRY_AFTER)
+
+    def acquire(self, source: str) -> Optional[float]:
+        """
+        So'rov uchun slot oladi (kerak bo'lsa navbatda kutadi)
+
+        Returns:
+            None - qabul qilindi (keyin release() chaqirilishi shart),
+            aks holda Retry-After (sekund)
+        """
+        with self._lock:
+            retry_after, waiter = self._try_admit(source)
+        if waiter is None:
+            return retry_after
+        waiter.wait(self.queue_timeout)
+        return self._abandon(waiter)
+
+    async def acquire_async(self, source: str) -> Optional[float]:
+        """acquire ning async varianti - navbatda thread band qilinmaydi"""
+        with self._lock:
+            retry_after, waiter = self._try_admit(source, asyncio.get_running_loop())
+        if waiter is None:
+            return retry_after
+        try:
+            await waiter.wait_async(self.queue_timeout)
+        except asyncio.CancelledError:
+            # Mijoz uzildi - agar slot berilgan bo'lsa, uni qaytaramiz
+            if self._abandon(waiter) is None:
+                self.release()
+            raise
+        return self._abandon(waiter)
+
+    def release(self) -> None:
+        """Slotni navbatdagi keyingi manbaga beradi yoki bo'shatadi"""
+        with self._lock:
+            if not self._waiters:
+                self.in_flight -= 1
+                return
+            source, queue = next(iter(self._waiters.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._waiters.move_to_end(source)
+            else:
+                del self._waiters[source]
+            self.queued -= 1
+            waiter.granted = True
+        waiter.wake()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": self.in_flight, "queued": self.queued, "rejected": self.rejected}
+
+
+def _too_many_requests(source: str, retry_after: float) -> JsonResponse:
+    logger.warning("🚦 So'rov rad etildi (manba: %s), Retry-After %.1fs", source, retry_after)
+    get_metrics().inc("webhook_admission_rejected_total", source)
+    response = JsonResponse({"error": "Server band, keyinroq qayta yuboring"}, status=429)
+    response["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def admission_control(view: Callable) -> Callable:
+    """
+    View ni admission control bilan o'raydi (sinxron va async viewlar uchun).
+    Faqat POST so'rovlar cheklanadi. Eng tashqi dekorator bo'lishi kerak:
+    rad etilgan so'rov body si o'qilmaydi.
+    """
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            controller = get_admission_controller()
+            if controller is None or request.method != "POST":
+                return await view(request, *args, **kwargs)
+            source = request.headers.get(SOURCE_HEADER) or UNKNOWN_SOURCE
+            retry_after = await controller.acquire_async(source)
+            if retry_after is not None:
+                return _too_many_requests(source, retry_after)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                controller.release()
+
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        controller = get_admission_controller()
+        if controller is None or request.method != "POST":
+            return view(request, *args, **kwargs)
+        source = request.headers.get(SOURCE_HEADER) or UNKNOWN_SOURCE
+        retry_after = controller.acquire(source)
+        if retry_after is not None:
+            return _too_many_requests(source, retry_after)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            controller.release()
+
+    return wrapper
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """
+    settings.WEBHOOK_ADMISSION asosida jarayon bo'yicha yagona controller
+
+    Returns:
+        AdmissionController yoki None (agar o'chirilgan bo'lsa)
+    """
+    global _controller
+    if _controller is not None:
+        return _controller
+
+    from django.conf import settings
+
+    config = getattr(settings, "WEBHOOK_ADMISSION", {})
+    if not config.get("ENABLED", False):
+        return None
+
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController(
+                max_in_flight=config.get("MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT),
+                max_queue=config.get("MAX_QUEUE", DEFAULT_MAX_QUEUE),
+                queue_timeout=config.get("QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT),
+                source_rate=config.get("SOURCE_RATE", DEFAULT_SOURCE_RATE),
+                source_burst=config.get("SOURCE_BURST", DEFAULT_SOURCE_BURST),
+                sources=config.get("SOURCES"),
+            )
+    return _controller
+
+
+def reset_admission_controller(**kwargs) -> None:
+    """Sozlamalar o'zgarganda controller qayta yaratilishi uchun"""
+    global _controller
+    if kwargs.get("setting", "WEBHOOK_ADMISSION") == "WEBHOOK_ADMISSION":
+        _controller = None
@@ -0,0 +1,226 @@
+"""
+Serializatsiya qilingan entity protobuf lari uchun read-through kesh.
+
+Ikki qatlam:
+
+* jarayon ichidagi LRU (qisqa TTL) - takroriy o'qish narxi bitta dict
+  qidiruvi;
+* Django cache backend (masalan Redis) - jarayonlar bo'lishadigan qatlam.
+
+Ikkalasida ham message ning tayyor baytlari saqlanadi, shuning uchun kesh
+hitida na SQL so'rov, na serializatsiya bo'ladi. Topilmagan pk lar bitta
+``pk__in`` so'rovi bilan o'qiladi (``get_many``).
+
+Yozuv o'zgarganda ``invalidate()`` local qatlamdan o'chiradi va shared
+qatlamda pk ning versiya tokenini yangilaydi. Shared yozuv o'zi o'qilgan
+paytdagi versiya bilan saqlanadi va faqat versiya mos kelsa ishlatiladi:
+bazadan eski qatorni o'qigan so'rov keshni ``invalidate()`` dan keyin
+to'ldirsa ham, bu yozuv keyingi o'qishda e'tiborsiz qoladi (``TIMEOUT``
+davomida eski baytlar qaytmaydi). Boshqa jarayonlarning local qatlami
+faqat ``LOCAL_TTL`` o'tgach yangilanadi - shu sababli u qisqa bo'lishi
+kerak. Kalitda message sxemasi hash i bor: proto o'zgarsa eski baytlar
+o'qilmaydi.
+"""
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+
+from protobuf_mapper import ModelMapper
+
+DEFAULT_TIMEOUT = 300
+DEFAULT_LOCAL_MAX_SIZE = 10_000
+DEFAULT_LOCAL_TTL = 5.0
+
+
+class LocalLRU:
+    """Jarayon ichidagi cheklangan, TTL li LRU (kalit -> baytlar)"""
+
+    def __init__(self, max_size: int = DEFAULT_LOCAL_MAX_SIZE, ttl_seconds: float = DEFAULT_LOCAL_TTL):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[object, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[1] < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def set_many(self, items: Dict[object, bytes]) -> None:
+        if not self.max_size:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for key, data in items.items():
+                self._items[key] = (data, expires_at)
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def discard(self, key) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+class MessageCache:
+    """Bitta model uchun pk -> serializatsiya qilingan message kesh"""
+
+    def __init__(
+        self,
+        mapper: ModelMapper,
+        cache_alias: str = "default",
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        local_max_size: int = DEFAULT_LOCAL_MAX_SIZE,
+        local_ttl: float = DEFAULT_LOCAL_TTL,
+        metrics=None,
+    ):
+        """
+        Args:
+            mapper: Model va message juftligi
+            cache_alias: settings.CACHES dagi backend
+            timeout: Shared qatlamdagi yozuv muddati (soniya)
+            local_max_size: Local LRU hajmi (0 - local qatlam o'chirilgan)
+            local_ttl: Local yozuv muddati (soniya)
+            metrics: MetricsRegistry qaytaruvchi funksiya (hit/miss hisoblari
+                uchun, masalan ``get_metrics``)
+        """
+        self.mapper = mapper
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.local = LocalLRU(local_max_size, local_ttl)
+        self.metrics = metrics
+        # Jarayon ichidagi invalidate lar soni: bazadan o'qish paytida
+        # invalidate bo'lsa, o'qilgan baytlar local qatlamga yozilmaydi
+        self._invalidations = 0
+
+        model = mapper.model
+        self.model_label = model._meta.label
+        self._pk_field = mapper.message_fields.get(model._meta.pk.attname)
+        if self._pk_field is None:
+            raise ImproperlyConfigured(f"{mapper.message_class.__name__} da {self.model_label} pk maydoni yo'q")
+        schema = hashlib.blake2b(mapper.message_class.DESCRIPTOR.file.serialized_pb, digest_size=4).hexdigest()
+        self.key_prefix = f"pb:{self.model_label}:{schema}:"
+
+    @property
+    def backend(self):
+        from django.core.cache import caches
+
+        return caches[self.cache_alias]
+
+    def key(self, pk) -> str:
+        return f"{self.key_prefix}{pk}"
+
+    def version_key(self, pk) -> str:
+        return f"{self.key_prefix}v:{pk}"
+
+    @property
+    def version_timeout(self) -> Optional[float]:
+        return None if self.timeout is None else self.timeout * 2
+
+    def get(self, pk) -> Optional[bytes]:
+        """Bitta yozuv baytlari; yozuv bo'lmasa None"""
+        return self.get_many((pk,)).get(pk)
+
+    def get_many(self, pks: Iterable) -> Dict[object, bytes]:
+        """
+        Args:
+            pks: Primary key lar
+
+        Returns:
+            {pk: message baytlari} - bazada yo'q pk lar natijada bo'lmaydi
+        """
+        found: Dict[object, bytes] = {}
+        missing = []
+        for pk in dict.fromkeys(pks):
+            data = self.local.get(pk)
+            if data is None:
+                missing.append(pk)
+            else:
+                found[pk] = data
+        local_hits = len(found)
+        shared_hits = loaded = 0
+
+        if missing:
+            invalidations = self._invalidations
+            keys = {self.key(pk): pk for pk in missing}
+            version_keys = {self.version_key(pk): pk for pk in missing}
+            # Yozuvlar va ularning joriy versiyalari bitta so'rovda
+            values = self.backend.get_many([*keys, *version_keys])
+            versions = {pk: values.get(key) for key, pk in version_keys.items()}
+            shared = {}
+            for key, pk in keys.items():
+                entry = values.get(key)
+                if entry is not None and entry[0] == versions[pk]:
+                    shared[pk] = entry[1]
+            shared_hits = len(shared)
+            found.update(shared)
+            self.local.set_many(shared)
+
+            missing = [pk for pk in missing if pk not in shared]
+            if missing:
+                rows = self._load(missing)
+                loaded = len(rows)
+                found.update(rows)
+                if rows:
+                    # Bazadan oldin o'qilgan versiya bilan: oraliqda invalidate
+                    # bo'lgan bo'lsa, yozuv keyingi o'qishda ishlatilmaydi
+                    self.backend.set_many(
+                        {self.key(pk): (versions[pk], data) for pk, data in rows.items()}, self.timeout
+                    )
+                    if invalidations == self._invalidations:
+                        self.local.set_many(rows)
+
+        self._count(local_hits, shared_hits, loaded)
+        return found
+
+    def _load(self, pks) -> Dict[object, bytes]:
+        """Bazadan bitta so'rov bilan o'qib serializatsiya qiladi"""
+        pk_field = self._pk_field
+        queryset = self.mapper.model._base_manager.filter(pk__in=pks)
+        return {
+            getattr(message, pk_field): message.SerializeToString()
+            for message in self.mapper.iter_messages(queryset)
+        }
+
+    def _count(self, local_hits: int, shared_hits: int, loaded: int) -> None:
+        if self.metrics is None:
+            return
+        metrics = self.metrics()
+        for layer, value in (("local", local_hits), ("shared", shared_hits), ("db", loaded)):
+            if value:
+                metrics.inc("entity_cache_lookups_total", self.model_label, layer, value=value)
+
+    def invalidate(self, pk) -> None:
+        """
+        Yozuvni local qatlamdan o'chiradi va shared versiyasini yangilaydi
+
+        Versiya kaliti yozuvlardan ikki baravar uzoq saqlanadi: invalidate
+        dan keyin eski versiya bilan yozilgan (poygada qolgan) yozuv versiya
+        kalitidan oldin eskiradi. Aks holda kalit eskirgach versiya yana
+        None bo'lib, shu yozuv qayta ishlatilar edi.
+        """
+        self._invalidations += 1
+        self.local.discard(pk)
+        self.backend.set(self.version_key(pk), uuid.uuid4().hex[:12], self.version_timeout)
+        self.backend.delete(self.key(pk))
+
+    def clear_local(self) -> None:
+        self.local.clear()
@@ -1,9 +1,24 @@
+import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Dict, Any, Iterable, Iterator, List, Optional, Union
+from asgiref.sync import sync_to_async
 from google.protobuf.message import Message
 from google.protobuf.json_format import MessageToDict
-from apps.core.dtos.platform.v1.data_exchange_pb2 import WebhookData, WebhookResponse
+from apps.core.dtos.platform.v1.data_exchange_pb2 import (
+    WebhookBatch, WebhookData
+)
+from protobuf_dedup import ClaimResult, EventDeduplicator
+from protobuf_handlers import HandlerRegistry, registry as default_registry
+from protobuf_logging import EventLogger, get_event_logger
+from protobuf_metrics import get_metrics
+from protobuf_offload import ProcessOffloader, WebhookSummary, get_offloader
+from protobuf_response import ItemResult, ResponseEncoder
+from protobuf_scanner import (
+    WebhookHeader, WireFormatError, decode_varint, encode_varint, scan_webhook_header
+)
 
 # Logging sozlamalari
 logging.basicConfig(
@@ -12,12 +27,205 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Stream rejimida bitta event uchun ruxsat etilgan maksimal o'lcham
+MAX_DELIMITED_MESSAGE_SIZE = 4 * 1024 * 1024
+# Stream dan bir martada o'qiladigan bo'lak o'lchami
+STREAM_CHUNK_SIZE = 64 * 1024
+# Async rejimda shundan katta payloadlar event loop ni to'sib qo'ymasligi
+# uchun thread pool da decode qilinadi (kichiklari - joyida, thread hop siz)
+ASYNC_INLINE_DECODE_MAX_SIZE = 256 * 1024
+# Event boshqa worker da hali ishlanayotganda qaytariladigan xabar (qayta yuborish kerak)
+EVENT_BUSY_MESSAGE = "Event hali ishlanmoqda, keyinroq qayta yuboring"
+# Doimiy javob xabarlari - encoder faqat shularning baytlarini keshlaydi
+RESPONSE_MESSAGES = (
+    "Muvaffaqiyatli qabul qilindi",
+    "O'tkazib yuborildi",
+    "Takroriy event",
+    EVENT_BUSY_MESSAGE,
+)
+# Loyiha bo'yicha umumiy encoder
+default_encoder = ResponseEncoder(RESPONSE_MESSAGES)
+
+
+class DelimitedStreamError(WireFormatError):
+    """Length-delimited stream formati buzilganda ko'tariladi"""
+
+
+def encode_delimited(binary_data: bytes) -> bytes:
+    """Binary message oldiga uning uzunligini (varint) qo'shadi"""
+    return encode_varint(len(binary_data)) + binary_data
+
+
+def iter_delimited_messages(
+    stream: BinaryIO,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    max_message_size: int = MAX_DELIMITED_MESSAGE_SIZE,
+) -> Iterator[bytes]:
+    """
+    Varint-length-delimited messagelarni stream dan birma-bir o'qiydi
+    
+    Butun body xotiraga yuklanmaydi: bir vaqtda xotirada ko'pi bilan
+    bitta message va bitta o'qilgan bo'lak turadi.
+    
+    Args:
+        stream: read(n) metodiga ega obyekt (masalan Django request)
+        chunk_size: Bir martada o'qiladigan baytlar soni
+        max_message_size: Bitta message uchun maksimal o'lcham
+        
+    Yields:
+        Har bir message ning binary ma'lumotlari
+    """
+    buffer = bytearray()
+    pos = 0
+    eof = False
+    
+    while True:
+        missing = chunk_size
+        header = decode_varint(buffer, pos)
+        if header is not None:
+            length, start = header
+            if length > max_message_size:
+                raise DelimitedStreamError(f"Message juda katta: {length} bytes")
+            end = start + length
+            if end <= len(buffer):
+                yield bytes(buffer[start:end])
+                pos = end
+                continue
+            # Uzunlik ma'lum - message ning qolgan qismi bir martada o'qiladi
+            missing = max(chunk_size, end - len(buffer))
+        
+        if eof:
+            if pos < len(buffer):
+                raise DelimitedStreamError("Stream message o'rtasida tugadi")
+            return
+        
+        # Yetarli ma'lumot yo'q - ishlatilgan qismni joyida tashlab, buffer ga
+        # qo'shamiz (qisman o'qilgan message har bo'lakda qayta nusxalanmaydi)
+        del buffer[:pos]
+        pos = 0
+        chunk = stream.read(missing)
+        buffer += chunk
+        eof = not chunk
+
+
+class LazyWebhookData:
+    """
+    Parse qilingan WebhookData ustidagi yengil ko'rinish.
+    
+    Sarlavha maydonlari to'g'ridan-to'g'ri message dan o'qiladi; dict va
+    JSON shakllari faqat so'ralganda (bir marta) yaratiladi.
+    """
+    
+    __slots__ = ("message", "_dict")
+    
+    # MessageToDict kalitlari -> message atributlari (dict yaratmasdan o'qish uchun)
+    _HEADER_KEYS = {"eventType": "event_type", "eventId": "event_id"}
+    
+    def __init__(self, message: WebhookData):
+        self.message = message
+        self._dict = None
+    
+    @property
+    def event_type(self) -> str:
+        return self.message.event_type
+    
+    @property
+    def event_id(self) -> str:
+        return self.message.event_id
+    
+    @property
+    def data_case(self) -> Optional[str]:
+        """oneof data ning qaysi maydoni o'rnatilgan ("user_data", ...) yoki None"""
+        return self.message.WhichOneof("data")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """MessageToDict natijasi (birinchi chaqiruvda yaratiladi)"""
+        if self._dict is None:
+            self._dict = ProtobufDecoder.protobuf_to_dict(self.message)
+        return self._dict
+    
+    def to_json(self) -> str:
+        """JSON format string"""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        dict.get bilan mos interfeys: eventType/eventId dict yaratmasdan
+        qaytariladi (MessageToDict kabi bo'sh qiymatlar tashlab ketiladi)
+        """
+        attr = self._HEADER_KEYS.get(key)
+        if attr is not None:
+            return getattr(self, attr) or default
+        return self.to_dict().get(key, default)
+    
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.event_type} {self.event_id}>"
+
+
+class OffloadedWebhookData(LazyWebhookData):
+    """
+    Worker jarayonda ishlangan event uchun LazyWebhookData.
+    
+    Sarlavha maydonlari worker qaytargan WebhookSummary dan o'qiladi;
+    message (va dict/JSON) faqat so'ralganda shu jarayonda parse qilinadi -
+    binary ma'lumot bu yerda bor, shuning uchun worker dan katta natija
+    qaytarilmaydi.
+    """
+    
+    __slots__ = ("summary", "_binary_data", "_message")
+    
+    def __init__(self, summary: WebhookSummary, binary_data: bytes):
+        self.summary = summary
+        self._binary_data = binary_data
+        self._message = None
+        self._dict = None
+    
+    @property
+    def message(self) -> WebhookData:
+        if self._message is None:
+            self._message = WebhookData.FromString(self._binary_data)
+        return self._message
+    
+    @property
+    def event_type(self) -> str:
+        return self.summary.event_type
+    
+    @property
+    def event_id(self) -> str:
+        return self.summary.event_id
+    
+    @property
+    def data_case(self) -> Optional[str]:
+        return self.summary.data_case
+
 
 class ProtobufDecoder:
     """
     Protobuf formatdagi ma'lumotlarni decode qilish uchun klass
     """
     
+    def __init__(
+        self,
+        registry: Optional[HandlerRegistry] = None,
+        deduplicator: Optional[EventDeduplicator] = None,
+        encoder: Optional[ResponseEncoder] = None,
+        event_logger: Optional[EventLogger] = None,
+        offloader: Optional[ProcessOffloader] = None,
+    ):
+        # Event handlerlari - default holatda loyiha bo'yicha umumiy registry
+        self.registry = registry if registry is not None else default_registry
+        # event_id bo'yicha takroriy eventlarni aniqlash (None - o'chirilgan)
+        self.deduplicator = deduplicator
+        # Keshlangan response encoder
+        self.encoder = encoder if encoder is not None else default_encoder
+        # Har bir event uchun sampling qilingan log yozuvi
+        self.event_logger = event_logger if event_logger is not None else get_event_logger()
+        # Og'ir eventlar uchun process pool. Worker jarayonlar umumiy registry
+        # dan foydalanadi, shuning uchun boshqa registry bilan default o'chiq
+        if offloader is None and registry is None:
+            offloader = get_offloader()
+        self.offloader = offloader
+    
     @staticmethod
     def decode_webhook_data(binary_data: bytes) -> Optional[WebhookData]:
         """
@@ -29,12 +237,107 @@ class ProtobufDecoder:
         Returns:
             WebhookData obyekti yoki None (agar decode qila olmasa)
         """
+        started = time.perf_counter()
         try:
             webhook_data = WebhookData()
             webhook_data.ParseFromString(binary_data)
+            get_metrics().observe("webhook_stage_seconds", time.perf_counter() - started, "parse")
             return webhook_data
         except Exception as e:
             logger.error(f"Protobuf decode qilishda xato: {e}")
+            get_metrics().inc("webhook_decode_errors_total", "parse")
+            return None
+    
+    @staticmethod
+    def scan_header(binary_data: bytes) -> Optional[WebhookHeader]:
+        """
+        To'liq parse qilmasdan event_type, event_id, timestamp va oneof
+        maydonini o'qiydi (routing/dedup/rad etish qarorlari uchun)
+        
+        Args:
+            binary_data: WebhookData binary ma'lumotlari
+            
+        Returns:
+            WebhookHeader yoki None (agar wire format buzilgan bo'lsa)
+        """
+        started = time.perf_counter()
+        try:
+            header = scan_webhook_header(binary_data)
+            get_metrics().observe("webhook_stage_seconds", time.perf_counter() - started, "scan")
+            return header
+        except WireFormatError as e:
+            logger.error(f"Wire format xatosi: {e}")
+            get_metrics().inc("webhook_decode_errors_total", "wire_format")
+            return None
+    
+    def should_decode(self, header: WebhookHeader) -> Union[bool, ClaimResult]:
+        """
+        Pre-scan natijasiga qarab event to'liq decode qilinishi kerakmi.
+        Routing va dedup qatlamlari shu metodni qayta belgilaydi.
+        
+        Args:
+            header: scan_header natijasi
+            
+        Returns:
+            Rost qiymat - to'liq decode qilish, aks holda o'tkazib yuborish
+            (ClaimResult.BUSY - event boshqa joyda hali ishlanmoqda, sender
+            qayta yuborishi kerak)
+        """
+        return self.claim(header.event_id)
+    
+    def claim(self, event_id: str) -> ClaimResult:
+        """
+        Event ni ishlash uchun band qiladi (dedup yoqilgan bo'lsa)
+        
+        Returns:
+            CLAIMED - event yangi, DUPLICATE - takroriy event,
+            BUSY - event hali ishlanmoqda
+        """
+        if self.deduplicator is None:
+            return ClaimResult.CLAIMED
+        result = self.deduplicator.claim(event_id)
+        if result is ClaimResult.DUPLICATE:
+            logger.debug("♻️ Takroriy event o'tkazib yuborildi: %s", event_id)
+        elif result is ClaimResult.BUSY:
+            logger.info("⏳ Event hali ishlanmoqda, qayta yuborilishi kerak: %s", event_id)
+        return result
+    
+    def complete(self, event_id: str) -> None:
+        """
+        Ishlov berish muvaffaqiyatli tugagach event ni ishlangan deb
+        belgilaydi - shundan keyingina takroriylari o'tkazib yuboriladi
+        """
+        if self.deduplicator is not None:
+            self.deduplicator.complete(event_id)
+    
+    def release(self, event_id: str) -> None:
+        """
+        Ishlov berish muvaffaqiyatsiz bo'lganda event ni bo'shatadi, shunda
+        qayta yuborilgan event yana ishlanadi
+        """
+        if self.deduplicator is not None:
+            self.deduplicator.release(event_id)
+    
+    @staticmethod
+    def decode_webhook_batch(binary_data: bytes) -> Optional[WebhookBatch]:
+        """
+        Binary formatdagi protobuf ma'lumotlarni WebhookBatch ga o'tkazadi
+        
+        Args:
+            binary_data: Protobuf binary ma'lumotlari
+            
+        Returns:
+            WebhookBatch obyekti yoki None (agar decode qila olmasa)
+        """
+        started = time.perf_counter()
+        try:
+            batch = WebhookBatch()
+            batch.ParseFromString(binary_data)
+            get_metrics().observe("webhook_stage_seconds", time.perf_counter() - started, "parse")
+            return batch
+        except Exception as e:
+            logger.error(f"Batch decode qilishda xato: {e}")
+            get_metrics().inc("webhook_decode_errors_total", "batch_parse")
             return None
     
     @staticmethod
@@ -48,8 +351,11 @@ class ProtobufDecoder:
         Returns:
             JSON format string
         """
+        started = time.perf_counter()
         try:
-            return json.dumps(MessageToDict(message), indent=2, ensure_ascii=False)
+            result = json.dumps(MessageToDict(message), indent=2, ensure_ascii=False)
+            get_metrics().observe("webhook_stage_seconds", time.perf_counter() - started, "to_json")
+            return result
         except Exception as e:
             logger.error(f"JSON ga o'tkazishda xato: {e}")
             return "{}"
@@ -65,94 +371,301 @@ class ProtobufDecoder:
         Returns:
             Python dictionary
         """
+        started = time.perf_counter()
         try:
-            return MessageToDict(message)
+            result = MessageToDict(message)
+            get_metrics().observe("webhook_stage_seconds", time.perf_counter() - started, "to_dict")
+            return result
         except Exception as e:
             logger.error(f"Dict ga o'tkazishda xato: {e}")
             return {}
     
-    def process_webhook_data(self, binary_data: bytes) -> Dict[str, Any]:
+    def process_webhook_data(
+        self, binary_data: bytes, lazy: bool = False
+    ) -> Union[Dict[str, Any], LazyWebhookData, None]:
         """
         Webhook ma'lumotlarini to'liq ishlov beradi
         
+        Og'ir eventlar (offloader.should_offload) alohida jarayonda
+        ishlanadi; bu holda lazy=True natijasi OffloadedWebhookData bo'ladi
+        (interfeysi LazyWebhookData bilan bir xil).
+        
         Args:
             binary_data: Protobuf binary ma'lumotlari
+            lazy: True bo'lsa dict o'rniga LazyWebhookData qaytariladi -
+                bitta parse dan boshqa ortiqcha konvertatsiya qilinmaydi
             
         Returns:
-            Ishlov berilgan ma'lumotlar (dict format)
+            Ishlov berilgan ma'lumotlar (dict format), lazy=True bo'lsa
+            LazyWebhookData yoki None (agar decode qila olmasa)
         """
-        logger.info(f"📥 Protobuf ma'lumotlari qabul qilindi: {len(binary_data)} bytes")
+        logger.debug("📥 Protobuf ma'lumotlari qabul qilindi: %d bytes", len(binary_data))
+        
+        if self.offloader is not None and self.offloader.should_offload(binary_data):
+            try:
+                result = self.offloader.submit(binary_data, lazy).result()
+            except BrokenProcessPool as e:
+                self._offload_failed(e)
+            else:
+                return self._offloaded(result, binary_data) if lazy else result
         
         # Binary datani decode qilish
         webhook_data = self.decode_webhook_data(binary_data)
-        if not webhook_data:
+        if webhook_data is None:
             logger.error("❌ Ma'lumotlarni decode qila olmadim!")
-            return {"error": "Decode failed"}
-        
-        # Ma'lumotlarni dict formatga o'tkazish
-        data_dict = self.protobuf_to_dict(webhook_data)
-        
-        # Event typega qarab boshqacha ishlov berish
-        event_type = webhook_data.event_type
-        logger.info(f"📋 Event turi: {event_type}")
-        logger.info(f"🆔 Event ID: {webhook_data.event_id}")
-        
-        # Ma'lumotlarni konsolga chiqarish
-        if webhook_data.HasField("user_data"):
-            self._process_user_data(webhook_data.user_data)
-        elif webhook_data.HasField("product_data"):
-            self._process_product_data(webhook_data.product_data)
-        elif webhook_data.HasField("order_data"):
-            self._process_order_data(webhook_data.order_data)
-        
-        # JSON formatda ham ko'rsatish
-        logger.info(f"📄 JSON format:\\n{self.protobuf_to_json(webhook_data)}")
-        
-        return data_dict
-    
-    def _process_user_data(self, user):
-        """User ma'lumotlarini ishlov beradi"""
-        logger.info("👤 Foydalanuvchi ma'lumotlari:")
-        logger.info(f"  - ID: {user.id}")
-        logger.info(f"  - Ism: {user.name}")
-        logger.info(f"  - Email: {user.email}")
-        logger.info(f"  - Yosh: {user.age}")
-        logger.info(f"  - Faol: {'Ha' if user.is_active else 'Yoq'}")
-        logger.info(f"  - Yaratilgan: {user.created_at.ToDatetime()}")
-    
-    def _process_product_data(self, product):
-        """Product ma'lumotlarini ishlov beradi"""
-        logger.info("🛍️ Mahsulot ma'lumotlari:")
-        logger.info(f"  - ID: {product.id}")
-        logger.info(f"  - Nom: {product.name}")
-        logger.info(f"  - Tavsif: {product.description}")
-        logger.info(f"  - Narx: ${product.price}")
-        logger.info(f"  - Kategoriya: {product.category}")
-        logger.info(f"  - Miqdor: {product.quantity}")
-        logger.info(f"  - Yaratilgan: {product.created_at.ToDatetime()}")
-    
-    def _process_order_data(self, order):
-        """Order ma'lumotlarini ishlov beradi"""
-        logger.info("🛒 Buyurtma ma'lumotlari:")
-        logger.info(f"  - Buyurtma ID: {order.id}")
-        logger.info(f"  - Foydalanuvchi ID: {order.user_id}")
-        logger.info(f"  - Umumiy summa: ${order.total_amount}")
-        
-        # Status ni string formatda ko'rsatish
-        status_names = {
-            0: "Kutilmoqda",
-            1: "Tasdiqlangan",
-            2: "Yuborilgan",
-            3: "Yetkazilgan",
-            4: "Bekor qilingan"
-        }
-        logger.info(f"  - Status: {status_names.get(order.status, 'Nomalum')}")
-        logger.info(f"  - Yaratilgan: {order.created_at.ToDatetime()}")
-        
-        # Buyurtma elementlarini ko'rsatish
-        logger.info(f"  - Elementlar soni: {len(order.items)}")
-        for i, item in enumerate(order.items, 1):
-            logger.info(f"    {i}. {item.product_name} - {item.quantity} x ${item.unit_price} = ${item.total_price}")
+            return None if lazy else {"error": "Decode failed"}
+        
+        view = self.handle_webhook_data(webhook_data)
+        return view if lazy else view.to_dict()
+    
+    def process_webhook_batch(self, binary_data: bytes) -> Optional[List[ItemResult]]:
+        """
+        WebhookBatch ni bitta parse bilan decode qilib, har bir elementni
+        alohida ishlov beradi
+        
+        Args:
+            binary_data: WebhookBatch binary ma'lumotlari
+            
+        Returns:
+            Har bir element uchun ItemResult ro'yxati yoki None
+            (agar batch decode qilinmasa)
+        """
+        logger.debug("📦 Batch qabul qilindi: %d bytes", len(binary_data))
+        
+        batch = self.decode_webhook_batch(binary_data)
+        if batch is None:
+            logger.error("❌ Batch ni decode qila olmadim!")
+            return None
+        
+        results = []
+        for index, webhook_data in enumerate(batch.items):
+            event_id = webhook_data.event_id
+            claimed = self.claim(event_id)
+            if claimed is ClaimResult.BUSY:
+                # Natija hali noma'lum - sender shu elementni qayta yuborishi kerak
+                results.append(ItemResult(index, event_id, False, EVENT_BUSY_MESSAGE))
+                continue
+            if not claimed:
+                # Takroriy event allaqachon ishlangan - sender qayta yubormasligi kerak
+                results.append(ItemResult(index, event_id, True, "Takroriy event"))
+                continue
+            try:
+                self.handle_webhook_data(webhook_data)
+                self.complete(event_id)
+                results.append(ItemResult(index, event_id, True))
+            except Exception as e:
+                # Bitta element xatosi qolganlarini to'xtatmasligi kerak
+                logger.error(f"❌ Batch elementi #{index} ({event_id}) xatosi: {e}")
+                self.release(event_id)
+                results.append(ItemResult(index, event_id, False, str(e)))
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📦 Batch tugadi: %d/%d muvaffaqiyatli", sum(r.success for r in results), len(results))
+        return results
+    
+    def process_webhook_stream(
+        self,
+        stream: BinaryIO,
+        max_reported_failures: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Length-delimited WebhookData stream ini kelishi bilan decode qilib
+        ishlov beradi, body ni to'liq xotiraga yuklamaydi
+        
+        Args:
+            stream: read(n) metodiga ega obyekt (masalan Django request)
+            max_reported_failures: Javobda qaytariladigan xatolar soni chegarasi
+            
+        Returns:
+            {"received": ..., "skipped": takroriy eventlar soni, "failed": ...
+            (hali ishlanayotgan eventlar ham), "failures": [ItemResult],
+            "error": stream formati xatosi yoki None}
+        """
+        return self.process_webhook_messages(iter_delimited_messages(stream), max_reported_failures)
+    
+    def process_webhook_messages(
+        self,
+        messages: Iterable[bytes],
+        max_reported_failures: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        WebhookData binary ma'lumotlari ketma-ketligini birma-bir ishlov
+        beradi (HTTP stream va gRPC client-streaming uchun umumiy)
+        
+        Args:
+            messages: Har bir element - bitta WebhookData binary ma'lumoti;
+                iteratsiya paytida WireFormatError ko'tarilsa, stream
+                formati buzilgan deb hisoblanadi
+            max_reported_failures: Javobda qaytariladigan xatolar soni chegarasi
+            
+        Returns:
+            process_webhook_stream bilan bir xil summary
+        """
+        summary = {"received": 0, "skipped": 0, "failed": 0, "failures": [], "error": None}
+        
+        try:
+            for binary_data in messages:
+                index = summary["received"]
+                summary["received"] += 1
+                
+                # Takroriy eventlar to'liq decode qilinmaydi
+                header = self.scan_header(binary_data)
+                claimed = self.should_decode(header) if header is not None else True
+                if claimed is ClaimResult.BUSY:
+                    # Band qilinmagan - release qilinmaydi, sender qayta yuboradi
+                    summary["failed"] += 1
+                    if len(summary["failures"]) < max_reported_failures:
+                        summary["failures"].append(ItemResult(index, header.event_id, False, EVENT_BUSY_MESSAGE))
+                    continue
+                if not claimed:
+                    summary["skipped"] += 1
+                    continue
+                
+                webhook_data = self.decode_webhook_data(binary_data) if header is not None else None
+                if webhook_data is None:
+                    error = "Decode failed"
+                else:
+                    try:
+                        self.handle_webhook_data(webhook_data)
+                        self.complete(header.event_id)
+                        continue
+                    except Exception as e:
+                        logger.error(f"❌ Stream elementi #{index} ({webhook_data.event_id}) xatosi: {e}")
+                        error = str(e)
+                
+                if header is not None:
+                    self.release(header.event_id)
+                summary["failed"] += 1
+                if len(summary["failures"]) < max_reported_failures:
+                    summary["failures"].append(ItemResult(
+                        index, header.event_id if header is not None else "", False, error
+                    ))
+        except WireFormatError as e:
+            logger.error(f"❌ Stream formati buzilgan ({summary['received']} ta eventdan keyin): {e}")
+            get_metrics().inc("webhook_decode_errors_total", "stream_framing")
+            summary["error"] = str(e)
+        
+        logger.info("🌊 Stream tugadi: %d ta event, %d ta xato", summary["received"], summary["failed"])
+        return summary
+    
+    def handle_webhook_data(self, webhook_data: WebhookData) -> LazyWebhookData:
+        """
+        Decode qilingan WebhookData ni ishlov beradi
+        
+        Args:
+            webhook_data: WebhookData obyekti
+            
+        Returns:
+            Ishlov berilgan ma'lumotlar ustidagi LazyWebhookData
+        """
+        view = LazyWebhookData(webhook_data)
+        
+        # (event_type, oneof maydoni) bo'yicha ro'yxatdan o'tgan handlerlarni chaqirish
+        started = time.perf_counter()
+        handlers = self.registry.dispatch(webhook_data)
+        
+        self._record_handled(view, handlers, time.perf_counter() - started)
+        return view
+    
+    def _record_handled(self, view: LazyWebhookData, handlers: int, elapsed: float) -> None:
+        metrics = get_metrics()
+        metrics.observe("webhook_stage_seconds", elapsed, "handlers")
+        metrics.inc("webhook_events_total", view.event_type, view.data_case or "none")
+        
+        # Har bir event uchun bitta ixcham (sampling qilingan) log yozuvi
+        self.event_logger.log_event(view.message, handlers, elapsed)
+        
+        # JSON formatni faqat debug darajasida, kerak bo'lgandagina yaratamiz
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📄 JSON format:\n%s", view.to_json())
+    
+    @staticmethod
+    def _offloaded(summary: Optional[WebhookSummary], binary_data: bytes) -> Optional[LazyWebhookData]:
+        return OffloadedWebhookData(summary, binary_data) if summary is not None else None
+    
+    def _offload_failed(self, error: Exception) -> None:
+        # Pool qayta yaratiladi, joriy event esa joyida ishlanadi
+        logger.error(f"❌ Offload process pool ishlamadi, event joyida ishlanadi: {error}")
+        self.offloader.shutdown(wait=False)
+    
+    async def should_decode_async(self, header: WebhookHeader) -> Union[bool, ClaimResult]:
+        """
+        should_decode ning async varianti: shared dedup store (SQLite)
+        bo'lsa u thread pool da tekshiriladi, aks holda joyida
+        """
+        if self.deduplicator is None or self.deduplicator.store is None:
+            return self.should_decode(header)
+        return await sync_to_async(self.should_decode, thread_sensitive=False)(header)
+    
+    async def complete_async(self, event_id: str) -> None:
+        """complete ning async varianti"""
+        if self.deduplicator is None or self.deduplicator.store is None:
+            self.complete(event_id)
+        else:
+            await sync_to_async(self.complete, thread_sensitive=False)(event_id)
+    
+    async def release_async(self, event_id: str) -> None:
+        """release ning async varianti"""
+        if self.deduplicator is None or self.deduplicator.store is None:
+            self.release(event_id)
+        else:
+            await sync_to_async(self.release, thread_sensitive=False)(event_id)
+    
+    async def process_webhook_data_async(
+        self, binary_data: bytes
+    ) -> Optional[LazyWebhookData]:
+        """
+        ASGI uchun process_webhook_data(lazy=True) varianti
+        
+        Kichik payloadlar event loop ichida decode qilinadi, katta
+        payloadlar (ASYNC_INLINE_DECODE_MAX_SIZE dan katta) - thread pool da,
+        og'ir eventlar - offloader ning process pool ida.
+        Async handlerlar to'g'ridan-to'g'ri await qilinadi.
+        
+        Args:
+            binary_data: Protobuf binary ma'lumotlari
+            
+        Returns:
+            LazyWebhookData yoki None (agar decode qila olmasa)
+        """
+        logger.debug("📥 Protobuf ma'lumotlari qabul qilindi (async): %d bytes", len(binary_data))
+        
+        if self.offloader is not None and self.offloader.should_offload(binary_data):
+            try:
+                result = await asyncio.wrap_future(self.offloader.submit(binary_data, lazy=True))
+            except BrokenProcessPool as e:
+                self._offload_failed(e)
+            else:
+                return self._offloaded(result, binary_data)
+        
+        if len(binary_data) > ASYNC_INLINE_DECODE_MAX_SIZE:
+            webhook_data = await sync_to_async(self.decode_webhook_data, thread_sensitive=False)(binary_data)
+        else:
+            webhook_data = self.decode_webhook_data(binary_data)
+        if webhook_data is None:
+            logger.error("❌ Ma'lumotlarni decode qila olmadim!")
+            return None
+        
+        return await self.handle_webhook_data_async(webhook_data)
+    
+    async def handle_webhook_data_async(self, webhook_data: WebhookData) -> LazyWebhookData:
+        """
+        handle_webhook_data ning async varianti - handlerlar
+        registry.dispatch_async orqali chaqiriladi
+        
+        Args:
+            webhook_data: WebhookData obyekti
+            
+        Returns:
+            Ishlov berilgan ma'lumotlar ustidagi LazyWebhookData
+        """
+        view = LazyWebhookData(webhook_data)
+        
+        started = time.perf_counter()
+        handlers = await self.registry.dispatch_async(webhook_data)
+        
+        self._record_handled(view, handlers, time.perf_counter() - started)
+        return view
     
     def create_response(self, success: bool, message: str = "") -> bytes:
         """
@@ -162,15 +675,55 @@ class ProtobufDecoder:
             success: Muvaffaqiyatli yoki yo'q
             message: Qo'shimcha xabar
             
+        Returns:
+            Binary format response (message yaratilmaydi - keshlangan
+            bo'laklarga faqat processed_at qo'shiladi)
+        """
+        started = time.perf_counter()
+        response = self.encoder.encode(success, message)
+        get_metrics().observe("webhook_stage_seconds", time.perf_counter() - started, "response")
+        return response
+    
+    def create_batch_response(self, results: List[ItemResult]) -> bytes:
+        """
+        Batch uchun har bir element natijasini o'z ichiga olgan response yaratadi
+        
+        Args:
+            results: process_webhook_batch qaytargan natijalar
+            
+        Returns:
+            Binary format response
+        """
+        failed = sum(1 for result in results if not result.success)
+        message = f"{len(results) - failed}/{len(results)} muvaffaqiyatli qabul qilindi"
+        
+        started = time.perf_counter()
+        response = self.encoder.encode_batch(failed == 0, message, results)
+        get_metrics().observe("webhook_stage_seconds", time.perf_counter() - started, "response")
+        return response
+    
+    def create_stream_response(self, summary: Dict[str, Any]) -> bytes:
+        """
+        Stream uchun yakuniy response yaratadi - results faqat xato
+        bo'lgan elementlarni o'z ichiga oladi
+        
+        Args:
+            summary: process_webhook_stream qaytargan natija
+            
         Returns:
             Binary format response
         """
-        response = WebhookResponse()
-        response.success = success
-        response.message = message
-        response.processed_at.GetCurrentTime()
+        success = summary["failed"] == 0 and summary["error"] is None
+        message = f"{summary['received']} ta event qabul qilindi, {summary['failed']} ta xato"
+        if summary["skipped"]:
+            message += f", {summary['skipped']} ta takroriy"
+        if summary["error"]:
+            message += f"; stream to'xtadi: {summary['error']}"
         
-        return response.SerializeToString()
+        started = time.perf_counter()
+        response = self.encoder.encode_batch(success, message, summary["failures"])
+        get_metrics().observe("webhook_stage_seconds", time.perf_counter() - started, "response")
+        return response
 
 
 def demo_decode():
@@ -0,0 +1,340 @@
+"""
+WebhookData.event_id bo'yicha takroriy eventlarni aniqlash (idempotency).
+
+Ikki qatlam ishlatiladi:
+
+* ``LRUTTLCache`` - jarayon ichidagi cheklangan LRU kesh (TTL bilan);
+  takroriy event uchun narx bitta dict qidiruvi.
+* ``SQLiteDedupStore`` - bir nechta Django worker jarayonlari bo'lishadigan
+  SQLite fayl; event_id ni atomik "band qilish" (claim) orqali ikki jarayon
+  bitta eventni bir vaqtda ishlay olmaydi.
+
+Event to'liq decode qilinishidan oldin ``EventDeduplicator.claim()``
+chaqiriladi va event ``processing`` holatiga o'tadi. Ishlov berish
+muvaffaqiyatli tugasa ``complete()`` uni ``done`` deb belgilaydi, xato
+bo'lsa ``release()`` event_id ni bo'shatadi, shunda sender qayta yuborganda
+event yana ishlanadi.
+
+``claim()`` natijasi ``ClaimResult``:
+
+* ``CLAIMED`` - event shu jarayonga berildi;
+* ``DUPLICATE`` - event allaqachon ishlangan (``done``), muvaffaqiyat deb
+  javob berish mumkin;
+* ``BUSY`` - event boshqa joyda hali ishlanmoqda; natija hali noma'lum,
+  shuning uchun sender qayta yuborishi kerak (409 + ``Retry-After``).
+
+Faqat ``done`` eventlar LRU keshga tushadi. ``processing`` holati
+``PROCESSING_TIMEOUT`` dan keyin eskiradi - ishlov berish paytida jarayon
+o'lib qolsa, event boshqa jarayon tomonidan qayta band qilinadi.
+"""
+import enum
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 100_000
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# processing holatidagi claim shuncha sekunddan keyin eskiradi
+DEFAULT_PROCESSING_TIMEOUT = 60
+# Shuncha claim dan keyin shared store dagi eskirgan yozuvlar tozalanadi
+PURGE_EVERY = 10_000
+
+
+class ClaimResult(enum.Enum):
+    """claim() natijasi; faqat CLAIMED rost (True) hisoblanadi"""
+
+    CLAIMED = "claimed"
+    DUPLICATE = "duplicate"
+    BUSY = "busy"
+
+    def __bool__(self) -> bool:
+        return self is ClaimResult.CLAIMED
+
+
+class LRUTTLCache:
+    """Jarayon ichidagi cheklangan o'lchamli, TTL li LRU kesh"""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def contains(self, key: str) -> bool:
+        """Kalit keshda va hali eskirmagan bo'lsa True"""
+        with self._lock:
+            expires_at = self._items.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return False
+            self._items.move_to_end(key)
+            return True
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            self._items[key] = time.monotonic() + self.ttl_seconds
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+class SQLiteDedupStore:
+    """
+    Jarayonlar orasida bo'lishiladigan dedup store (SQLite fayl)
+
+    Har bir thread o'z ulanishiga ega; WAL rejimi bir vaqtdagi o'qish va
+    yozishlarni bir-birini bloklamasdan bajarishga imkon beradi.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        processing_timeout: float = DEFAULT_PROCESSING_TIMEOUT,
+    ):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.processing_timeout = processing_timeout
+        self._local = threading.local()
+        self._claims = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS processed_events ("
+                "event_id TEXT PRIMARY KEY, expires_at REAL NOT NULL, "
+                "state TEXT NOT NULL DEFAULT 'done')"
+            )
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(processed_events)")}
+            if "state" not in columns:
+                # Eski fayl: mavjud yozuvlar ishlangan deb hisoblanadi
+                try:
+                    connection.execute(
+                        "ALTER TABLE processed_events ADD COLUMN state TEXT NOT NULL DEFAULT 'done'"
+                    )
+                except sqlite3.OperationalError:
+                    # Boshqa jarayon ustunni allaqachon qo'shgan
+                    pass
+            self._local.connection = connection
+        return connection
+
+    def claim(self, event_id: str) -> ClaimResult:
+        """
+        event_id ni atomik band qiladi (processing holatiga o'tkazadi)
+
+        Returns:
+            CLAIMED - event yangi (yoki oldingi yozuv eskirgan),
+            DUPLICATE - allaqachon ishlangan, BUSY - boshqa jarayonda ishlanmoqda
+        """
+        now = time.time()
+        connection = self._connection()
+        cursor = connection.execute(
+            "INSERT INTO processed_events (event_id, expires_at, state) VALUES (?, ?, 'processing') "
+            "ON CONFLICT(event_id) DO UPDATE SET expires_at = excluded.expires_at, state = 'processing' "
+            "WHERE processed_events.expires_at < ?",
+            (event_id, now + self.processing_timeout, now),
+        )
+        self._claims += 1
+        if self._claims % PURGE_EVERY == 0:
+            self.purge()
+        if cursor.rowcount == 1:
+            return ClaimResult.CLAIMED
+        row = connection.execute(
+            "SELECT state FROM processed_events WHERE event_id = ?", (event_id,)
+        ).fetchone()
+        # Yozuv shu orada o'chirilgan bo'lsa (release) - sender qayta yuborsin
+        return ClaimResult.DUPLICATE if row is not None and row[0] == "done" else ClaimResult.BUSY
+
+    def complete(self, event_id: str) -> None:
+        """Event ni ishlangan (done) deb belgilaydi - TTL shu paytdan boshlanadi"""
+        self._connection().execute(
+            "UPDATE processed_events SET state = 'done', expires_at = ? WHERE event_id = ?",
+            (time.time() + self.ttl_seconds, event_id),
+        )
+
+    def release(self, event_id: str) -> None:
+        self._connection().execute("DELETE FROM processed_events WHERE event_id = ?", (event_id,))
+
+    def purge(self) -> int:
+        """Eskirgan yozuvlarni o'chiradi"""
+        cursor = self._connection().execute(
+            "DELETE FROM processed_events WHERE expires_at < ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM processed_events")
+
+
+class EventDeduplicator:
+    """
+    Avval jarayon ichidagi LRU, keyin shared store bilan event_id ni tekshiradi
+    """
+
+    def __init__(
+        self,
+        cache: LRUTTLCache,
+        store: Optional[SQLiteDedupStore] = None,
+        processing_timeout: float = DEFAULT_PROCESSING_TIMEOUT,
+    ):
+        self.cache = cache
+        self.store = store
+        self.processing_timeout = processing_timeout
+        # Shu jarayonda ishlanayotgan eventlar: event_id -> muddat (monotonic)
+        self._processing: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.busy = 0
+
+    def claim(self, event_id: str) -> ClaimResult:
+        """
+        Event ni ishlash uchun band qiladi
+
+        Returns:
+            CLAIMED - event birinchi marta keldi va ishlanishi kerak,
+            DUPLICATE - allaqachon ishlangan (o'tkazib yuborish kerak),
+            BUSY - hali ishlanmoqda (sender qayta yuborishi kerak)
+        """
+        if not event_id:
+            # event_id siz eventlarni dedup qilib bo'lmaydi
+            return ClaimResult.CLAIMED
+
+        if self.cache.contains(event_id):
+            self.hits += 1
+            return ClaimResult.DUPLICATE
+
+        now = time.monotonic()
+        with self._lock:
+            if self._processing.get(event_id, 0) > now:
+                self.busy += 1
+                return ClaimResult.BUSY
+            self._processing[event_id] = now + self.processing_timeout
+
+        result = ClaimResult.CLAIMED
+        if self.store is not None:
+            try:
+                result = self.store.claim(event_id)
+            except sqlite3.Error as e:
+                # Shared store ishlamasa ham eventlarni yo'qotmaymiz
+                logger.error(f"Dedup store xatosi: {e}")
+
+        if result is ClaimResult.CLAIMED:
+            self.misses += 1
+            return result
+
+        with self._lock:
+            self._processing.pop(event_id, None)
+        if result is ClaimResult.DUPLICATE:
+            # Faqat ishlangan eventlar keshlanadi
+            self.cache.add(event_id)
+            self.hits += 1
+        else:
+            self.busy += 1
+        return result
+
+    def complete(self, event_id: str) -> None:
+        """Ishlov berish muvaffaqiyatli tugagach event_id ni ishlangan deb belgilaydi"""
+        if not event_id:
+            return
+        with self._lock:
+            self._processing.pop(event_id, None)
+        self.cache.add(event_id)
+        if self.store is not None:
+            try:
+                self.store.complete(event_id)
+            except sqlite3.Error as e:
+                logger.error(f"Dedup store xatosi: {e}")
+
+    def release(self, event_id: str) -> None:
+        """Ishlov berish muvaffaqiyatsiz bo'lganda event_id ni bo'shatadi"""
+        if not event_id:
+            return
+        with self._lock:
+            self._processing.pop(event_id, None)
+        self.cache.discard(event_id)
+        if self.store is not None:
+            try:
+                self.store.release(event_id)
+            except sqlite3.Error as e:
+                logger.error(f"Dedup store xatosi: {e}")
+
+    def clear(self) -> None:
+        self.cache.clear()
+        with self._lock:
+            self._processing.clear()
+        if self.store is not None:
+            self.store.clear()
+        self.hits = self.misses = self.busy = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "busy": self.busy,
+            "cached": len(self.cache),
+            "processing": len(self._processing),
+        }
+
+
+_deduplicator: Optional[EventDeduplicator] = None
+_deduplicator_lock = threading.Lock()
+
+
+def get_deduplicator() -> Optional[EventDeduplicator]:
+    """
+    settings.WEBHOOK_DEDUP asosida jarayon bo'yicha yagona deduplicator
+
+    Returns:
+        EventDeduplicator yoki None (agar dedup o'chirilgan bo'lsa)
+    """
+    global _deduplicator
+    if _deduplicator is not None:
+        return _deduplicator
+
+    from django.conf import settings
+
+    config = getattr(settings, "WEBHOOK_DEDUP", {})
+    if not config.get("ENABLED", True):
+        return None
+
+    with _deduplicator_lock:
+        if _deduplicator is None:
+            ttl_seconds = config.get("TTL_SECONDS", DEFAULT_TTL_SECONDS)
+            processing_timeout = config.get("PROCESSING_TIMEOUT", DEFAULT_PROCESSING_TIMEOUT)
+            shared_path = config.get("SHARED_PATH")
+            _deduplicator = EventDeduplicator(
+                LRUTTLCache(config.get("MAX_SIZE", DEFAULT_MAX_SIZE), ttl_seconds),
+                SQLiteDedupStore(shared_path, ttl_seconds, processing_timeout) if shared_path else None,
+                processing_timeout,
+            )
+    return _deduplicator
+
+
+def reset_deduplicator(**kwargs) -> None:
+    """Sozlamalar o'zgarganda deduplicator qayta yaratilishi uchun"""
+    global _deduplicator
+    if kwargs.get("setting", "WEBHOOK_DEDUP") == "WEBHOOK_DEDUP":
+        _deduplicator = None
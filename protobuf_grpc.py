@@ -0,0 +1,130 @@
+"""
+DataExchange gRPC servisi (va shu serverdagi EventFeed, qarang
+apps/core/events/feed.py).
+
+HTTP viewlar bilan bir xil ProtobufDecoder pipeline i ishlatiladi:
+sarlavha scan, dedup, handlerlar va keshlangan response encoder. Shu
+sababli so'rov va javoblar gRPC tomonidan (de)serializatsiya qilinmaydi -
+servis binary ma'lumotni o'zi oladi va ``ResponseEncoder`` baytlarini
+to'g'ridan-to'g'ri qaytaradi.
+
+Ishga tushirish::
+
+    python manage.py run_grpc_server --address [::]:50051
+"""
+import logging
+from concurrent import futures
+from typing import Iterator
+
+import grpc
+
+from apps.core.dtos.platform.v1.data_exchange_pb2_grpc import DataExchangeServicer
+from apps.core.events.feed import EventFeedService, add_event_feed_service
+from protobuf_decoder import EVENT_BUSY_MESSAGE, MAX_DELIMITED_MESSAGE_SIZE, ProtobufDecoder
+from protobuf_dedup import ClaimResult, get_deduplicator
+from protobuf_metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "platform.v1.DataExchange"
+DEFAULT_ADDRESS = "[::]:50051"
+DEFAULT_MAX_WORKERS = 10
+
+
+class DataExchangeService(DataExchangeServicer):
+    """SendWebhook va StreamWebhooks RPC lari (binary so'rov -> binary javob)"""
+
+    def _decoder(self) -> ProtobufDecoder:
+        # Sozlamalar o'zgarsa (testlar) yangi deduplicator olinadi
+        return ProtobufDecoder(deduplicator=get_deduplicator())
+
+    def SendWebhook(self, request: bytes, context: grpc.ServicerContext) -> bytes:
+        """Bitta WebhookData ni ishlov beradi"""
+        decoder = self._decoder()
+        header = decoder.scan_header(request)
+        if header is None:
+            self._record("SendWebhook", grpc.StatusCode.INVALID_ARGUMENT)
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Noto'g'ri protobuf format")
+
+        claimed = decoder.should_decode(header)
+        if claimed is ClaimResult.BUSY:
+            # Natija hali noma'lum - UNAVAILABLE ni client qayta yuboradi
+            self._record("SendWebhook", grpc.StatusCode.UNAVAILABLE)
+            context.abort(grpc.StatusCode.UNAVAILABLE, EVENT_BUSY_MESSAGE)
+        if not claimed:
+            self._record("SendWebhook", grpc.StatusCode.OK)
+            return decoder.create_response(True, "O'tkazib yuborildi")
+
+        try:
+            decoded_data = decoder.process_webhook_data(request, lazy=True)
+        except Exception as e:
+            decoder.release(header.event_id)
+            logger.error(f"gRPC webhook ishlov berishda xato: {e}")
+            self._record("SendWebhook", grpc.StatusCode.INTERNAL)
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+        if decoded_data is None:
+            decoder.release(header.event_id)
+            self._record("SendWebhook", grpc.StatusCode.INVALID_ARGUMENT)
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Decode qila olmadim")
+
+        decoder.complete(header.event_id)
+        self._record("SendWebhook", grpc.StatusCode.OK)
+        return decoder.create_response(True, "Muvaffaqiyatli qabul qilindi")
+
+    def StreamWebhooks(self, request_iterator: Iterator[bytes], context: grpc.ServicerContext) -> bytes:
+        """
+        Client-streaming: eventlar kelishi bilan ishlanadi, oxirida umumiy natija
+
+        RPC har doim javob (elementlar natijalari bilan) qaytaradi, metrikaga
+        esa summary natijasi yoziladi: stream formati buzilsa
+        INVALID_ARGUMENT, xato elementlar bo'lsa INTERNAL.
+        """
+        decoder = self._decoder()
+        summary = decoder.process_webhook_messages(request_iterator)
+        if summary["error"] is not None:
+            code = grpc.StatusCode.INVALID_ARGUMENT
+        elif summary["failed"]:
+            code = grpc.StatusCode.INTERNAL
+        else:
+            code = grpc.StatusCode.OK
+        self._record("StreamWebhooks", code)
+        return decoder.create_stream_response(summary)
+
+    @staticmethod
+    def _record(method: str, code: grpc.StatusCode) -> None:
+        get_metrics().inc("webhook_requests_total", f"grpc_{method}", code.name)
+
+
+def add_data_exchange_service(service: DataExchangeService, server: grpc.Server) -> None:
+    """
+    Servisni serverga qo'shadi. Generate qilingan
+    add_DataExchangeServicer_to_server dan farqi - (de)serializer yo'q,
+    ya'ni handlerlar binary ma'lumot bilan ishlaydi.
+    """
+    handlers = {
+        "SendWebhook": grpc.unary_unary_rpc_method_handler(service.SendWebhook),
+        "StreamWebhooks": grpc.stream_unary_rpc_method_handler(service.StreamWebhooks),
+    }
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE_NAME, handlers),))
+
+
+def create_server(max_workers: int = DEFAULT_MAX_WORKERS) -> grpc.Server:
+    """
+    DataExchange va EventFeed servislari bilan gRPC server yaratadi (port
+    qo'shilmagan, ishga tushirilmagan)
+
+    Args:
+        max_workers: Bir vaqtda ishlanadigan RPC lar soni. Har bir ochiq
+            Subscribe stream bitta workerni band qiladi
+
+    Returns:
+        grpc.Server
+    """
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        options=[("grpc.max_receive_message_length", MAX_DELIMITED_MESSAGE_SIZE)],
+    )
+    add_data_exchange_service(DataExchangeService(), server)
+    add_event_feed_service(EventFeedService(), server)
+    return server
@@ -0,0 +1,213 @@
+"""
+WebhookData eventlari uchun handler registry.
+
+Handlerlar event_type va/yoki oneof data maydoni (WhichOneof natijasi)
+bo'yicha ro'yxatdan o'tkaziladi. Har bir (event_type, data_case) juftligi
+uchun handlerlar ro'yxati bir marta yig'ilib keshlanadi, shuning uchun
+dispatch narxi handlerlar soniga emas, faqat chaqiriladiganlariga bog'liq.
+
+Django ilovalari o'z handlerlarini ``<app>/webhook_handlers.py`` modulida
+ro'yxatdan o'tkazadi - ular ``autodiscover()`` orqali yuklanadi::
+
+    from protobuf_handlers import registry
+
+    @registry.register(event_type="order_placed", data_case="order_data")
+    async def save_order(webhook_data, order):
+        ...
+"""
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from asgiref.sync import async_to_sync, sync_to_async
+from google.protobuf.message import Message
+
+logger = logging.getLogger(__name__)
+
+# Keshlangan (event_type, data_case) kalitlari soni chegarasi - event_type
+# tashqaridan keladi, shuning uchun kesh cheksiz o'smasligi kerak
+MAX_CACHED_ROUTES = 1024
+
+Handler = Callable[[Message, Optional[Message]], Any]
+
+
+class HandlerStats:
+    """Bitta handler uchun vaqt statistikasi"""
+
+    __slots__ = ("calls", "errors", "total_seconds", "max_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "max_seconds": self.max_seconds,
+            "avg_seconds": self.total_seconds / self.calls if self.calls else 0.0,
+        }
+
+
+class RegisteredHandler:
+    """Registry ichidagi handler va uning metama'lumotlari"""
+
+    __slots__ = ("func", "name", "is_async", "stats")
+
+    def __init__(self, func: Handler, is_async: Optional[bool] = None):
+        self.func = func
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.is_async = inspect.iscoroutinefunction(func) if is_async is None else is_async
+        self.stats = HandlerStats()
+
+
+class HandlerRegistry:
+    """
+    (event_type, data_case) bo'yicha handlerlarni saqlaydi va chaqiradi
+
+    None qiymati "har qanday" degani: event_type=None handler barcha
+    event turlari uchun, data_case=None handler barcha oneof holatlari
+    uchun chaqiriladi. Aniqroq kalitlar oldin chaqiriladi.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[Tuple[Optional[str], Optional[str]], list] = {}
+        self._routes: Dict[Tuple[str, Optional[str]], Tuple[RegisteredHandler, ...]] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        func: Optional[Handler] = None,
+        *,
+        event_type: Optional[str] = None,
+        data_case: Optional[str] = None,
+        is_async: Optional[bool] = None,
+    ):
+        """
+        Handler ni ro'yxatdan o'tkazadi (decorator sifatida ham ishlatiladi)
+
+        Args:
+            func: handler(webhook_data, payload) - payload oneof data ning
+                o'rnatilgan maydoni yoki None
+            event_type: Faqat shu event turi uchun (None - barchasi)
+            data_case: Faqat shu oneof maydoni uchun, masalan "order_data"
+            is_async: Handler async ekanini majburan belgilash
+                (default - async def bo'yicha aniqlanadi)
+        """
+        def decorator(handler: Handler) -> Handler:
+            with self._lock:
+                key = (event_type, data_case)
+                self._handlers.setdefault(key, []).append(RegisteredHandler(handler, is_async))
+                self._routes.clear()
+            return handler
+
+        if func is not None:
+            return decorator(func)
+        return decorator
+
+    def unregister(self, func: Handler) -> None:
+        """Handler ni barcha kalitlardan olib tashlaydi"""
+        with self._lock:
+            for handlers in self._handlers.values():
+                handlers[:] = [h for h in handlers if h.func is not func]
+            self._routes.clear()
+
+    def handlers_for(self, event_type: str, data_case: Optional[str]) -> Tuple[RegisteredHandler, ...]:
+        """Berilgan event uchun chaqiriladigan handlerlar (keshlangan)"""
+        route = (event_type, data_case)
+        handlers = self._routes.get(route)
+        if handlers is not None:
+            return handlers
+
+        handlers = []
+        for key in ((event_type, data_case), (event_type, None), (None, data_case), (None, None)):
+            handlers.extend(self._handlers.get(key, ()))
+        handlers = tuple(handlers)
+
+        if len(self._routes) < MAX_CACHED_ROUTES:
+            self._routes[route] = handlers
+        return handlers
+
+    def _route(self, webhook_data: Message):
+        data_case = webhook_data.WhichOneof("data")
+        payload = getattr(webhook_data, data_case) if data_case else None
+        return self.handlers_for(webhook_data.event_type, data_case), payload
+
+    @staticmethod
+    def _record(handler: RegisteredHandler, started: float, failed: bool) -> None:
+        elapsed = time.perf_counter() - started
+        stats = handler.stats
+        stats.calls += 1
+        stats.errors += failed
+        stats.total_seconds += elapsed
+        if elapsed > stats.max_seconds:
+            stats.max_seconds = elapsed
+
+    def dispatch(self, webhook_data: Message) -> int:
+        """
+        Event ni mos handlerlarga sinxron tarzda uzatadi; async handlerlar
+        async_to_sync orqali bajariladi
+
+        Returns:
+            Chaqirilgan handlerlar soni
+        """
+        handlers, payload = self._route(webhook_data)
+        for handler in handlers:
+            started = time.perf_counter()
+            try:
+                if handler.is_async:
+                    async_to_sync(handler.func)(webhook_data, payload)
+                else:
+                    handler.func(webhook_data, payload)
+            except Exception:
+                self._record(handler, started, True)
+                raise
+            self._record(handler, started, False)
+        return len(handlers)
+
+    async def dispatch_async(self, webhook_data: Message, thread_sensitive: bool = False) -> int:
+        """
+        Event ni mos handlerlarga asinxron tarzda uzatadi; sinxron
+        handlerlar sync_to_async orqali thread da bajariladi
+
+        Returns:
+            Chaqirilgan handlerlar soni
+        """
+        handlers, payload = self._route(webhook_data)
+        for handler in handlers:
+            started = time.perf_counter()
+            try:
+                if handler.is_async:
+                    await handler.func(webhook_data, payload)
+                else:
+                    await sync_to_async(handler.func, thread_sensitive=thread_sensitive)(webhook_data, payload)
+            except Exception:
+                self._record(handler, started, True)
+                raise
+            self._record(handler, started, False)
+        return len(handlers)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Har bir handler uchun chaqiruvlar soni va vaqt statistikasi"""
+        return {
+            handler.name: handler.stats.as_dict()
+            for handlers in self._handlers.values()
+            for handler in handlers
+        }
+
+
+# Loyiha bo'yicha umumiy registry
+registry = HandlerRegistry()
+
+
+def autodiscover() -> None:
+    """INSTALLED_APPS dagi har bir ilovaning webhook_handlers modulini yuklaydi"""
+    from django.utils.module_loading import autodiscover_modules
+
+    autodiscover_modules("webhook_handlers")
+    logger.debug("Webhook handlerlar yuklandi: %s", list(registry.stats()))
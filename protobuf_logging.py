@@ -0,0 +1,148 @@
+"""
+Decode pipeline uchun darajani hisobga oluvchi, sampling qilinadigan
+strukturali logging.
+
+Har bir event uchun bitta ixcham yozuv chiqariladi. Formatlash logging
+moduliga qoldiriladi (%-argumentlar), shuning uchun daraja o'chirilgan
+yoki event sampling da tashlab ketilgan bo'lsa string umuman yaratilmaydi.
+Maydonlar ``record.webhook`` (``extra``) orqali JSON formatterlarga ham
+uzatiladi.
+
+Sampling event turi bo'yicha "N tadan 1 tasi" ko'rinishida sozlanadi::
+
+    WEBHOOK_LOGGING = {
+        "LEVEL": "INFO",
+        "SAMPLE_RATES": {"default": 1, "order_placed": 100},
+    }
+"""
+import itertools
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from google.protobuf.message import Message
+
+DEFAULT_RATE_KEY = "default"
+
+# Har bir oneof holati uchun logga qo'shiladigan ixcham maydonlar
+_SUMMARIES = {
+    "user_data": lambda user: {"id": user.id, "email": user.email},
+    "product_data": lambda product: {"id": product.id, "price": product.price},
+    "order_data": lambda order: {
+        "id": order.id,
+        "user_id": order.user_id,
+        "items": len(order.items),
+        "total": order.total_amount,
+        "status": order.status,
+    },
+}
+
+
+class EventLogSampler:
+    """Event turi bo'yicha "N tadan 1 tasi" sampling"""
+
+    def __init__(self, rates: Optional[Dict[str, int]] = None):
+        rates = dict(rates or {})
+        self.default_rate = max(1, int(rates.pop(DEFAULT_RATE_KEY, 1)))
+        self.rates = {event_type: max(1, int(rate)) for event_type, rate in rates.items()}
+        # Hisoblagichlar faqat sozlangan turlar uchun - noma'lum turlar
+        # default hisoblagichni bo'lishadi, shuning uchun lug'at o'smaydi
+        self._counters = {event_type: itertools.count() for event_type in self.rates}
+        self._default_counter = itertools.count()
+
+    def rate_for(self, event_type: str) -> int:
+        return self.rates.get(event_type, self.default_rate)
+
+    def should_log(self, event_type: str) -> bool:
+        counter = self._counters.get(event_type)
+        if counter is None:
+            rate, counter = self.default_rate, self._default_counter
+        else:
+            rate = self.rates[event_type]
+        return rate == 1 or next(counter) % rate == 0
+
+
+class EventLogger:
+    """Har bir event uchun bitta ixcham, sampling qilingan log yozuvi"""
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        sampler: Optional[EventLogSampler] = None,
+        level: int = logging.INFO,
+    ):
+        self.logger = logger or logging.getLogger("protobuf_decoder.events")
+        self.sampler = sampler or EventLogSampler()
+        self.level = level
+
+    def log_event(self, webhook_data: Message, handlers: int, elapsed: float) -> bool:
+        """
+        Event haqida bitta yozuv chiqaradi (agar daraja yoqilgan va event
+        sampling dan o'tgan bo'lsa)
+
+        Args:
+            webhook_data: WebhookData obyekti
+            handlers: Chaqirilgan handlerlar soni
+            elapsed: Handlerlar bajarilish vaqti (sekund)
+
+        Returns:
+            Yozuv chiqarildimi
+        """
+        if not self.logger.isEnabledFor(self.level):
+            return False
+        event_type = webhook_data.event_type
+        if not self.sampler.should_log(event_type):
+            return False
+
+        data_case = webhook_data.WhichOneof("data")
+        summarize = _SUMMARIES.get(data_case)
+        fields: Dict[str, Any] = {
+            "event_type": event_type,
+            "event_id": webhook_data.event_id,
+            "data_case": data_case,
+            "handlers": handlers,
+            "elapsed_ms": elapsed * 1000,
+            "sample_rate": self.sampler.rate_for(event_type),
+        }
+        if summarize is not None:
+            fields["data"] = summarize(getattr(webhook_data, data_case))
+
+        self.logger.log(
+            self.level,
+            "📋 event type=%s id=%s case=%s handlers=%d %.2fms data=%s",
+            event_type, fields["event_id"], data_case, handlers, fields["elapsed_ms"], fields.get("data"),
+            extra={"webhook": fields},
+        )
+        return True
+
+
+_event_logger: Optional[EventLogger] = None
+_event_logger_lock = threading.Lock()
+
+
+def get_event_logger() -> EventLogger:
+    """
+    settings.WEBHOOK_LOGGING asosida jarayon bo'yicha yagona EventLogger
+    (Django sozlanmagan bo'lsa - har bir event INFO darajada)
+    """
+    global _event_logger
+    if _event_logger is not None:
+        return _event_logger
+
+    from django.conf import settings
+
+    config = getattr(settings, "WEBHOOK_LOGGING", {}) if settings.configured else {}
+    with _event_logger_lock:
+        if _event_logger is None:
+            _event_logger = EventLogger(
+                sampler=EventLogSampler(config.get("SAMPLE_RATES")),
+                level=logging.getLevelName(config.get("LEVEL", "INFO")),
+            )
+    return _event_logger
+
+
+def reset_event_logger(**kwargs) -> None:
+    """Sozlamalar o'zgarganda EventLogger qayta yaratilishi uchun"""
+    global _event_logger
+    if kwargs.get("setting", "WEBHOOK_LOGGING") == "WEBHOOK_LOGGING":
+        _event_logger = None
@@ -0,0 +1,223 @@
+"""
+Protobuf message <-> Django model mapper.
+
+Maydonlar message descriptori bo'yicha nomi orqali moslanadi (``student_id``
+kabi FK lar - attname orqali). Har bir model uchun konvertatsiya rejasi
+``ModelMapper`` yaratilganda bir marta tuziladi:
+
+* oddiy skalyarlar - o'zgarishsiz;
+* ``google.protobuf.Timestamp`` <-> ``DateField`` / ``DateTimeField``;
+* enum <-> ``choices`` li ``CharField`` ("pending" <-> PENDING) - jadval
+  orqali.
+
+Shu sababli minglab qatorni eksport/import qilishda har bir maydon uchun
+descriptor yoki ``_meta`` qayta o'qilmaydi; queryset lar esa
+``values_list`` orqali model obyektlari yaratilmasdan o'tkaziladi::
+
+    mapper = ModelMapper(Application, entities_pb2.Application)
+    messages = mapper.to_messages(Application.objects.filter(status="pending"))
+    Application.objects.bulk_create(mapper.from_messages(messages))
+"""
+import datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.message import Message
+
+_TIMESTAMP = "google.protobuf.Timestamp"
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_SECONDS_PER_DAY = 86400
+
+# values_list ni shu hajmdagi bo'laklarda o'qish (butun natija xotiraga yuklanmaydi)
+DEFAULT_CHUNK_SIZE = 2000
+
+Converter = Optional[Callable[[Any], Any]]
+
+
+def _date_to_timestamp(value: datetime.date) -> Dict[str, int]:
+    return {"seconds": (value.toordinal() - _EPOCH_ORDINAL) * _SECONDS_PER_DAY}
+
+
+def _timestamp_to_date(value: Message) -> datetime.date:
+    return datetime.date.fromordinal(_EPOCH_ORDINAL + value.seconds // _SECONDS_PER_DAY)
+
+
+def _datetime_to_timestamp(value: datetime.datetime) -> Dict[str, int]:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return {"seconds": int(value.replace(microsecond=0).timestamp()), "nanos": value.microsecond * 1000}
+
+
+def _timestamp_to_datetime(value: Message) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(value.seconds, tz=datetime.timezone.utc).replace(
+        microsecond=value.nanos // 1000
+    )
+
+
+def enum_table(model_field: models.Field, enum_descriptor) -> Dict[str, int]:
+    """
+    choices qiymati -> enum raqami jadvali ("pending" -> PENDING)
+
+    Raises:
+        ImproperlyConfigured: agar biror choice uchun enum qiymati bo'lmasa
+    """
+    table = {}
+    for value, _ in model_field.choices:
+        enum_value = enum_descriptor.values_by_name.get(str(value).upper())
+        if enum_value is None:
+            raise ImproperlyConfigured(
+                f"{enum_descriptor.full_name} da {model_field.name}={value!r} uchun qiymat yo'q"
+            )
+        table[value] = enum_value.number
+    return table
+
+
+class ModelMapper:
+    """Bitta model va bitta message turi orasidagi oldindan tuzilgan konvertatsiya"""
+
+    def __init__(
+        self,
+        model: Type[models.Model],
+        message_class: Type[Message],
+        exclude: Sequence[str] = (),
+    ):
+        """
+        Args:
+            model: Django model
+            message_class: Mos protobuf message
+            exclude: E'tiborsiz qoldiriladigan message maydonlari
+        """
+        self.model = model
+        self.message_class = message_class
+        self.enum_tables: Dict[str, Dict[str, int]] = {}
+
+        # (message maydoni, model attname, model -> proto, proto -> model, message turimi)
+        plan: List[Tuple[str, str, Converter, Converter, bool]] = []
+        for field in message_class.DESCRIPTOR.fields:
+            if field.name in exclude:
+                continue
+            plan.append(self._plan_field(field))
+        self._plan = tuple(plan)
+        self.attnames = tuple(attname for _, attname, _, _, _ in plan)
+        # model attname -> message maydoni
+        self.message_fields = {attname: name for name, attname, _, _, _ in plan}
+        self._getter = attrgetter(*self.attnames) if len(self.attnames) > 1 else (
+            lambda instance, get=attrgetter(*self.attnames): (get(instance),)
+        )
+
+    def _plan_field(self, field: FieldDescriptor) -> Tuple[str, str, Converter, Converter, bool]:
+        try:
+            model_field = self.model._meta.get_field(field.name)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(
+                f"{self.model.__name__} da {self.message_class.__name__}.{field.name} uchun maydon yo'q"
+            )
+        if field.label == FieldDescriptor.LABEL_REPEATED:
+            raise ImproperlyConfigured(f"{self.message_class.__name__}.{field.name}: repeated maydonlar qo'llanmaydi")
+
+        attname = model_field.attname
+        if field.type == FieldDescriptor.TYPE_MESSAGE:
+            if field.message_type.full_name != _TIMESTAMP:
+                raise ImproperlyConfigured(
+                    f"{self.message_class.__name__}.{field.name}: {field.message_type.full_name} qo'llanmaydi"
+                )
+            if isinstance(model_field, models.DateTimeField):
+                return field.name, attname, _datetime_to_timestamp, _timestamp_to_datetime, True
+            if isinstance(model_field, models.DateField):
+                return field.name, attname, _date_to_timestamp, _timestamp_to_date, True
+            raise ImproperlyConfigured(f"{self.model.__name__}.{model_field.name}: Timestamp uchun sana maydoni emas")
+
+        if field.type == FieldDescriptor.TYPE_ENUM:
+            if not model_field.choices:
+                raise ImproperlyConfigured(f"{self.model.__name__}.{model_field.name}: enum uchun choices kerak")
+            table = self.enum_tables[field.name] = enum_table(model_field, field.enum_type)
+            reverse = {number: value for value, number in table.items()}
+            return field.name, attname, table.__getitem__, reverse.get, False
+
+        return field.name, attname, None, None, False
+
+    # --- model -> proto ---
+
+    def _kwargs(self, row: Sequence[Any]) -> Dict[str, Any]:
+        kwargs = {}
+        for (name, _, to_proto, _, _), value in zip(self._plan, row):
+            if value is not None:
+                kwargs[name] = to_proto(value) if to_proto is not None else value
+        return kwargs
+
+    def _rows(self, source: Iterable[models.Model], chunk_size: int) -> Iterable[Sequence[Any]]:
+        if isinstance(source, models.QuerySet):
+            return source.values_list(*self.attnames).iterator(chunk_size=chunk_size)
+        return map(self._getter, source)
+
+    def to_message(self, instance: models.Model) -> Message:
+        """Model obyektidan message"""
+        return self.message_class(**self._kwargs(self._getter(instance)))
+
+    def iter_messages(self, source: Iterable[models.Model], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Message]:
+        """
+        Message larni birma-bir beradi (stream uchun)
+
+        Args:
+            source: QuerySet (values_list orqali, model obyektlarisiz
+                o'qiladi) yoki model obyektlari
+            chunk_size: QuerySet ni o'qish bo'lagi
+        """
+        message_class = self.message_class
+        for row in self._rows(source, chunk_size):
+            yield message_class(**self._kwargs(row))
+
+    def to_messages(self, source: Iterable[models.Model], container=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Ko'p qatorni message larga o'tkazadi
+
+        Args:
+            source: QuerySet yoki model obyektlari (iter_messages dagi kabi)
+            container: Repeated maydon (masalan ``response.items``) - berilsa
+                message lar shunga qo'shiladi
+            chunk_size: QuerySet ni o'qish bo'lagi
+
+        Returns:
+            container yoki message lar ro'yxati
+        """
+        if container is None:
+            return list(self.iter_messages(source, chunk_size))
+        # extend() message larni nusxalaydi - add() to'g'ridan-to'g'ri yaratadi
+        add = container.add
+        for row in self._rows(source, chunk_size):
+            add(**self._kwargs(row))
+        return container
+
+    # --- proto -> model ---
+
+    def to_values(self, message: Message) -> Dict[str, Any]:
+        """
+        Message dan model attname -> qiymat lug'ati; o'rnatilmagan Timestamp,
+        UNSPECIFIED enum va 0 id o'tkazib yuboriladi (model default i qoladi)
+        """
+        values = {}
+        for name, attname, _, from_proto, is_message in self._plan:
+            if is_message and not message.HasField(name):
+                continue
+            value = getattr(message, name)
+            if from_proto is not None:
+                value = from_proto(value)
+                if value is None:
+                    continue
+            values[attname] = value
+        pk = self.model._meta.pk.attname
+        if values.get(pk) == 0:
+            del values[pk]
+        return values
+
+    def from_message(self, message: Message) -> models.Model:
+        """Message dan saqlanmagan model obyekti"""
+        return self.model(**self.to_values(message))
+
+    def from_messages(self, messages: Iterable[Message]) -> List[models.Model]:
+        """Message lardan saqlanmagan model obyektlari (bulk_create uchun)"""
+        model = self.model
+        return [model(**self.to_values(message)) for message in messages]
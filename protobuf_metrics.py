@@ -0,0 +1,437 @@
+"""
+Webhook pipeline uchun yengil metrikalar (counter va histogramlar) va
+Prometheus text formatidagi eksport.
+
+Har bir jarayon metrikalarni xotirada yig'adi va ``FLUSH_INTERVAL`` da
+bir marta ``MULTIPROCESS_DIR/metrics_<pid>_<token>.json`` ga atomik
+yozadi (token - registry uchun tasodifiy, shuning uchun PID qayta
+ishlatilsa ham tugagan jarayon fayli ustiga yozilmaydi). ``/metrics``
+endpointi barcha jarayonlar fayllarini qo'shib chiqaradi, shuning uchun
+gunicorn/uvicorn workerlari (va offload pool jarayonlari) bitta umumiy
+ko'rinishda bo'ladi::
+
+    WEBHOOK_METRICS = {
+        "MULTIPROCESS_DIR": BASE_DIR / "webhook_metrics",  # None - faqat joriy jarayon
+        "FLUSH_INTERVAL": 5.0,
+    }
+
+Jarayon tugayotganda (atexit) oxirgi holat ``archive.json`` ga qo'shiladi
+va jarayon fayli o'chiriladi - counterlar kamaymaydi, fayllar esa
+to'planib qolmaydi. Kutilmaganda o'ldirilgan workerlar fayli ham
+hisoblanaveradi; ularni gunicorn ``child_exit`` hook ida arxivlash
+mumkin::
+
+    def child_exit(server, worker):
+        mark_process_dead(worker.pid)
+"""
+import atexit
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE_NAME = "archive.json"
+LOCK_FILE_NAME = ".lock"
+
+DEFAULT_FLUSH_INTERVAL = 5.0
+# event_type tashqaridan keladi - bitta metrika uchun label kombinatsiyalari
+# shundan oshsa qolganlari "other" ga yig'iladi
+MAX_LABEL_SETS = 500
+OTHER = "other"
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024,
+)
+
+# nom -> (tur, tavsif, label nomlari, bucketlar)
+METRICS: Dict[str, Tuple[str, str, Tuple[str, ...], Optional[Tuple[float, ...]]]] = {
+    "webhook_requests_total": (
+        "counter", "Webhook so'rovlari soni", ("view", "status"), None,
+    ),
+    "webhook_request_seconds": (
+        "histogram", "Webhook so'rovi umumiy vaqti", ("view",), LATENCY_BUCKETS,
+    ),
+    "webhook_stage_seconds": (
+        "histogram",
+        "Pipeline bosqichlari vaqti (read_body, scan, parse, to_dict, to_json, handlers, response)",
+        ("stage",),
+        LATENCY_BUCKETS,
+    ),
+    "webhook_payload_bytes": (
+        "histogram", "So'rov body o'lchami", ("view",), SIZE_BUCKETS,
+    ),
+    "webhook_events_total": (
+        "counter", "Ishlangan eventlar soni", ("event_type", "data_case"), None,
+    ),
+    "webhook_decode_errors_total": (
+        "counter", "Decode xatolari soni", ("kind",), None,
+    ),
+    "webhook_admission_rejected_total": (
+        "counter", "Admission control rad etgan so'rovlar (body o'qilmasdan 429)", ("source",), None,
+    ),
+    "entity_cache_lookups_total": (
+        "counter", "Entity kesh qidiruvlari (local, shared - topildi; db - bazadan o'qildi)", ("model", "layer"), None,
+    ),
+}
+
+
+class MetricsRegistry:
+    """Jarayon ichidagi counter va histogramlar"""
+
+    def __init__(self, multiprocess_dir: Optional[Path] = None, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        self.flush_interval = flush_interval
+        # (nom, label qiymatlari) -> counter qiymati
+        self._counters: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+        # (nom, label qiymatlari) -> [bucket hisoblari..., +Inf, sum]
+        self._histograms: Dict[Tuple[str, Tuple[str, ...]], List[float]] = {}
+        self._label_sets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._token = uuid.uuid4().hex[:12]
+        # close() dan keyin fayl qayta yaratilmaydi (arxivda ikki marta hisoblanmasligi uchun)
+        self._closed = False
+
+    def _key(self, name: str, labels: Tuple[str, ...], store: Dict) -> Tuple[str, Tuple[str, ...]]:
+        key = (name, labels)
+        if key in store:
+            return key
+        count = self._label_sets.get(name, 0)
+        if count >= MAX_LABEL_SETS:
+            return name, (OTHER,) * len(labels)
+        self._label_sets[name] = count + 1
+        return key
+
+    def inc(self, name: str, *labels: str, value: float = 1) -> None:
+        """Counter ni oshiradi"""
+        with self._lock:
+            key = self._key(name, labels, self._counters)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, *labels: str) -> None:
+        """Histogramga qiymat qo'shadi"""
+        buckets = METRICS[name][3]
+        series = self._histograms.get((name, labels))
+        if series is None:
+            series = self._series(name, labels, len(buckets))
+        index = bisect.bisect_left(buckets, value)
+        with self._lock:
+            series[index] += 1
+            series[-1] += value
+
+    def _series(self, name: str, labels: Tuple[str, ...], size: int) -> List[float]:
+        with self._lock:
+            key = self._key(name, labels, self._histograms)
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (size + 2)
+            return series
+
+    def snapshot(self) -> Dict[str, List]:
+        """JSON ga yoziladigan holat"""
+        with self._lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                "histograms": [[name, list(labels), list(series)] for (name, labels), series in self._histograms.items()],
+            }
+
+    def _path(self) -> Path:
+        # pid flush paytida olinadi: fork qilingan workerlar alohida fayl yozadi
+        return self.multiprocess_dir / f"metrics_{os.getpid()}_{self._token}.json"
+
+    def flush(self) -> None:
+        """Joriy jarayon holatini faylga atomik yozadi"""
+        self._last_flush = time.monotonic()
+        if self.multiprocess_dir is None:
+            return
+        path = self._path()
+        tmp_path = path.with_suffix(".tmp")
+        with self._flush_lock:
+            if self._closed:
+                return
+            try:
+                self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_text(json.dumps(self.snapshot()))
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.error(f"Metrikalarni yozishda xato: {e}")
+
+    def maybe_flush(self) -> None:
+        """FLUSH_INTERVAL o'tgan bo'lsa flush qiladi (so'rov oxirida chaqiriladi)"""
+        if self.multiprocess_dir is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def close(self) -> None:
+        """
+        Oxirgi holatni arxivga qo'shib, jarayon faylini o'chiradi (jarayon
+        tugayotganda yoki registry almashtirilganda chaqiriladi)
+        """
+        if self.multiprocess_dir is None or self._closed:
+            return
+        self.flush()
+        with self._flush_lock:
+            self._closed = True
+        try:
+            _archive(self.multiprocess_dir, [self._path()])
+        except OSError as e:
+            logger.error(f"Metrikalarni arxivlashda xato: {e}")
+
+    def collect(self) -> List[Dict[str, List]]:
+        """Barcha jarayonlar snapshotlari (joriy jarayon - eng yangi holatda)"""
+        if self.multiprocess_dir is None:
+            return [self.snapshot()]
+        self.flush()
+        if not self.multiprocess_dir.exists():
+            return [self.snapshot()]
+        # Arxivlash (fayl arxivga qo'shilib o'chirilishi) bilan bir vaqtda o'qilmasligi uchun
+        with _directory_lock(self.multiprocess_dir):
+            paths = [self.multiprocess_dir / ARCHIVE_FILE_NAME, *sorted(self.multiprocess_dir.glob("metrics_*.json"))]
+            return [snapshot for _, snapshot in _read_snapshots(paths)]
+
+    def render(self) -> str:
+        """Barcha jarayonlar yig'indisi - Prometheus text exposition format"""
+        counters, histograms = _merge(self.collect())
+
+        lines = []
+        for name, (kind, help_text, label_names, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(label_names, labels)} {_format_value(value)}")
+                continue
+            for (metric, labels), series in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float("inf"),), series):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    lines.append(
+                        f"{name}_bucket{_format_labels(label_names + ('le',), labels + (le,))} {_format_value(cumulative)}"
+                    )
+                lines.append(f"{name}_sum{_format_labels(label_names, labels)} {_format_value(series[-1])}")
+                lines.append(f"{name}_count{_format_labels(label_names, labels)} {_format_value(cumulative)}")
+        return "\n".join(lines) + "\n"
+
+
+Series = Dict[Tuple[str, Tuple[str, ...]], float]
+HistogramSeries = Dict[Tuple[str, Tuple[str, ...]], List[float]]
+
+
+def _merge(snapshots: Iterable[Dict[str, List]]) -> Tuple[Series, HistogramSeries]:
+    """Snapshotlarning counter va histogramlarini qo'shadi"""
+    counters: Series = {}
+    histograms: HistogramSeries = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get("counters", ()):
+            key = (name, tuple(labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, series in snapshot.get("histograms", ()):
+            key = (name, tuple(labels))
+            merged = histograms.get(key)
+            if merged is None or len(merged) != len(series):
+                histograms[key] = list(series)
+            else:
+                histograms[key] = [a + b for a, b in zip(merged, series)]
+    return counters, histograms
+
+
+def _read_snapshots(paths: Iterable[Path]) -> Iterator[Tuple[Path, Dict[str, List]]]:
+    for path in paths:
+        try:
+            yield path, json.loads(path.read_text())
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            logger.error(f"Metrika faylini o'qib bo'lmadi ({path.name}): {e}")
+
+
+@contextmanager
+def _directory_lock(directory: Path) -> Iterator[None]:
+    """Jarayonlar orasidagi (kutadigan) lock - arxiv o'qish/yozish uchun"""
+    with open(directory / LOCK_FILE_NAME, "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _archive(directory: Path, paths: Iterable[Path]) -> int:
+    """Tugagan jarayonlar fayllarini archive.json ga qo'shib, o'chiradi"""
+    with _directory_lock(directory):
+        snapshots = list(_read_snapshots(paths))
+        if not snapshots:
+            return 0
+        archive_path = directory / ARCHIVE_FILE_NAME
+        archive = [snapshot for _, snapshot in _read_snapshots([archive_path])]
+        counters, histograms = _merge(archive + [snapshot for _, snapshot in snapshots])
+        tmp_path = archive_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "counters": [[name, list(labels), value] for (name, labels), value in counters.items()],
+            "histograms": [[name, list(labels), series] for (name, labels), series in histograms.items()],
+        }))
+        os.replace(tmp_path, archive_path)
+        for path, _ in snapshots:
+            path.unlink(missing_ok=True)
+    return len(snapshots)
+
+
+def mark_process_dead(pid: int, multiprocess_dir: Optional[Path] = None) -> int:
+    """
+    Tugagan (masalan o'ldirilgan) jarayon metrikalarini arxivga o'tkazadi
+
+    Args:
+        pid: Jarayon ID si
+        multiprocess_dir: Berilmasa - settings.WEBHOOK_METRICS dan
+
+    Returns:
+        Arxivlangan fayllar soni
+    """
+    if multiprocess_dir is None:
+        from django.conf import settings
+
+        multiprocess_dir = getattr(settings, "WEBHOOK_METRICS", {}).get("MULTIPROCESS_DIR")
+        if not multiprocess_dir:
+            return 0
+    directory = Path(multiprocess_dir)
+    if not directory.exists():
+        return 0
+    paths = [*directory.glob(f"metrics_{pid}_*.json"), directory / f"metrics_{pid}.json"]
+    return _archive(directory, paths)
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def instrument_view(name: str, read_body: bool = True) -> Callable:
+    """
+    View dekoratori: so'rovlar soni (status bo'yicha), umumiy vaqt va
+    body o'qish bosqichi/o'lchami. Stream viewlar uchun read_body=False -
+    body oldindan o'qilmaydi.
+
+    Body o'qilgani uchun admission_control dan ichkarida qo'llanadi - rad
+    etilgan so'rovlar body si o'qilmaydi (ular
+    webhook_admission_rejected_total da hisoblanadi).
+    """
+    def decorator(view: Callable) -> Callable:
+        def before(request, metrics: MetricsRegistry) -> None:
+            if read_body and request.method == "POST":
+                started = time.perf_counter()
+                size = len(request.body)
+                metrics.observe("webhook_stage_seconds", time.perf_counter() - started, "read_body")
+                metrics.observe("webhook_payload_bytes", size, name)
+
+        def after(metrics: MetricsRegistry, started: float, status: int) -> None:
+            metrics.inc("webhook_requests_total", name, str(status))
+            metrics.observe("webhook_request_seconds", time.perf_counter() - started, name)
+            metrics.maybe_flush()
+
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                metrics = get_metrics()
+                started = time.perf_counter()
+                status = 500
+                try:
+                    before(request, metrics)
+                    response = await view(request, *args, **kwargs)
+                    status = response.status_code
+                    return response
+                finally:
+                    after(metrics, started, status)
+
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            metrics = get_metrics()
+            started = time.perf_counter()
+            status = 500
+            try:
+                before(request, metrics)
+                response = view(request, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                after(metrics, started, status)
+
+        return wrapper
+
+    return decorator
+
+
+_metrics: Optional[MetricsRegistry] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """settings.WEBHOOK_METRICS asosida jarayon bo'yicha yagona registry"""
+    global _metrics
+    if _metrics is not None:
+        return _metrics
+
+    from django.conf import settings
+
+    config = getattr(settings, "WEBHOOK_METRICS", {}) if settings.configured else {}
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRegistry(
+                multiprocess_dir=config.get("MULTIPROCESS_DIR"),
+                flush_interval=config.get("FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL),
+            )
+            # Oxirgi FLUSH_INTERVAL dagi qiymatlar yo'qolmasligi uchun
+            atexit.register(_metrics.close)
+    return _metrics
+
+
+def reset_metrics(**kwargs) -> None:
+    """Sozlamalar o'zgarganda registry qayta yaratilishi uchun"""
+    global _metrics
+    if kwargs.get("setting", "WEBHOOK_METRICS") == "WEBHOOK_METRICS":
+        metrics, _metrics = _metrics, None
+        if metrics is not None:
+            atexit.unregister(metrics.close)
+            metrics.close()
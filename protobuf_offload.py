@@ -0,0 +1,192 @@
+"""
+Og'ir WebhookData eventlarini alohida jarayonlarda ishlov berish.
+
+Minglab OrderItem li ``order_placed`` eventni parse qilish, dict ga
+o'tkazish va handlerlarni chaqirish GIL ni uzoq ushlab turadi va worker
+ichidagi boshqa so'rovlarni to'xtatib qo'yadi. Shuning uchun payload
+o'lchami (yoki arzon pre-scan bilan sanalgan Order.items soni) chegaradan
+oshsa, butun ish ProcessPoolExecutor ga beriladi va orqaga faqat ixcham
+natija qaytadi; kichik eventlar joyida ishlanadi::
+
+    WEBHOOK_OFFLOAD = {
+        "ENABLED": True,
+        "MAX_WORKERS": 2,
+        "SIZE_THRESHOLD": 512 * 1024,   # bytes
+        "ITEM_THRESHOLD": 2000,         # Order.items soni (0 - tekshirilmaydi)
+    }
+
+Worker jarayonlar ``spawn`` orqali ishga tushiriladi va Django ni o'zi
+sozlaydi, shuning uchun handlerlar ``autodiscover()`` orqali u yerda ham
+ro'yxatdan o'tgan bo'ladi.
+"""
+import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+from apps.core.dtos.platform.v1.data_exchange_pb2 import Order
+from protobuf_scanner import WireFormatError, count_field, scan_webhook_header
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_SIZE_THRESHOLD = 512 * 1024
+DEFAULT_ITEM_THRESHOLD = 2000
+
+_FIELD_ORDER_ITEMS = Order.DESCRIPTOR.fields_by_name["items"].number
+
+# Worker jarayon ichida True - u yerda qayta offload qilinmaydi
+_in_worker = False
+
+
+class WebhookSummary(NamedTuple):
+    """
+    Worker jarayondan qaytadigan ixcham natija (lazy rejim uchun); decoder
+    uni OffloadedWebhookData ga o'raydi
+    """
+    event_type: str
+    event_id: str
+    data_case: Optional[str]
+
+
+def _init_worker() -> None:
+    global _in_worker
+    _in_worker = True
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+    django.setup()
+    # Pool to'xtaganda worker atexit siz chiqadi, multiprocessing finalizerlari
+    # esa ishlaydi - metrikalar shu yerda arxivga qo'shiladi
+    multiprocessing.util.Finalize(None, _close_worker_metrics, exitpriority=10)
+
+
+def _close_worker_metrics() -> None:
+    from protobuf_metrics import get_metrics
+
+    get_metrics().close()
+
+
+def _process_in_worker(binary_data: bytes, lazy: bool) -> Union[Dict[str, Any], WebhookSummary, None]:
+    """Worker jarayonda: parse, handlerlar va (lazy=False bo'lsa) dict ga o'tkazish"""
+    from protobuf_decoder import ProtobufDecoder
+    from protobuf_metrics import get_metrics
+
+    try:
+        view = ProtobufDecoder().process_webhook_data(binary_data, lazy=True)
+        if view is None:
+            return None if lazy else {"error": "Decode failed"}
+        if not lazy:
+            return view.to_dict()
+        return WebhookSummary(view.event_type, view.event_id, view.data_case)
+    finally:
+        # Worker jarayon metrikalari ham /metrics da ko'rinishi uchun. Har bir
+        # task dan keyin: worker o'ldirilsa ham oxirgi holat faylda qoladi
+        # (offload qilinadigan eventlar og'ir, bitta fayl yozish arzon)
+        get_metrics().flush()
+
+
+class ProcessOffloader:
+    """Og'ir eventlarni aniqlaydi va ularni process pool ga yuboradi"""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        size_threshold: int = DEFAULT_SIZE_THRESHOLD,
+        item_threshold: int = DEFAULT_ITEM_THRESHOLD,
+    ):
+        self.max_workers = max_workers
+        self.size_threshold = size_threshold
+        self.item_threshold = item_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def should_offload(self, binary_data: bytes) -> bool:
+        """
+        Event alohida jarayonda ishlanishi kerakmi
+
+        Avval faqat o'lcham tekshiriladi; undan kichik payloadlarda
+        Order.items soni sarlavha scan qilib sanaladi (chegaraga yetganda
+        to'xtaydi, shuning uchun narxi cheklangan).
+        """
+        if len(binary_data) >= self.size_threshold:
+            return True
+        if not self.item_threshold:
+            return False
+        try:
+            header = scan_webhook_header(binary_data)
+            if header.data_case != "order_data":
+                return False
+            end = header.data_offset + header.data_size
+            items = count_field(binary_data, header.data_offset, end, _FIELD_ORDER_ITEMS, self.item_threshold)
+        except WireFormatError:
+            # Xatoni joyida decode qilish aniqroq xabar bilan qaytaradi
+            return False
+        return items >= self.item_threshold
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                    )
+                    logger.info("⚙️ Offload process pool ishga tushdi: %d worker", self.max_workers)
+        return self._executor
+
+    def submit(self, binary_data: bytes, lazy: bool = False) -> Future:
+        """Eventni worker jarayonga yuboradi"""
+        return self.executor.submit(_process_in_worker, binary_data, lazy)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Pool ni to'xtatadi (keyingi submit yangisini yaratadi)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_offloader: Optional[ProcessOffloader] = None
+_offloader_lock = threading.Lock()
+
+
+def get_offloader() -> Optional[ProcessOffloader]:
+    """
+    settings.WEBHOOK_OFFLOAD asosida jarayon bo'yicha yagona offloader
+
+    Returns:
+        ProcessOffloader yoki None (agar o'chirilgan bo'lsa yoki worker
+        jarayonning o'zi bo'lsa)
+    """
+    global _offloader
+    if _offloader is not None or _in_worker:
+        return _offloader
+
+    from django.conf import settings
+
+    config = getattr(settings, "WEBHOOK_OFFLOAD", {}) if settings.configured else {}
+    if not config.get("ENABLED", False):
+        return None
+
+    with _offloader_lock:
+        if _offloader is None:
+            _offloader = ProcessOffloader(
+                max_workers=config.get("MAX_WORKERS", DEFAULT_MAX_WORKERS),
+                size_threshold=config.get("SIZE_THRESHOLD", DEFAULT_SIZE_THRESHOLD),
+                item_threshold=config.get("ITEM_THRESHOLD", DEFAULT_ITEM_THRESHOLD),
+            )
+    return _offloader
+
+
+def reset_offloader(**kwargs) -> None:
+    """Sozlamalar o'zgarganda offloader (va uning pool i) qayta yaratilishi uchun"""
+    global _offloader
+    if kwargs.get("setting", "WEBHOOK_OFFLOAD") == "WEBHOOK_OFFLOAD":
+        offloader, _offloader = _offloader, None
+        if offloader is not None:
+            offloader.shutdown(wait=False)
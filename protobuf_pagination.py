@@ -0,0 +1,123 @@
+"""
+Keyset pagination va length-delimited protobuf stream.
+
+Sahifa OFFSET bilan emas, oldingi sahifaning oxirgi kaliti bilan
+boshlanadi (``WHERE (title, id) > (:title, :id) ORDER BY title, id``),
+shuning uchun chuqur sahifalar ham indeks bo'yicha bir xil tez o'qiladi.
+
+Kursor - kalit qiymatlarining JSON ro'yxati (urlsafe base64). Keyingi
+sahifa kursori oldindan, faqat indeks bo'yicha ``limit``-qatorni o'qib
+topiladi va sahifa shu kalit bilan yopiladi - shuning uchun javob header
+ida yuboriladi va stream paytida qo'shilgan qatorlar sahifalar orasida
+yo'qolmaydi.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from google.protobuf.message import Message
+
+from protobuf_scanner import encode_varint
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """Kursor buzilgan yoki boshqa kalitlar uchun yaratilgan"""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Kalit qiymatlaridan kursor"""
+    data = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Args:
+        cursor: encode_cursor natijasi
+        size: Kutilayotgan kalitlar soni
+
+    Raises:
+        InvalidCursor: agar kursorni o'qib bo'lmasa
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Kursorni o'qib bo'lmadi")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Kursor bu ro'yxat uchun emas")
+    return values
+
+
+def _keyset_q(keys: Sequence[str], values: Sequence[Any], op: str, inclusive: bool) -> Q:
+    key, value = keys[0], values[0]
+    if len(keys) == 1:
+        return Q(**{f"{key}__{op}{'e' if inclusive else ''}": value})
+    return Q(**{f"{key}__{op}": value}) | (Q(**{key: value}) & _keyset_q(keys[1:], values[1:], op, inclusive))
+
+
+def keyset_q(keys: Sequence[str], values: Sequence[Any], op: str = "gt", inclusive: bool = False) -> Q:
+    """
+    Leksikografik taqqoslash: ``(k1, k2) > (v1, v2)`` (op="gt") yoki
+    ``(k1, k2) <= (v1, v2)`` (op="lt", inclusive=True)
+
+    Birinchi kalit uchun qo'shimcha ``k1 >= v1`` sharti indeks bo'yicha
+    oraliq qidiruvga imkon beradi (OR ni baza yaxshi optimallashtirmaydi).
+    """
+    q = _keyset_q(keys, values, op, inclusive)
+    if len(keys) > 1:
+        q &= Q(**{f"{keys[0]}__{op}e": values[0]})
+    return q
+
+
+def paginate(
+    queryset: QuerySet, keys: Sequence[str], limit: int, after: Optional[str] = None
+) -> Tuple[QuerySet, Optional[str]]:
+    """
+    Args:
+        queryset: Filtrlangan queryset
+        keys: Tartiblash kalitlari (o'sish bo'yicha, oxirgisi unikal)
+        limit: Sahifa hajmi
+        after: Oldingi sahifa kursori
+
+    Returns:
+        (sahifa queryseti, keyingi sahifa kursori yoki None)
+
+    Raises:
+        InvalidCursor: agar kursor noto'g'ri bo'lsa
+    """
+    queryset = queryset.order_by(*keys)
+    if after:
+        values = decode_cursor(after, len(keys))
+        try:
+            # Qiymatlar filter qurilayotganda maydon turiga o'tkaziladi
+            queryset = queryset.filter(keyset_q(keys, values))
+        except (TypeError, ValueError, ValidationError):
+            raise InvalidCursor("Kursor qiymatlari bu ro'yxat kalitlariga mos emas")
+
+    boundary = next(iter(queryset.values_list(*keys)[limit - 1:limit]), None)
+    if boundary is None:
+        return queryset[:limit], None
+    return queryset.filter(keyset_q(keys, boundary, op="lt", inclusive=True)), encode_cursor(boundary)
+
+
+def iter_delimited(messages: Iterable[Message], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Message larni varint-length-delimited baytlarga aylantiradi va
+    ``chunk_size`` tadan birlashtirib beradi (har bir message uchun alohida
+    write bo'lmasligi uchun)
+    """
+    chunk = []
+    for message in messages:
+        data = message.SerializeToString()
+        chunk.append(encode_varint(len(data)))
+        chunk.append(data)
+        if len(chunk) >= chunk_size * 2:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
@@ -0,0 +1,155 @@
+"""
+WebhookResponse ni message yaratmasdan, oldindan serializatsiya qilingan
+bo'laklardan yig'ish.
+
+Javoblar orasida faqat processed_at o'zgaradi, shuning uchun doimiy
+xabarlarning (success, message) jufti uchun 1-2 maydonlar baytlari bir
+marta tayyorlanadi va keshlanadi; har bir javobda faqat timestamp
+kodlanadi. Dinamik xabarlar (masalan "3/5 ..." yoki exception matni)
+keshlanmaydi - har safar kodlanadi.
+Natija ``WebhookResponse.SerializeToString()`` bilan bayt-ma-bayt bir xil
+(maydonlar raqam tartibida yoziladi).
+"""
+import threading
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from protobuf_scanner import encode_varint
+
+# Teglar: (maydon raqami << 3) | wire turi
+_TAG_SUCCESS = b"\x08"          # WebhookResponse.success = 1 (varint)
+_TAG_MESSAGE = b"\x12"          # WebhookResponse.message = 2 (length-delimited)
+_TAG_PROCESSED_AT = b"\x1a"     # WebhookResponse.processed_at = 3 (length-delimited)
+_TAG_RESULT = b"\x22"           # WebhookResponse.results = 4 (length-delimited)
+_TAG_SECONDS = 0x08             # Timestamp.seconds = 1
+_TAG_NANOS = 0x10               # Timestamp.nanos = 2
+_TAG_ITEM_INDEX = b"\x08"       # WebhookItemResult.index = 1
+_TAG_ITEM_EVENT_ID = b"\x12"    # WebhookItemResult.event_id = 2
+_TAG_ITEM_SUCCESS = b"\x18"     # WebhookItemResult.success = 3
+_TAG_ITEM_MESSAGE = b"\x22"     # WebhookItemResult.message = 4
+
+_TRUE = b"\x01"
+
+
+class ItemResult(NamedTuple):
+    """Batch/stream elementining natijasi (WebhookItemResult bilan bir xil maydonlar)"""
+    index: int
+    event_id: str
+    success: bool
+    message: str = ""
+
+
+def _encode_string(tag: bytes, value: str) -> bytes:
+    # proto3: bo'sh string umuman yozilmaydi
+    if not value:
+        return b""
+    data = value.encode("utf-8")
+    return tag + encode_varint(len(data)) + data
+
+
+def _encode_length_delimited(tag: bytes, payload: bytes) -> bytes:
+    return tag + encode_varint(len(payload)) + payload
+
+
+def encode_timestamp(nanoseconds: int) -> bytes:
+    """Epoch dan beri nanosekundlarni google.protobuf.Timestamp payloadiga o'tkazadi"""
+    seconds, nanos = divmod(nanoseconds, 1_000_000_000)
+    out = bytearray()
+    if seconds:
+        out.append(_TAG_SECONDS)
+        out += encode_varint(seconds)
+    if nanos:
+        out.append(_TAG_NANOS)
+        out += encode_varint(nanos)
+    return bytes(out)
+
+
+class ResponseEncoder:
+    """
+    WebhookResponse va WebhookItemResult uchun keshlangan encoder
+
+    Thread-safe: kesh faqat to'ldiriladi, yozuvlar hech qachon o'zgarmaydi.
+    Faqat ``messages`` dagi xabarlar (va bo'sh xabar) keshlanadi, shuning
+    uchun kesh hajmi ular soni bilan cheklangan.
+    """
+
+    def __init__(self, messages: Iterable[str] = ()):
+        """
+        Args:
+            messages: Keshlanadigan doimiy xabarlar
+        """
+        self.messages = frozenset(messages) | {""}
+        self._prefixes: Dict[Tuple[bool, str], bytes] = {}
+        self._item_tails: Dict[Tuple[bool, str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, cache: Dict[Tuple[bool, str], bytes], key: Tuple[bool, str], build) -> bytes:
+        if key[1] not in self.messages:
+            return build(*key)
+        value = cache.get(key)
+        if value is None:
+            value = build(*key)
+            with self._lock:
+                cache.setdefault(key, value)
+        return value
+
+    @staticmethod
+    def _build_prefix(success: bool, message: str) -> bytes:
+        return (_TAG_SUCCESS + _TRUE if success else b"") + _encode_string(_TAG_MESSAGE, message)
+
+    @staticmethod
+    def _build_item_tail(success: bool, message: str) -> bytes:
+        return (_TAG_ITEM_SUCCESS + _TRUE if success else b"") + _encode_string(_TAG_ITEM_MESSAGE, message)
+
+    def prefix(self, success: bool, message: str = "") -> bytes:
+        """success va message maydonlarining (doimiy xabar bo'lsa keshlangan) baytlari"""
+        return self._cached(self._prefixes, (success, message), self._build_prefix)
+
+    def encode(self, success: bool, message: str = "", now_ns: Optional[int] = None) -> bytes:
+        """
+        WebhookResponse ni kodlaydi
+
+        Args:
+            success: Muvaffaqiyatli yoki yo'q
+            message: Qo'shimcha xabar
+            now_ns: processed_at (nanosekund); None - hozirgi vaqt
+
+        Returns:
+            Binary format response
+        """
+        timestamp = encode_timestamp(time.time_ns() if now_ns is None else now_ns)
+        return self.prefix(success, message) + _encode_length_delimited(_TAG_PROCESSED_AT, timestamp)
+
+    def encode_item(self, index: int, event_id: str, success: bool, message: str = "") -> bytes:
+        """Bitta WebhookItemResult ni kodlaydi (doimiy xabarlarda success/message qismi keshlanadi)"""
+        head = _TAG_ITEM_INDEX + encode_varint(index) if index else b""
+        return (
+            head
+            + _encode_string(_TAG_ITEM_EVENT_ID, event_id)
+            + self._cached(self._item_tails, (success, message), self._build_item_tail)
+        )
+
+    def encode_batch(
+        self,
+        success: bool,
+        message: str,
+        results: Iterable[ItemResult],
+        now_ns: Optional[int] = None,
+    ) -> bytes:
+        """
+        Elementlar natijalari bilan WebhookResponse ni kodlaydi
+
+        Args:
+            success: Umumiy natija
+            message: Qo'shimcha xabar
+            results: ItemResult (yoki shu maydonlarga ega obyektlar)
+            now_ns: processed_at (nanosekund); None - hozirgi vaqt
+
+        Returns:
+            Binary format response
+        """
+        parts = [self.encode(success, message, now_ns)]
+        for result in results:
+            item = self.encode_item(result.index, result.event_id, result.success, result.message)
+            parts.append(_encode_length_delimited(_TAG_RESULT, item))
+        return b"".join(parts)
@@ -0,0 +1,229 @@
+"""
+WebhookData binary ma'lumotlarini to'liq parse qilmasdan o'qish uchun
+wire-format scanner.
+
+Routing, dedup va rad etish qarorlari uchun faqat event_type, event_id,
+timestamp va oneof data ning qaysi maydoni o'rnatilgani kerak. Scanner
+teglarni ketma-ket o'qiydi va length-delimited payloadlarni (masalan katta
+Order.items ro'yxatini) decode qilmasdan o'tkazib yuboradi.
+"""
+from typing import NamedTuple, Optional, Tuple
+
+from apps.core.dtos.platform.v1.data_exchange_pb2 import WebhookData
+
+# Protobuf wire turlari
+WIRETYPE_VARINT = 0
+WIRETYPE_FIXED64 = 1
+WIRETYPE_LENGTH_DELIMITED = 2
+WIRETYPE_FIXED32 = 5
+
+_FIELD_EVENT_TYPE = WebhookData.DESCRIPTOR.fields_by_name["event_type"].number
+_FIELD_EVENT_ID = WebhookData.DESCRIPTOR.fields_by_name["event_id"].number
+_FIELD_TIMESTAMP = WebhookData.DESCRIPTOR.fields_by_name["timestamp"].number
+
+# oneof data: maydon raqami -> maydon nomi ("user_data", "product_data", ...)
+DATA_CASES = {
+    field.number: field.name
+    for field in WebhookData.DESCRIPTOR.oneofs_by_name["data"].fields
+}
+
+
+class WireFormatError(ValueError):
+    """Binary ma'lumot protobuf wire formatiga mos kelmaganda ko'tariladi"""
+
+
+class WebhookHeader(NamedTuple):
+    """WebhookData ning to'liq parse qilinmasdan olingan sarlavhasi"""
+    event_type: str
+    event_id: str
+    timestamp_seconds: int
+    timestamp_nanos: int
+    # oneof data ning o'rnatilgan maydoni ("user_data", ...) yoki None
+    data_case: Optional[str]
+    # oneof maydon raqami (0 - o'rnatilmagan)
+    data_field_number: int
+    # oneof payload ning buffer ichidagi joylashuvi va o'lchami
+    data_offset: int
+    data_size: int
+
+
+def decode_varint(buffer: bytes, pos: int) -> Optional[Tuple[int, int]]:
+    """
+    buffer[pos:] dan varint o'qiydi
+
+    Returns:
+        (qiymat, keyingi pozitsiya) yoki None (agar buffer varint o'rtasida tugasa)
+    """
+    result = 0
+    shift = 0
+    while pos < len(buffer):
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise WireFormatError("Varint juda uzun")
+    return None
+
+
+def encode_varint(value: int) -> bytes:
+    """Butun sonni varint formatga o'tkazadi (manfiy - 64 bitli ikkiga to'ldiruvchi)"""
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(buffer: bytes, pos: int) -> Tuple[int, int]:
+    """decode_varint, lekin buffer tugab qolsa xato ko'taradi"""
+    decoded = decode_varint(buffer, pos)
+    if decoded is None:
+        raise WireFormatError("Buffer varint o'rtasida tugadi")
+    return decoded
+
+
+def _read_length_delimited(buffer: bytes, pos: int) -> Tuple[int, int]:
+    """Length-delimited maydon payloadining (boshi, oxiri) ni qaytaradi"""
+    length, start = _read_varint(buffer, pos)
+    end = start + length
+    if end > len(buffer):
+        raise WireFormatError("Length-delimited maydon buffer dan tashqariga chiqadi")
+    return start, end
+
+
+def skip_field(buffer: bytes, pos: int, wire_type: int) -> int:
+    """
+    Maydon qiymatini decode qilmasdan o'tkazib yuboradi
+
+    Returns:
+        Keyingi teg pozitsiyasi
+    """
+    if wire_type == WIRETYPE_VARINT:
+        return _read_varint(buffer, pos)[1]
+    if wire_type == WIRETYPE_LENGTH_DELIMITED:
+        return _read_length_delimited(buffer, pos)[1]
+    if wire_type == WIRETYPE_FIXED64:
+        end = pos + 8
+    elif wire_type == WIRETYPE_FIXED32:
+        end = pos + 4
+    else:
+        raise WireFormatError(f"Qo'llab-quvvatlanmaydigan wire turi: {wire_type}")
+    if end > len(buffer):
+        raise WireFormatError("Fixed maydon buffer dan tashqariga chiqadi")
+    return end
+
+
+def _decode_string(buffer: bytes, start: int, end: int) -> str:
+    try:
+        return bytes(buffer[start:end]).decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise WireFormatError(f"Noto'g'ri UTF-8 string: {e}") from e
+
+
+def _scan_timestamp(buffer: bytes, pos: int, end: int) -> Tuple[int, int]:
+    """google.protobuf.Timestamp payloadidan (seconds, nanos) ni o'qiydi"""
+    seconds = nanos = 0
+    while pos < end:
+        tag, pos = _read_varint(buffer, pos)
+        field_number, wire_type = tag >> 3, tag & 7
+        if wire_type == WIRETYPE_VARINT and field_number in (1, 2):
+            value, pos = _read_varint(buffer, pos)
+            # int64/int32 manfiy qiymatlar 10 baytli ikkiga to'ldiruvchi ko'rinishda keladi
+            if value >= 1 << 63:
+                value -= 1 << 64
+            if field_number == 1:
+                seconds = value
+            else:
+                nanos = value
+        else:
+            pos = skip_field(buffer, pos, wire_type)
+    if pos != end:
+        raise WireFormatError("Timestamp payload chegarasi buzilgan")
+    return seconds, nanos
+
+
+def scan_webhook_header(buffer: bytes) -> WebhookHeader:
+    """
+    WebhookData binary ma'lumotidan sarlavhani to'liq parse qilmasdan oladi
+
+    Takrorlangan maydonlarda protobuf qoidasi bo'yicha oxirgisi g'olib
+    bo'ladi; oneof uchun ham oxirgi o'rnatilgan maydon olinadi.
+
+    Args:
+        buffer: WebhookData binary ma'lumotlari
+
+    Returns:
+        WebhookHeader
+
+    Raises:
+        WireFormatError: agar ma'lumot wire formatga mos kelmasa
+    """
+    event_type = event_id = ""
+    seconds = nanos = 0
+    data_field_number = data_offset = data_size = 0
+
+    pos = 0
+    length = len(buffer)
+    while pos < length:
+        tag, pos = _read_varint(buffer, pos)
+        field_number, wire_type = tag >> 3, tag & 7
+        if field_number == 0:
+            raise WireFormatError("Maydon raqami 0 bo'lishi mumkin emas")
+
+        if wire_type != WIRETYPE_LENGTH_DELIMITED:
+            pos = skip_field(buffer, pos, wire_type)
+            continue
+
+        start, end = _read_length_delimited(buffer, pos)
+        if field_number == _FIELD_EVENT_TYPE:
+            event_type = _decode_string(buffer, start, end)
+        elif field_number == _FIELD_EVENT_ID:
+            event_id = _decode_string(buffer, start, end)
+        elif field_number == _FIELD_TIMESTAMP:
+            seconds, nanos = _scan_timestamp(buffer, start, end)
+        elif field_number in DATA_CASES:
+            data_field_number, data_offset, data_size = field_number, start, end - start
+        pos = end
+
+    return WebhookHeader(
+        event_type=event_type,
+        event_id=event_id,
+        timestamp_seconds=seconds,
+        timestamp_nanos=nanos,
+        data_case=DATA_CASES.get(data_field_number),
+        data_field_number=data_field_number,
+        data_offset=data_offset,
+        data_size=data_size,
+    )
+
+
+def count_field(buffer: bytes, start: int, end: int, field_number: int, limit: Optional[int] = None) -> int:
+    """
+    buffer[start:end] dagi message ichida field_number maydoni necha marta
+    uchrashini sanaydi (masalan Order.items elementlari soni). Payloadlar
+    decode qilinmaydi.
+
+    Args:
+        limit: Shu songa yetganda sanash to'xtatiladi
+
+    Raises:
+        WireFormatError: agar ma'lumot wire formatga mos kelmasa
+    """
+    count = 0
+    pos = start
+    while pos < end:
+        tag, pos = _read_varint(buffer, pos)
+        if tag >> 3 == field_number:
+            count += 1
+            if limit is not None and count >= limit:
+                break
+        pos = skip_field(buffer, pos, tag & 7)
+    if pos > end:
+        raise WireFormatError("Maydon message chegarasidan tashqariga chiqadi")
+    return count
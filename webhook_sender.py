@@ -1,14 +1,19 @@
 import json
 import time
 import random
+import tempfile
+import grpc
 import requests
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
+from urllib.parse import urljoin
 from google.protobuf.timestamp_pb2 import Timestamp
 from apps.core.dtos.platform.v1.data_exchange_pb2 import (
-    WebhookData, User, Product, Order, OrderItem, OrderStatus
+    WebhookData, WebhookBatch, WebhookResponse, User, Product, Order, OrderItem, OrderStatus
 )
+from apps.core.dtos.platform.v1.data_exchange_pb2_grpc import DataExchangeStub
+from protobuf_decoder import encode_delimited
 
 # Logging sozlamalari
 logging.basicConfig(
@@ -17,6 +22,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Batch va stream endpointlari (config/urls.py) - webhook_url dagi host ga qo'shiladi
+BATCH_PATH = "/webhook/protobuf/batch/"
+STREAM_PATH = "/webhook/protobuf/stream/"
+
 
 class ProtobufWebhookSender:
     """
@@ -148,6 +157,115 @@ class ProtobufWebhookSender:
             logger.error(f"❌ Kutilmagan xato: {e}")
             return False
     
+    def create_webhook_batch(self, event_types: List[str]) -> WebhookBatch:
+        """Bir nechta eventdan iborat WebhookBatch yaratadi"""
+        batch = WebhookBatch()
+        for event_type in event_types:
+            batch.items.append(self.create_webhook_data(event_type))
+        return batch
+    
+    def send_webhook_batch(self, batch: WebhookBatch, url: Optional[str] = None) -> Optional[WebhookResponse]:
+        """
+        WebhookBatch ni bitta POST bilan yuboradi
+        
+        Args:
+            batch: Yuboriladigan WebhookBatch
+            url: Batch endpointi; None - webhook_url host idagi BATCH_PATH
+                (bitta eventli receiver WebhookBatch ni qabul qilmaydi)
+        
+        Returns:
+            Har bir element natijasi bilan WebhookResponse yoki None (xato bo'lsa).
+            Faqat success=False bo'lgan elementlarni qayta yuborish kifoya.
+        """
+        try:
+            binary_data = batch.SerializeToString()
+            logger.info(f"Batch yuborilmoqda: {len(batch.items)} ta event, {len(binary_data)} bytes")
+            
+            response = self.session.post(
+                url or urljoin(self.webhook_url, BATCH_PATH),
+                data=binary_data,
+                timeout=10
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"❌ Batch yuborishda xato: {response.status_code} - {response.text}")
+                return None
+            
+            webhook_response = WebhookResponse()
+            webhook_response.ParseFromString(response.content)
+            logger.info(f"✅ Batch javobi: {webhook_response.message}")
+            return webhook_response
+            
+        except requests.RequestException as e:
+            logger.error(f"❌ Network xatosi: {e}")
+            return None
+    
+    def send_webhook_stream(self, webhooks: Iterable[WebhookData], url: Optional[str] = None) -> Optional[WebhookResponse]:
+        """
+        Ko'p sonli eventlarni bitta so'rovda length-delimited stream sifatida yuboradi
+        
+        Eventlar avval vaqtinchalik faylga yoziladi: WSGI serverlar chunked
+        body ni qabul qilmaydi, fayl esa Content-Length bilan bo'lak-bo'lak
+        yuboriladi va xotiraga to'liq yuklanmaydi.
+        
+        Args:
+            webhooks: Yuboriladigan eventlar
+            url: Stream endpointi; None - webhook_url host idagi STREAM_PATH
+        
+        Returns:
+            Xato bo'lgan elementlar bilan WebhookResponse yoki None (xato bo'lsa)
+        """
+        try:
+            with tempfile.TemporaryFile() as body:
+                count = 0
+                for webhook_data in webhooks:
+                    body.write(encode_delimited(webhook_data.SerializeToString()))
+                    count += 1
+                body.seek(0)
+                
+                logger.info(f"Stream yuborilmoqda: {count} ta event")
+                response = self.session.post(
+                    url or urljoin(self.webhook_url, STREAM_PATH),
+                    data=body,
+                    timeout=60
+                )
+            
+            if response.headers.get('Content-Type') != 'application/x-protobuf':
+                logger.error(f"❌ Stream yuborishda xato: {response.status_code} - {response.text}")
+                return None
+            
+            webhook_response = WebhookResponse()
+            webhook_response.ParseFromString(response.content)
+            if response.status_code != 200:
+                logger.error(f"❌ Stream yuborishda xato: {response.status_code} - {webhook_response.message}")
+                return None
+            
+            logger.info(f"✅ Stream javobi: {webhook_response.message}")
+            return webhook_response
+            
+        except requests.RequestException as e:
+            logger.error(f"❌ Network xatosi: {e}")
+            return None
+    
+    def send_webhooks_grpc(
+        self, webhooks: Iterable[WebhookData], target: str = "localhost:50051"
+    ) -> Optional[WebhookResponse]:
+        """
+        Eventlarni DataExchange.StreamWebhooks orqali bitta uzoq yashovchi
+        HTTP/2 stream da yuboradi (har bir event uchun alohida POST yo'q)
+        
+        Returns:
+            Xato bo'lgan elementlar bilan WebhookResponse yoki None (xato bo'lsa)
+        """
+        try:
+            with grpc.insecure_channel(target) as channel:
+                response = DataExchangeStub(channel).StreamWebhooks(iter(webhooks), timeout=300)
+            logger.info(f"✅ gRPC stream javobi: {response.message}")
+            return response
+        except grpc.RpcError as e:
+            logger.error(f"❌ gRPC xatosi: {e.code().name} - {e.details()}")
+            return None
+    
     def protobuf_to_dict(self, message) -> Dict[str, Any]:
         """Protobuf ni dict ga o'tkazadi (debug uchun)"""
         from google.protobuf.json_format import MessageToDict